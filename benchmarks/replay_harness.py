@@ -0,0 +1,116 @@
+"""Deterministic synthetic replay through a rolling window tracker for benchmarks.
+
+Run from the repository root, in an environment with Home Assistant installed::
+
+    python -m benchmarks.replay_harness
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+import random
+from time import perf_counter
+
+from custom_components.mindml.rolling_window import RollingWindowTracker
+
+SyntheticEvent = tuple[float, str, str]
+
+
+@dataclass(slots=True)
+class ReplayStats:
+    """Outcome of one replay run."""
+
+    events: int
+    computes: int
+    elapsed_seconds: float
+    features: dict[str, float]
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def synthetic_events(
+    count: int,
+    *,
+    entities: int = 20,
+    mean_interval_seconds: float = 2.0,
+    seed: int = 0,
+) -> Iterator[SyntheticEvent]:
+    """Yield ``count`` (timestamp, entity_id, state) events with seeded, increasing timestamps."""
+    rng = random.Random(seed)
+    entity_ids = [f"binary_sensor.synthetic_{index}" for index in range(entities)]
+    timestamp = 0.0
+    for _ in range(count):
+        timestamp += rng.expovariate(1.0 / mean_interval_seconds)
+        yield timestamp, rng.choice(entity_ids), "on" if rng.random() < 0.5 else "off"
+
+
+def replay(
+    tracker: RollingWindowTracker,
+    events: Iterator[SyntheticEvent],
+    clock: list[float],
+    *,
+    required_features: list[str],
+    compute_every: int = 100,
+) -> ReplayStats:
+    """Push ``events`` through ``tracker``, computing features every ``compute_every`` events.
+
+    ``clock`` is the one-element list the tracker's clock reads, advanced to
+    each event's timestamp so pruning follows the synthetic time line.
+    """
+    record_event = tracker.record_event
+    compute_features = tracker.compute_features
+    recorded = computes = 0
+    features: dict[str, float] = {}
+    started = perf_counter()
+    for timestamp, entity_id, state in events:
+        clock[0] = timestamp
+        record_event(entity_id, state, timestamp)
+        recorded += 1
+        if compute_every and recorded % compute_every == 0:
+            features = compute_features(required_features)
+            computes += 1
+    features = compute_features(required_features)
+    return ReplayStats(
+        events=recorded,
+        computes=computes + 1,
+        elapsed_seconds=perf_counter() - started,
+        features=features,
+    )
+
+
+def run_replay(
+    *,
+    event_count: int = 1_000_000,
+    window_hours: float = 7.0,
+    required_features: list[str] | None = None,
+    compute_every: int = 100,
+    seed: int = 0,
+    **tracker_options,
+) -> ReplayStats:
+    """Build a tracker on a synthetic clock and replay ``event_count`` seeded events."""
+    features = list(required_features or ["event_count", "on_ratio"])
+    clock = [0.0]
+    tracker = RollingWindowTracker(
+        window_hours=window_hours,
+        required_features=features,
+        clock=lambda: clock[0],
+        **tracker_options,
+    )
+    return replay(
+        tracker,
+        synthetic_events(event_count, seed=seed),
+        clock,
+        required_features=features,
+        compute_every=compute_every,
+    )
+
+
+if __name__ == "__main__":
+    stats = run_replay()
+    print(
+        f"{stats.events} events, {stats.computes} computes in {stats.elapsed_seconds:.2f}s "
+        f"({stats.events_per_second:,.0f} events/s)"
+    )
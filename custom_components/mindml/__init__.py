@@ -4,16 +4,72 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.exceptions import ServiceValidationError
+import voluptuous as vol
+
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN, PLATFORMS
+from .const import (
+    ATTR_ENTRY_ID,
+    ATTR_FINGERPRINT,
+    CONF_ML_DB_PATH,
+    DATA_SQLITE_POOL,
+    DOMAIN,
+    PLATFORMS,
+    SERVICE_PIN_MODEL_VERSION,
+    SERVICE_UNPIN_MODEL_VERSION,
+)
+from .model_registry import get_model_registry
+from .paths import resolve_ml_db_path
+from .sqlite_connections import SqliteReadOnlyConnectionPool
+from .tracker_registry import get_tracker_registry
+
+PIN_MODEL_VERSION_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): str,
+        vol.Required(ATTR_FINGERPRINT): str,
+    }
+)
+UNPIN_MODEL_VERSION_SCHEMA = vol.Schema({vol.Required(ATTR_ENTRY_ID): str})
+
+
+def _async_register_services(hass: Any) -> None:
+    """Register model version pin/unpin services."""
+
+    async def _pin_model_version(call: Any) -> None:
+        registry = get_model_registry(hass)
+        try:
+            registry.pin(call.data[ATTR_ENTRY_ID], call.data[ATTR_FINGERPRINT])
+        except KeyError as exc:
+            raise ServiceValidationError(str(exc.args[0])) from exc
+
+    async def _unpin_model_version(call: Any) -> None:
+        registry = get_model_registry(hass)
+        try:
+            registry.unpin(call.data[ATTR_ENTRY_ID])
+        except KeyError as exc:
+            raise ServiceValidationError(str(exc.args[0])) from exc
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PIN_MODEL_VERSION,
+        _pin_model_version,
+        schema=PIN_MODEL_VERSION_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UNPIN_MODEL_VERSION,
+        _unpin_model_version,
+        schema=UNPIN_MODEL_VERSION_SCHEMA,
+    )
 
 
 async def async_setup(hass: Any, config: dict) -> bool:
     """Set up the integration."""
     hass.data.setdefault(DOMAIN, {})
+    _async_register_services(hass)
     return True
 
 
@@ -28,5 +84,16 @@ async def async_unload_entry(hass: Any, entry: Any) -> bool:
     """Unload an entry."""
     unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unloaded:
-        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        domain_data = hass.data.get(DOMAIN, {})
+        domain_data.pop(entry.entry_id, None)
+        pool = domain_data.get(DATA_SQLITE_POOL)
+        if isinstance(pool, SqliteReadOnlyConnectionPool):
+            config = {**entry.data, **entry.options}
+            pool.close(resolve_ml_db_path(hass, config.get(CONF_ML_DB_PATH, "")))
     return unloaded
+
+
+async def async_remove_entry(hass: Any, entry: Any) -> None:
+    """Drop in-memory and stored state kept for a deleted entry."""
+    get_model_registry(hass).remove(entry.entry_id)
+    await get_tracker_registry(hass).async_remove_entry(entry.entry_id)
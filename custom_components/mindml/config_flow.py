@@ -12,23 +12,33 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
 
 from .const import (
+    CONF_ROLLING_WINDOW_BUCKET_SECONDS,
     CONF_ROLLING_WINDOW_HOURS,
+    CONF_ROLLING_WINDOW_MAX_EVENTS,
+    CONF_ROLLING_WINDOW_OVERFLOW,
     CONF_FEATURE_TYPES,
     CONF_FEATURE_STATES,
+    CONF_FEATURE_TTL_SECONDS,
     CONF_GOAL,
     CONF_ML_ARTIFACT_VIEW,
     CONF_ML_DB_PATH,
     CONF_ML_FEATURE_SOURCE,
     CONF_ML_FEATURE_VIEW,
+    CONF_ML_SHADOW_ARTIFACT_VIEW,
+    CONF_MODEL_LOAD_BUDGET_SECONDS,
     CONF_NAME,
     CONF_REQUIRED_FEATURES,
     CONF_STATE_MAPPINGS,
     CONF_THRESHOLD,
     DEFAULT_GOAL,
     DEFAULT_ROLLING_WINDOW_HOURS,
+    DEFAULT_ROLLING_WINDOW_MAX_EVENTS,
+    DEFAULT_ROLLING_WINDOW_OVERFLOW,
     DEFAULT_ML_ARTIFACT_VIEW,
     DEFAULT_ML_FEATURE_SOURCE,
     DEFAULT_ML_FEATURE_VIEW,
+    DEFAULT_ML_SHADOW_ARTIFACT_VIEW,
+    DEFAULT_MODEL_LOAD_BUDGET_SECONDS,
     DEFAULT_THRESHOLD,
     DOMAIN,
 )
@@ -50,10 +60,17 @@ _SUPPORTED_OPTION_KEYS = {
     CONF_THRESHOLD,
     CONF_ML_DB_PATH,
     CONF_ML_ARTIFACT_VIEW,
+    CONF_ML_SHADOW_ARTIFACT_VIEW,
+    CONF_MODEL_LOAD_BUDGET_SECONDS,
     CONF_ML_FEATURE_SOURCE,
     CONF_ML_FEATURE_VIEW,
     CONF_ROLLING_WINDOW_HOURS,
+    CONF_FEATURE_TTL_SECONDS,
+    CONF_ROLLING_WINDOW_MAX_EVENTS,
+    CONF_ROLLING_WINDOW_BUCKET_SECONDS,
+    CONF_ROLLING_WINDOW_OVERFLOW,
 }
+_OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
 
 def _normalize_feature_input(raw_feature: Any) -> list[str]:
     if isinstance(raw_feature, str):
@@ -76,6 +93,36 @@ def _normalize_feature_input(raw_feature: Any) -> list[str]:
             normalized.append(feature)
     return normalized
 
+def _parse_feature_ttls(raw_ttls: Any) -> dict[str, float]:
+    """Parse ``feature=seconds`` pairs separated by commas or newlines.
+
+    Raises ``ValueError`` for malformed pairs or non-positive TTLs.
+    """
+    if isinstance(raw_ttls, dict):
+        pairs = [(str(name), value) for name, value in raw_ttls.items()]
+    else:
+        pairs = []
+        for part in str(raw_ttls or "").replace("\n", ",").split(","):
+            if not part.strip():
+                continue
+            name, separator, value = part.partition("=")
+            if not separator:
+                raise ValueError(part)
+            pairs.append((name, value))
+    ttls: dict[str, float] = {}
+    for name, value in pairs:
+        feature = name.strip()
+        ttl = float(value)
+        if not feature or ttl <= 0:
+            raise ValueError(name)
+        ttls[feature] = ttl
+    return ttls
+
+def _format_feature_ttls(ttls: Any) -> str:
+    if not isinstance(ttls, dict):
+        return ""
+    return ", ".join(f"{feature}={float(ttl):g}" for feature, ttl in ttls.items())
+
 def _build_user_schema() -> vol.Schema:
     return vol.Schema(
         {
@@ -329,6 +376,12 @@ class ClrOptionsFlow(config_entries.OptionsFlow):
                 self._existing_value(CONF_ML_ARTIFACT_VIEW, DEFAULT_ML_ARTIFACT_VIEW)
             ).strip()
             or DEFAULT_ML_ARTIFACT_VIEW,
+            CONF_ML_SHADOW_ARTIFACT_VIEW: str(
+                self._existing_value(CONF_ML_SHADOW_ARTIFACT_VIEW, DEFAULT_ML_SHADOW_ARTIFACT_VIEW)
+            ).strip(),
+            CONF_MODEL_LOAD_BUDGET_SECONDS: float(
+                self._existing_value(CONF_MODEL_LOAD_BUDGET_SECONDS, DEFAULT_MODEL_LOAD_BUDGET_SECONDS)
+            ),
             CONF_ML_FEATURE_SOURCE: str(
                 self._existing_value(CONF_ML_FEATURE_SOURCE, DEFAULT_ML_FEATURE_SOURCE)
             ).strip()
@@ -417,6 +470,18 @@ class ClrOptionsFlow(config_entries.OptionsFlow):
                                 user_input.get(CONF_ML_ARTIFACT_VIEW, DEFAULT_ML_ARTIFACT_VIEW)
                             ).strip()
                             or DEFAULT_ML_ARTIFACT_VIEW,
+                            CONF_ML_SHADOW_ARTIFACT_VIEW: str(
+                                user_input.get(
+                                    CONF_ML_SHADOW_ARTIFACT_VIEW,
+                                    DEFAULT_ML_SHADOW_ARTIFACT_VIEW,
+                                )
+                            ).strip(),
+                            CONF_MODEL_LOAD_BUDGET_SECONDS: float(
+                                user_input.get(
+                                    CONF_MODEL_LOAD_BUDGET_SECONDS,
+                                    DEFAULT_MODEL_LOAD_BUDGET_SECONDS,
+                                )
+                            ),
                         }
                     ),
                 )
@@ -434,19 +499,57 @@ class ClrOptionsFlow(config_entries.OptionsFlow):
             CONF_ML_ARTIFACT_VIEW,
             self._config_entry.data.get(CONF_ML_ARTIFACT_VIEW, DEFAULT_ML_ARTIFACT_VIEW),
         )
+        default_shadow_view = str(
+            self._existing_value(CONF_ML_SHADOW_ARTIFACT_VIEW, DEFAULT_ML_SHADOW_ARTIFACT_VIEW)
+        )
         return self.async_show_form(
             step_id="model",
             data_schema=vol.Schema(
                 {
                     vol.Optional(CONF_ML_DB_PATH, default=default_db_path): str,
                     vol.Required(CONF_ML_ARTIFACT_VIEW, default=default_view): str,
+                    vol.Optional(CONF_ML_SHADOW_ARTIFACT_VIEW, default=default_shadow_view): str,
+                    vol.Optional(
+                        CONF_MODEL_LOAD_BUDGET_SECONDS,
+                        default=float(
+                            self._existing_value(
+                                CONF_MODEL_LOAD_BUDGET_SECONDS,
+                                DEFAULT_MODEL_LOAD_BUDGET_SECONDS,
+                            )
+                        ),
+                    ): vol.Coerce(float),
                 }
             ),
             errors=errors,
         )
 
     async def async_step_feature_source(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        errors: dict[str, str] = {}
         if user_input is not None:
+            try:
+                feature_ttls = _parse_feature_ttls(user_input.get(CONF_FEATURE_TTL_SECONDS, ""))
+            except ValueError:
+                errors[CONF_FEATURE_TTL_SECONDS] = "invalid_feature_ttl"
+            try:
+                max_events = int(
+                    user_input.get(CONF_ROLLING_WINDOW_MAX_EVENTS, DEFAULT_ROLLING_WINDOW_MAX_EVENTS)
+                )
+            except (TypeError, ValueError):
+                max_events = 0
+            if max_events < 1:
+                errors[CONF_ROLLING_WINDOW_MAX_EVENTS] = "invalid_max_events"
+            overflow = str(
+                user_input.get(CONF_ROLLING_WINDOW_OVERFLOW, DEFAULT_ROLLING_WINDOW_OVERFLOW)
+            )
+            if overflow not in _OVERFLOW_POLICIES:
+                errors[CONF_ROLLING_WINDOW_OVERFLOW] = "invalid_overflow"
+            try:
+                bucket_seconds = float(user_input.get(CONF_ROLLING_WINDOW_BUCKET_SECONDS) or 0.0)
+            except (TypeError, ValueError):
+                bucket_seconds = -1.0
+            if bucket_seconds < 0:
+                errors[CONF_ROLLING_WINDOW_BUCKET_SECONDS] = "invalid_bucket_seconds"
+        if user_input is not None and not errors:
             return self.async_create_entry(
                 title="",
                 data=self._merged_options(
@@ -462,6 +565,10 @@ class ClrOptionsFlow(config_entries.OptionsFlow):
                         CONF_ROLLING_WINDOW_HOURS: float(
                             user_input.get(CONF_ROLLING_WINDOW_HOURS, DEFAULT_ROLLING_WINDOW_HOURS)
                         ),
+                        CONF_FEATURE_TTL_SECONDS: feature_ttls,
+                        CONF_ROLLING_WINDOW_MAX_EVENTS: max_events,
+                        CONF_ROLLING_WINDOW_OVERFLOW: overflow,
+                        CONF_ROLLING_WINDOW_BUCKET_SECONDS: bucket_seconds,
                     }
                 ),
             )
@@ -500,8 +607,37 @@ class ClrOptionsFlow(config_entries.OptionsFlow):
                         CONF_ROLLING_WINDOW_HOURS,
                         default=float(self._existing_value(CONF_ROLLING_WINDOW_HOURS, DEFAULT_ROLLING_WINDOW_HOURS)),
                     ): vol.Coerce(float),
+                    vol.Optional(
+                        CONF_FEATURE_TTL_SECONDS,
+                        default=_format_feature_ttls(self._existing_value(CONF_FEATURE_TTL_SECONDS, {})),
+                    ): str,
+                    vol.Optional(
+                        CONF_ROLLING_WINDOW_MAX_EVENTS,
+                        default=int(
+                            self._existing_value(CONF_ROLLING_WINDOW_MAX_EVENTS, DEFAULT_ROLLING_WINDOW_MAX_EVENTS)
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_ROLLING_WINDOW_OVERFLOW,
+                        default=str(
+                            self._existing_value(CONF_ROLLING_WINDOW_OVERFLOW, DEFAULT_ROLLING_WINDOW_OVERFLOW)
+                        ),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(value="drop_oldest", label="Drop oldest"),
+                                selector.SelectOptionDict(value="drop_newest", label="Drop newest"),
+                            ],
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_ROLLING_WINDOW_BUCKET_SECONDS,
+                        default=float(self._existing_value(CONF_ROLLING_WINDOW_BUCKET_SECONDS, 0.0) or 0.0),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
                 }
             ),
+            errors=errors,
         )
 
     async def async_step_decision(self, user_input: dict[str, Any] | None = None) -> FlowResult:
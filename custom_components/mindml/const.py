@@ -14,11 +14,18 @@ CONF_FEATURE_STATES = "feature_states"
 CONF_THRESHOLD = "threshold"
 CONF_ML_DB_PATH = "ml_db_path"
 CONF_ML_ARTIFACT_VIEW = "ml_artifact_view"
+CONF_ML_SHADOW_ARTIFACT_VIEW = "ml_shadow_artifact_view"
 CONF_ML_FEATURE_SOURCE = "ml_feature_source"
 CONF_ML_FEATURE_VIEW = "ml_feature_view"
 CONF_ROLLING_WINDOW_HOURS = "rolling_window_hours"
+CONF_MODEL_LOAD_BUDGET_SECONDS = "model_load_budget_seconds"
+CONF_FEATURE_TTL_SECONDS = "feature_ttl_seconds"
+CONF_ROLLING_WINDOW_MAX_EVENTS = "rolling_window_max_events"
+CONF_ROLLING_WINDOW_BUCKET_SECONDS = "rolling_window_bucket_seconds"
+CONF_ROLLING_WINDOW_OVERFLOW = "rolling_window_overflow"
 
 DEFAULT_ML_ARTIFACT_VIEW = "vw_lightgbm_latest_model_artifact"
+DEFAULT_ML_SHADOW_ARTIFACT_VIEW = ""
 DEFAULT_ML_FEATURE_SOURCE = "hass_state"
 DEFAULT_ML_FEATURE_VIEW = "vw_latest_feature_snapshot"
 DEFAULT_ML_DB_FILENAME = "ha_ml_data_layer.db"
@@ -27,3 +34,18 @@ DEFAULT_ML_DB_PATH = "/config/appdaemon/ha_ml_data_layer.db"
 DEFAULT_GOAL = "risk"
 DEFAULT_THRESHOLD = 50.0
 DEFAULT_ROLLING_WINDOW_HOURS = 7.0
+DEFAULT_ROLLING_WINDOW_MAX_EVENTS = 100_000
+DEFAULT_ROLLING_WINDOW_OVERFLOW = "drop_oldest"
+DEFAULT_MODEL_LOAD_BUDGET_SECONDS = 2.0
+
+DATA_MODEL_REGISTRY = "model_registry"
+DATA_TIME_CLOCK = "time_clock"
+DATA_DECAY_SCHEDULER = "decay_scheduler"
+DATA_TRACKER_REGISTRY = "tracker_registry"
+DATA_SQLITE_POOL = "sqlite_pool"
+DEFAULT_MODEL_HISTORY_SIZE = 3
+
+SERVICE_PIN_MODEL_VERSION = "pin_model_version"
+SERVICE_UNPIN_MODEL_VERSION = "unpin_model_version"
+ATTR_ENTRY_ID = "entry_id"
+ATTR_FINGERPRINT = "fingerprint"
@@ -0,0 +1,91 @@
+"""Domain-level timer that rescores sensors when rolling window events expire."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+from time import monotonic
+from typing import Any, Final
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DATA_DECAY_SCHEDULER
+from .domain_data import get_domain_singleton
+
+# Deadlines this close to the earliest one are served by the same timer tick.
+COALESCE_SECONDS: Final = 2.0
+
+
+class DecayScheduler:
+    """One shared timer armed for the earliest pending expiry across all sensors."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._deadlines: dict[str, tuple[float, Callable[[], None]]] = {}
+        self._unsub_timer: Callable[[], None] | None = None
+        self._timer_at: float | None = None
+        self._firing = False
+
+    @callback
+    def async_schedule(
+        self, key: str, deadline: float | None, action: Callable[[], None]
+    ) -> None:
+        """Run ``action`` at monotonic time ``deadline``; ``None`` clears the key."""
+        if deadline is None:
+            self._deadlines.pop(key, None)
+        else:
+            self._deadlines[key] = (deadline, action)
+        self._arm()
+
+    @callback
+    def async_cancel(self, key: str) -> None:
+        self._deadlines.pop(key, None)
+        self._arm()
+
+    def _arm(self) -> None:
+        if self._firing:
+            return
+        if not self._deadlines:
+            self._cancel_timer()
+            return
+        earliest = min(deadline for deadline, _ in self._deadlines.values())
+        # Wait for the last deadline in the cluster so every member has expired.
+        fire_at = max(
+            deadline
+            for deadline, _ in self._deadlines.values()
+            if deadline <= earliest + COALESCE_SECONDS
+        )
+        if self._timer_at == fire_at:
+            return
+        self._cancel_timer()
+        self._timer_at = fire_at
+        self._unsub_timer = async_call_later(
+            self._hass, max(fire_at - monotonic(), 0.0), self._fire
+        )
+
+    def _cancel_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+        self._unsub_timer = None
+        self._timer_at = None
+
+    @callback
+    def _fire(self, _now: datetime | None = None) -> None:
+        self._unsub_timer = None
+        self._timer_at = None
+        now = monotonic()
+        due = [key for key, (deadline, _) in self._deadlines.items() if deadline <= now]
+        self._firing = True
+        try:
+            for key in due:
+                _, action = self._deadlines.pop(key)
+                action()
+        finally:
+            self._firing = False
+        self._arm()
+
+
+def get_decay_scheduler(hass: Any) -> DecayScheduler:
+    """Return the domain-level decay scheduler, creating it on first use."""
+    return get_domain_singleton(hass, DATA_DECAY_SCHEDULER, lambda: DecayScheduler(hass))
@@ -0,0 +1,18 @@
+"""Domain-level singletons kept in ``hass.data[DOMAIN]``."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from .const import DOMAIN
+
+_T = TypeVar("_T")
+
+
+def get_domain_singleton(hass: Any, key: str, factory: Callable[[], _T]) -> _T:
+    """Return ``hass.data[DOMAIN][key]``, creating it with ``factory`` on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if key not in domain_data:
+        domain_data[key] = factory()
+    return domain_data[key]
@@ -22,6 +22,18 @@ _KNOWN_STATE_MAPPINGS: Final[dict[str, dict[str, float]]] = {
     "open": {"open": 1.0, "closed": 0.0},
     "closed": {"open": 1.0, "closed": 0.0},
 }
+KNOWN_STATE_VALUES: Final[dict[str, float]] = {
+    state: mapping[state] for state, mapping in _KNOWN_STATE_MAPPINGS.items()
+}
+ATTRIBUTE_FEATURE_SEPARATOR: Final = "#"
+
+
+def split_feature_reference(feature: str) -> tuple[str, str | None]:
+    """Split ``entity_id#attribute`` into its entity and attribute (None for the state)."""
+    entity_id, separator, attribute = feature.partition(ATTRIBUTE_FEATURE_SEPARATOR)
+    if not separator or not attribute:
+        return entity_id, None
+    return entity_id, attribute
 
 
 def parse_required_features(raw: object) -> list[str]:
@@ -2,27 +2,209 @@
 
 from __future__ import annotations
 
-import sqlite3
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass
+from datetime import UTC, datetime
 from pathlib import Path
 import re
-from typing import Any, Callable
+from time import monotonic
+from typing import Any, Callable, Protocol, runtime_checkable
 
-from .feature_mapping import FEATURE_TYPE_CATEGORICAL, infer_state_mappings_from_states
+from .feature_mapping import (
+    FEATURE_TYPE_CATEGORICAL,
+    KNOWN_STATE_VALUES,
+    split_feature_reference,
+)
 from .model import parse_float
+from .sqlite_connections import SqliteReadOnlyConnectionPool
+from .time_features import TimeFeatureSource, is_time_feature
+
+# Stay under SQLite's historical SQLITE_MAX_VARIABLE_NUMBER default of 999.
+_SQLITE_MAX_IN_PARAMS = 900
+# Optional snapshot view columns carrying per-feature freshness metadata.
+_TTL_COLUMN = "ttl_seconds"
+_UPDATED_AT_COLUMN = "updated_at_utc"
 
 
-@dataclass(slots=True)
 class FeatureVectorResult:
-    """Prepared feature vector and mapping diagnostics."""
+    """Prepared feature vector and mapping diagnostics.
+
+    Values are stored as ``array('d')`` aligned with ``names`` plus a bitmask of
+    missing slots, so providers can hand a vector to inference without building
+    dicts. ``feature_values`` / ``missing_features`` are materialized on demand.
+    """
+
+    __slots__ = (
+        "names",
+        "values",
+        "missing_mask",
+        "mapped_state_values",
+        "unchanged",
+        "stale_features",
+        "_feature_values",
+    )
+
+    def __init__(
+        self,
+        *,
+        feature_values: dict[str, float],
+        missing_features: list[str],
+        mapped_state_values: dict[str, str],
+        unchanged: bool = False,
+        stale_features: Sequence[str] = (),
+    ) -> None:
+        missing = [name for name in dict.fromkeys(missing_features) if name not in feature_values]
+        self.names: tuple[str, ...] = tuple(feature_values) + tuple(missing)
+        self.values = array("d", [float(value) for value in feature_values.values()])
+        self.values.extend([0.0] * len(missing))
+        self.missing_mask = ((1 << len(missing)) - 1) << len(feature_values)
+        self.mapped_state_values = mapped_state_values
+        self.unchanged = unchanged
+        self.stale_features = tuple(stale_features)
+        self._feature_values: dict[str, float] | None = None
+
+    @classmethod
+    def from_row(
+        cls,
+        names: tuple[str, ...],
+        values: array,
+        missing_mask: int,
+        mapped_state_values: dict[str, str],
+        *,
+        unchanged: bool = False,
+        stale_features: tuple[str, ...] = (),
+    ) -> FeatureVectorResult:
+        """Wrap an already ordered row; ``values`` must not be mutated afterwards."""
+        vector = cls.__new__(cls)
+        vector.names = names
+        vector.values = values
+        vector.missing_mask = missing_mask
+        vector.mapped_state_values = mapped_state_values
+        vector.unchanged = unchanged
+        vector.stale_features = stale_features
+        vector._feature_values = None
+        return vector
+
+    @property
+    def feature_values(self) -> dict[str, float]:
+        if self._feature_values is None:
+            mask = self.missing_mask
+            self._feature_values = {
+                name: value
+                for index, (name, value) in enumerate(zip(self.names, self.values))
+                if not (mask >> index) & 1
+            }
+        return self._feature_values
+
+    @property
+    def missing_features(self) -> list[str]:
+        mask = self.missing_mask
+        if not mask:
+            return []
+        return [name for index, name in enumerate(self.names) if (mask >> index) & 1]
+
+    def ordered_row(self, feature_names: list[str] | tuple[str, ...]) -> Sequence[float]:
+        """Return values in ``feature_names`` order (zero-copy when already aligned)."""
+        count = len(feature_names)
+        if self.names[:count] == tuple(feature_names):
+            return self.values if count == len(self.values) else self.values[:count]
+        feature_values = self.feature_values
+        return array("d", [feature_values.get(name, 0.0) for name in feature_names])
+
+
+FeatureEncoder = Callable[[str], tuple[float | None, str | None]]
+FeatureExtractor = Callable[[Any], tuple[float | None, str | None]]
+
+# Per-entity memo of raw state -> encoding; bounded so numeric sensors cannot grow it.
+_ENCODER_CACHE_SIZE = 64
+
+
+def _numeric_encoder(raw_state: str) -> tuple[float | None, str | None]:
+    return parse_float(raw_state), None
+
+
+def _categorical_encoder(mapping: dict[str, float]) -> FeatureEncoder:
+    """Compile a categorical encoder with a pre-casefolded lookup table."""
+    table = dict(KNOWN_STATE_VALUES)
+    table.update(mapping)
+    # Known boolean-like states hit this memo directly without casefold/parse.
+    cache: dict[str, tuple[float | None, str | None]] = {
+        state: (value, state) for state, value in table.items() if parse_float(state) is None
+    }
+
+    def _encode(raw_state: str) -> tuple[float | None, str | None]:
+        cached = cache.get(raw_state)
+        if cached is not None:
+            return cached
+        parsed = parse_float(raw_state)
+        if parsed is not None:
+            result: tuple[float | None, str | None] = (parsed, None)
+        else:
+            encoded = table.get(raw_state.casefold())
+            result = (encoded, raw_state) if encoded is not None else (None, None)
+        if len(cache) < _ENCODER_CACHE_SIZE:
+            cache[raw_state] = result
+        return result
 
-    feature_values: dict[str, float]
-    missing_features: list[str]
-    mapped_state_values: dict[str, str]
+    return _encode
+
+
+def _state_extractor(encode: FeatureEncoder) -> FeatureExtractor:
+    def _extract(state: Any) -> tuple[float | None, str | None]:
+        return encode(state.state)
+
+    return _extract
+
+
+def _attribute_extractor(attribute: str, encode: FeatureEncoder) -> FeatureExtractor:
+    def _extract(state: Any) -> tuple[float | None, str | None]:
+        value = (state.attributes or {}).get(attribute)
+        if value is None:
+            return None, None
+        if isinstance(value, int | float):
+            return float(value), None
+        return encode(str(value))
+
+    return _extract
+
+
+TimeSlots = tuple[tuple[int, str], ...]
+
+
+def _time_slots(features: list[str], source: TimeFeatureSource | None) -> TimeSlots:
+    """Return (slot index, name) for built-in time features served by ``source``."""
+    if source is None:
+        return ()
+    return tuple((index, name) for index, name in enumerate(features) if is_time_feature(name))
+
+
+def _apply_time_features(
+    values: array,
+    missing_mask: int,
+    slots: TimeSlots,
+    source: TimeFeatureSource,
+) -> tuple[int, bool]:
+    """Write shared clock values into time slots; return (mask, whether any value changed)."""
+    time_values = source()
+    changed = False
+    for index, name in slots:
+        value = time_values[name]
+        if values[index] != value or (missing_mask >> index) & 1:
+            values[index] = value
+            missing_mask &= ~(1 << index)
+            changed = True
+    return missing_mask, changed
 
 
 class HassStateFeatureProvider:
-    """Build a feature vector directly from Home Assistant entity states."""
+    """Build a feature vector directly from Home Assistant entity states.
+
+    Features are entity IDs (``sensor.temp``), attribute references
+    (``climate.living_room#current_temperature``) or built-in time features
+    read from ``time_features``. Names matched by ``derived_features`` are left
+    missing for a wrapping provider to fill.
+    """
 
     def __init__(
         self,
@@ -31,63 +213,161 @@ class HassStateFeatureProvider:
         required_features: list[str],
         feature_types: dict[str, str],
         state_mappings: dict[str, dict[str, float]],
+        time_features: TimeFeatureSource | None = None,
+        derived_features: Callable[[str], bool] | None = None,
     ) -> None:
         self._hass = hass
         self._required_features = list(required_features)
+        self._time_features = time_features
+        self._time_slots = _time_slots(self._required_features, time_features)
         self._feature_types = dict(feature_types)
         self._state_mappings = {
             entity_id: {str(name).casefold(): float(value) for name, value in mapping.items()}
             for entity_id, mapping in state_mappings.items()
         }
+        # Entity-backed slot index -> (feature name, source entity, compiled extractor).
+        self._extractors: dict[int, tuple[str, str, FeatureExtractor]] = {}
+        self._slots: dict[str, list[int]] = {}
+        self._watched_attributes: dict[str, tuple[str, ...]] = {}
+        time_indexes = {index for index, _ in self._time_slots}
+        for index, feature in enumerate(self._required_features):
+            if index in time_indexes or (derived_features is not None and derived_features(feature)):
+                continue
+            entity_id, attribute = split_feature_reference(feature)
+            self._extractors[index] = (feature, entity_id, self._compile_extractor(feature, attribute))
+            self._slots.setdefault(entity_id, []).append(index)
+            if attribute is not None:
+                self._watched_attributes[entity_id] = (
+                    *self._watched_attributes.get(entity_id, ()),
+                    attribute,
+                )
+        # Live row in required-feature order, patched slot by slot from events.
+        self._names = tuple(self._required_features)
+        self._values = array("d", [0.0] * len(self._names))
+        self._missing_mask = (1 << len(self._names)) - 1
+        self._mapped: dict[str, str] = {}
+        self._live = False
 
-    def _encoded_feature_value(self, entity_id: str, raw_state: str) -> tuple[float | None, str | None]:
-        parsed = parse_float(raw_state)
-        if parsed is not None:
-            return parsed, None
+    def _compile_extractor(self, feature: str, attribute: str | None) -> FeatureExtractor:
+        if self._feature_types.get(feature, "numeric") != FEATURE_TYPE_CATEGORICAL:
+            encode = _numeric_encoder
+        else:
+            encode = _categorical_encoder(self._state_mappings.get(feature, {}))
+        if attribute is None:
+            return _state_extractor(encode)
+        return _attribute_extractor(attribute, encode)
 
-        feature_type = self._feature_types.get(entity_id, "numeric")
-        if feature_type != FEATURE_TYPE_CATEGORICAL:
-            return None, None
+    @property
+    def watched_entities(self) -> list[str]:
+        """Entity IDs whose state changes can affect the feature vector."""
+        return list(self._slots)
 
-        normalized_state = raw_state.casefold()
-        encoded = self._state_mappings.get(entity_id, {}).get(normalized_state)
-        if encoded is not None:
-            return encoded, raw_state
+    def attributes_changed(self, entity_id: str, old_state: Any, new_state: Any) -> bool:
+        """Return whether any attribute referenced by a feature differs between two states."""
+        attributes = self._watched_attributes.get(entity_id)
+        if not attributes:
+            return False
+        old_attributes = old_state.attributes or {}
+        new_attributes = new_state.attributes or {}
+        return any(old_attributes.get(name) != new_attributes.get(name) for name in attributes)
 
-        inferred = infer_state_mappings_from_states({entity_id: raw_state})
-        inferred_encoded = inferred.get(entity_id, {}).get(normalized_state)
-        if inferred_encoded is None:
-            return None, None
-        return inferred_encoded, raw_state
+    def _patch_slot(self, index: int, feature: str, extract: FeatureExtractor, state: Any) -> None:
+        encoded, mapped_from = (None, None) if state is None else extract(state)
+        if encoded is None:
+            self._missing_mask |= 1 << index
+            self._values[index] = 0.0
+        else:
+            self._missing_mask &= ~(1 << index)
+            self._values[index] = encoded
+        if mapped_from is None:
+            self._mapped.pop(feature, None)
+        else:
+            self._mapped[feature] = mapped_from
+
+    def _read_all(self) -> None:
+        states_get = self._hass.states.get
+        for index, (feature, entity_id, extract) in self._extractors.items():
+            self._patch_slot(index, feature, extract, states_get(entity_id))
+
+    def rebuild(self) -> None:
+        """Re-read every required entity and switch to event-driven updates."""
+        self._read_all()
+        self._live = True
+
+    def update_entity(self, entity_id: str, new_state: Any) -> bool:
+        """Patch the live row from a state-change event; return whether it was used."""
+        slots = self._slots.get(entity_id)
+        if slots is None:
+            return False
+        if not self._live:
+            self.rebuild()
+            return True
+        for index in slots:
+            feature, _, extract = self._extractors[index]
+            self._patch_slot(index, feature, extract, new_state)
+        return True
 
     def load(self) -> FeatureVectorResult:
-        feature_values: dict[str, float] = {}
-        missing: list[str] = []
-        mapped_state_values: dict[str, str] = {}
-
-        for entity_id in self._required_features:
-            state = self._hass.states.get(entity_id)
-            if state is None:
-                missing.append(entity_id)
-                continue
+        if not self._live:
+            # Until the owner starts feeding events, every load is a full read.
+            self._read_all()
 
-            encoded, mapped_from = self._encoded_feature_value(entity_id, state.state)
-            if encoded is None:
-                missing.append(entity_id)
-                continue
-            feature_values[entity_id] = encoded
-            if mapped_from is not None:
-                mapped_state_values[entity_id] = mapped_from
-
-        return FeatureVectorResult(
-            feature_values=feature_values,
-            missing_features=missing,
-            mapped_state_values=mapped_state_values,
+        values = self._values[:]
+        missing_mask = self._missing_mask
+        if self._time_slots:
+            missing_mask, _ = _apply_time_features(
+                values, missing_mask, self._time_slots, self._time_features
+            )
+        return FeatureVectorResult.from_row(
+            self._names,
+            values,
+            missing_mask,
+            dict(self._mapped),
         )
 
 
+@dataclass(slots=True)
+class _CachedFeature:
+    """Last fetched snapshot value for a feature with a TTL."""
+
+    value: float
+    fetched_at: float
+    ttl_seconds: float
+    updated_at: datetime | None = None
+    missing_in_db: bool = False
+
+    def is_due(self, now_monotonic: float) -> bool:
+        return self.missing_in_db or now_monotonic - self.fetched_at >= self.ttl_seconds
+
+    def is_stale(self, now_utc: datetime) -> bool:
+        if self.missing_in_db:
+            return True
+        if self.updated_at is None:
+            return False
+        return (now_utc - self.updated_at).total_seconds() > self.ttl_seconds
+
+
+def _parse_updated_at(raw: Any) -> datetime | None:
+    if raw in (None, ""):
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(raw))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=UTC)
+
+
 class SqliteSnapshotFeatureProvider:
-    """Build feature vector from ML data-layer latest feature snapshot view."""
+    """Build feature vector from ML data-layer latest feature snapshot view.
+
+    Features with a TTL (from ``feature_ttls`` or an optional ``ttl_seconds``
+    view column) are cached and only re-queried once their TTL expires. When the
+    view also has ``updated_at_utc``, values older than their TTL are reported in
+    ``stale_features``.
+    """
+
+    # SQLite reads block; the async adapter runs load() in the executor.
+    blocking_io = True
 
     def __init__(
         self,
@@ -95,10 +375,83 @@ class SqliteSnapshotFeatureProvider:
         db_path: str,
         snapshot_view: str,
         required_features: list[str],
+        connection_pool: SqliteReadOnlyConnectionPool | None = None,
+        time_features: TimeFeatureSource | None = None,
+        feature_ttls: dict[str, float] | None = None,
     ) -> None:
         self._db_path = db_path
         self._snapshot_view = snapshot_view
         self._required_features = list(required_features)
+        self._time_features = time_features
+        self._time_slots = _time_slots(self._required_features, time_features)
+        self._connection_pool = connection_pool or SqliteReadOnlyConnectionPool()
+        self._feature_ttls = {
+            name: float(ttl) for name, ttl in (feature_ttls or {}).items() if float(ttl) > 0
+        }
+        time_names = {name for _, name in self._time_slots}
+        self._db_features = [
+            name for name in dict.fromkeys(self._required_features) if name not in time_names
+        ]
+        self._columns: frozenset[str] | None = None
+        self._queries: list[tuple[str, tuple[str, ...]]] | None = None
+        self._columns_serial: int | None = None
+        self._cache: dict[str, _CachedFeature] = {}
+        self._data_version: tuple[int, int] | None = None
+        self._last_result: FeatureVectorResult | None = None
+
+    def _select_list(self) -> str:
+        columns = ["feature_name", "feature_value"]
+        for optional in (_TTL_COLUMN, _UPDATED_AT_COLUMN):
+            if self._columns and optional in self._columns:
+                columns.append(optional)
+        return ", ".join(columns)
+
+    def _feature_queries(self, names: list[str]) -> list[tuple[str, tuple[str, ...]]]:
+        select_list = self._select_list()
+        queries: list[tuple[str, tuple[str, ...]]] = []
+        for start in range(0, len(names), _SQLITE_MAX_IN_PARAMS):
+            chunk = tuple(names[start : start + _SQLITE_MAX_IN_PARAMS])
+            placeholders = ", ".join("?" for _ in chunk)
+            queries.append(
+                (
+                    f"SELECT {select_list} FROM {self._snapshot_view} "
+                    f"WHERE feature_name IN ({placeholders})",
+                    chunk,
+                )
+            )
+        return queries
+
+    def _required_feature_queries(self) -> list[tuple[str, tuple[str, ...]]]:
+        """Build (once) the chunked IN-list queries restricted to required features.
+
+        The SQL text is fixed per provider, so sqlite3's per-connection statement
+        cache keeps reusing the same prepared statements across polls.
+        """
+        if self._queries is None:
+            self._queries = self._feature_queries(self._db_features)
+        return self._queries
+
+    def _view_columns(self, conn: Any, serial: int) -> frozenset[str]:
+        """Return the view's columns, re-read when the pool's watcher serial changes.
+
+        The watcher is reopened when the DB file is replaced, which is when the
+        view definition can change.
+        """
+        if serial != self._columns_serial:
+            self._columns = None
+            self._queries = None
+            self._columns_serial = serial
+        if self._columns is None:
+            cursor = conn.execute(f"SELECT * FROM {self._snapshot_view} LIMIT 0")
+            self._columns = frozenset(str(column[0]) for column in cursor.description)
+        return self._columns
+
+    def _stale_features(self, now_utc: datetime) -> tuple[str, ...]:
+        return tuple(
+            name
+            for name in self._db_features
+            if (cached := self._cache.get(name)) is not None and cached.is_stale(now_utc)
+        )
 
     def load(self) -> FeatureVectorResult:
         if not self._db_path:
@@ -110,35 +463,105 @@ class SqliteSnapshotFeatureProvider:
         if not db_file.exists():
             raise FileNotFoundError(self._db_path)
 
-        conn = sqlite3.connect(db_file)
-        conn.row_factory = sqlite3.Row
-        try:
-            rows = conn.execute(
-                f"SELECT feature_name, feature_value FROM {self._snapshot_view}"
-            ).fetchall()
-        finally:
-            conn.close()
-
-        values_by_name: dict[str, float] = {}
-        for row in rows:
-            feature_name = str(row["feature_name"])
-            parsed = parse_float(row["feature_value"])
-            if parsed is not None:
-                values_by_name[feature_name] = parsed
-
-        feature_values: dict[str, float] = {}
-        missing: list[str] = []
-        for feature in self._required_features:
-            value = values_by_name.get(feature)
+        now_monotonic = monotonic()
+        now_utc = datetime.now(UTC)
+        rows: dict[str, tuple[float, Any, Any]] = {}
+        data_version = self._connection_pool.data_version(str(db_file))
+        if data_version == self._data_version and self._last_result is not None:
+            return self._reuse_last_result(now_utc)
+        with self._connection_pool.connection(str(db_file)) as conn:
+            self._view_columns(conn, data_version[0])
+            due = [
+                name
+                for name in self._db_features
+                if (cached := self._cache.get(name)) is None or cached.is_due(now_monotonic)
+            ]
+            queries = (
+                self._required_feature_queries()
+                if len(due) == len(self._db_features)
+                else self._feature_queries(due)
+            )
+            has_ttl = _TTL_COLUMN in self._columns
+            has_updated_at = _UPDATED_AT_COLUMN in self._columns
+            for sql, params in queries:
+                for row in conn.execute(sql, params):
+                    parsed = parse_float(row[1])
+                    if parsed is not None:
+                        rows[str(row[0])] = (
+                            parsed,
+                            row[_TTL_COLUMN] if has_ttl else None,
+                            row[_UPDATED_AT_COLUMN] if has_updated_at else None,
+                        )
+
+        fresh: dict[str, float] = {}
+        for name in due:
+            row = rows.get(name)
+            cached = self._cache.get(name)
+            if row is None:
+                if cached is not None:
+                    # Keep serving the last value but report it as stale.
+                    cached.missing_in_db = True
+                continue
+            value, view_ttl, updated_at = row
+            ttl = self._feature_ttls.get(name) or parse_float(view_ttl)
+            if ttl is not None and ttl > 0:
+                self._cache[name] = _CachedFeature(
+                    value=value,
+                    fetched_at=now_monotonic,
+                    ttl_seconds=ttl,
+                    updated_at=_parse_updated_at(updated_at),
+                )
+            else:
+                self._cache.pop(name, None)
+                fresh[name] = value
+
+        names = tuple(self._required_features)
+        values = array("d", [0.0]) * len(names)
+        missing_mask = 0
+        for index, feature in enumerate(names):
+            value = fresh.get(feature)
+            if value is None and (cached := self._cache.get(feature)) is not None:
+                value = cached.value
             if value is None:
-                missing.append(feature)
+                missing_mask |= 1 << index
                 continue
-            feature_values[feature] = value
+            values[index] = value
+        if self._time_slots:
+            missing_mask, _ = _apply_time_features(
+                values, missing_mask, self._time_slots, self._time_features
+            )
+
+        self._data_version = data_version
+        self._last_result = FeatureVectorResult.from_row(
+            names, values, missing_mask, {}, stale_features=self._stale_features(now_utc)
+        )
+        return self._last_result
 
-        return FeatureVectorResult(
-            feature_values=feature_values,
-            missing_features=missing,
-            mapped_state_values={},
+    def _reuse_last_result(self, now_utc: datetime) -> FeatureVectorResult:
+        """Serve the previous vector when the DB is untouched, refreshing clock-driven parts."""
+        last = self._last_result
+        stale = self._stale_features(now_utc) if self._cache else ()
+        values = last.values
+        missing_mask = last.missing_mask
+        time_changed = False
+        if self._time_slots:
+            values = last.values[:]
+            missing_mask, time_changed = _apply_time_features(
+                values, last.missing_mask, self._time_slots, self._time_features
+            )
+        if time_changed or stale != last.stale_features:
+            # Only the clock moved; reuse the cached DB values.
+            self._last_result = FeatureVectorResult.from_row(
+                last.names, values, missing_mask, {}, stale_features=stale
+            )
+            return self._last_result
+        return FeatureVectorResult.from_row(
+            last.names,
+            last.values,
+            last.missing_mask,
+            last.mapped_state_values,
+            unchanged=True,
+            stale_features=last.stale_features,
         )
 
 
@@ -153,25 +576,117 @@ class RealtimeHistoryFeatureProvider:
         feature_types: dict[str, str],
         state_mappings: dict[str, dict[str, float]],
         history_feature_loader: Callable[[list[str]], dict[str, float]],
+        time_features: TimeFeatureSource | None = None,
+        history_features: Callable[[str], bool] | None = None,
     ) -> None:
         self._state_provider = HassStateFeatureProvider(
             hass=hass,
             required_features=required_features,
             feature_types=feature_types,
             state_mappings=state_mappings,
+            time_features=time_features,
+            derived_features=history_features,
         )
         self._required_features = list(required_features)
         self._history_feature_loader = history_feature_loader
+        self._slot_by_name = {
+            name: index for index, name in reversed(list(enumerate(self._required_features)))
+        }
+        self._extra_names: tuple[str, ...] = ()
+        self._names = tuple(self._required_features)
+
+    def rebuild(self) -> None:
+        """Full re-read of state-backed features (startup or configuration change)."""
+        self._state_provider.rebuild()
+
+    def update_entity(self, entity_id: str, new_state: Any) -> bool:
+        """Patch a single state-backed feature from a state-change event."""
+        return self._state_provider.update_entity(entity_id, new_state)
+
+    @property
+    def watched_entities(self) -> list[str]:
+        return self._state_provider.watched_entities
+
+    def attributes_changed(self, entity_id: str, old_state: Any, new_state: Any) -> bool:
+        return self._state_provider.attributes_changed(entity_id, old_state, new_state)
 
     def load(self) -> FeatureVectorResult:
         base = self._state_provider.load()
         history_values = self._history_feature_loader(self._required_features)
-        merged_values = dict(base.feature_values)
-        merged_values.update({key: float(value) for key, value in history_values.items()})
-
-        missing = [feature for feature in self._required_features if feature not in merged_values]
-        return FeatureVectorResult(
-            feature_values=merged_values,
-            missing_features=missing,
-            mapped_state_values=dict(base.mapped_state_values),
+        values = base.values
+        missing_mask = base.missing_mask
+        extras: list[tuple[str, float]] = []
+        for name, value in history_values.items():
+            index = self._slot_by_name.get(name)
+            if index is None:
+                extras.append((name, float(value)))
+                continue
+            values[index] = float(value)
+            missing_mask &= ~(1 << index)
+
+        names = self._names
+        if extras:
+            extra_names = tuple(name for name, _ in extras)
+            if extra_names != self._extra_names:
+                self._extra_names = extra_names
+                self._names = names = tuple(self._required_features) + extra_names
+            else:
+                names = self._names
+            values.extend(value for _, value in extras)
+        elif self._extra_names:
+            self._extra_names = ()
+            self._names = names = tuple(self._required_features)
+
+        return FeatureVectorResult.from_row(
+            names,
+            values,
+            missing_mask,
+            base.mapped_state_values,
         )
+
+
+class FeatureProvider(Protocol):
+    """Synchronous provider; ``load`` must not block when called from the event loop."""
+
+    def load(self) -> FeatureVectorResult: ...
+
+
+@runtime_checkable
+class AsyncFeatureProvider(Protocol):
+    """Provider awaited by the sensor; I/O-bound sources implement this directly."""
+
+    async def async_load(self) -> FeatureVectorResult: ...
+
+
+class SyncFeatureProviderAdapter:
+    """Expose a synchronous provider through ``async_load``.
+
+    Providers that set ``blocking_io = True`` are loaded in the executor; others
+    are cheap in-memory reads and run inline on the event loop.
+    """
+
+    def __init__(self, provider: FeatureProvider, *, hass: Any) -> None:
+        self._provider = provider
+        self._hass = hass
+        self._blocking_io = bool(getattr(provider, "blocking_io", False))
+
+    @property
+    def provider(self) -> FeatureProvider:
+        return self._provider
+
+    @property
+    def runs_inline(self) -> bool:
+        """True when ``async_load`` never leaves the event loop."""
+        return not self._blocking_io
+
+    async def async_load(self) -> FeatureVectorResult:
+        if self._blocking_io:
+            return await self._hass.async_add_executor_job(self._provider.load)
+        return self._provider.load()
+
+
+def as_async_provider(provider: Any, *, hass: Any) -> AsyncFeatureProvider:
+    """Return ``provider`` itself when it is async, otherwise wrap it in the adapter."""
+    if isinstance(provider, AsyncFeatureProvider):
+        return provider
+    return SyncFeatureProviderAdapter(provider, hass=hass)
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
 from importlib import import_module
 from typing import Any
 
@@ -29,16 +30,43 @@ class LightGBMModelSpec:
 
     feature_names: list[str]
     model_payload: dict[str, Any]
+    _booster: Any = field(default=None, init=False, repr=False, compare=False)
+
+
+def _parsed_booster(model: LightGBMModelSpec, lightgbm: Any, booster_model_str: str) -> Any:
+    """Return the booster for a model spec, parsing the model string only once."""
+    if model._booster is None:
+        model._booster = lightgbm.Booster(model_str=booster_model_str)
+    return model._booster
+
+
+def preload_booster(model: LightGBMModelSpec) -> bool:
+    """Parse the booster ahead of the first prediction; return whether one was parsed."""
+    booster_model_str = model.model_payload.get("booster_model_str")
+    if not isinstance(booster_model_str, str) or not booster_model_str.strip():
+        return False
+    try:
+        lightgbm = import_module("lightgbm")
+        _parsed_booster(model, lightgbm, booster_model_str)
+    except Exception:
+        # Inference reports lightgbm_not_installed / lightgbm_inference_error later.
+        return False
+    return True
 
 
 def run_lightgbm_inference(
     *,
-    feature_values: dict[str, float],
+    feature_values: Mapping[str, float] | None = None,
     missing_features: list[str],
     model: LightGBMModelSpec,
     threshold: float,
+    ordered_row: Sequence[float] | None = None,
 ) -> InferenceResult:
-    """Compute a probability using a LightGBM-like payload contract."""
+    """Compute a probability using a LightGBM-like payload contract.
+
+    ``ordered_row`` (values already in ``model.feature_names`` order) takes
+    precedence over ``feature_values`` so callers can skip the dict lookup.
+    """
     if missing_features:
         return InferenceResult(
             available=False,
@@ -51,7 +79,12 @@ def run_lightgbm_inference(
             decision=None,
         )
 
-    ordered_row = [[float(feature_values.get(name, 0.0)) for name in model.feature_names]]
+    if ordered_row is None:
+        values = feature_values or {}
+        row = [float(values.get(name, 0.0)) for name in model.feature_names]
+    else:
+        row = list(ordered_row)
+    batch = [row]
     booster_model_str = model.model_payload.get("booster_model_str")
     if isinstance(booster_model_str, str) and booster_model_str.strip():
         try:
@@ -68,9 +101,9 @@ def run_lightgbm_inference(
                 decision=None,
             )
         try:
-            booster = lightgbm.Booster(model_str=booster_model_str)
-            raw_probability = float(booster.predict(ordered_row)[0])
-            linear_score = float(booster.predict(ordered_row, raw_score=True)[0])
+            booster = _parsed_booster(model, lightgbm, booster_model_str)
+            raw_probability = float(booster.predict(batch)[0])
+            linear_score = float(booster.predict(batch, raw_score=True)[0])
         except Exception:
             return InferenceResult(
                 available=False,
@@ -85,7 +118,7 @@ def run_lightgbm_inference(
 
         feature_contributions: dict[str, float] = {}
         try:
-            contributions = booster.predict(ordered_row, pred_contrib=True)[0]
+            contributions = booster.predict(batch, pred_contrib=True)[0]
             for index, feature_name in enumerate(model.feature_names):
                 if index < len(contributions):
                     feature_contributions[feature_name] = float(contributions[index])
@@ -124,7 +157,7 @@ def run_lightgbm_inference(
     feature_contributions: dict[str, float] = {}
 
     for index, feature_name in enumerate(model.feature_names):
-        value = float(feature_values.get(feature_name, 0.0))
+        value = float(row[index]) if index < len(row) else 0.0
         weight = float(raw_weights[index]) if index < len(raw_weights) else 0.0
         contribution = weight * value
         feature_contributions[feature_name] = contribution
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import sqlite3
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 import re
+from time import perf_counter
 
 from .const import DEFAULT_ML_ARTIFACT_VIEW
 
@@ -20,6 +22,15 @@ class LightGBMModelArtifact:
     model_type: str
     feature_set_version: str
     created_at_utc: str | None
+    fingerprint: str | None = None
+    artifact_bytes: int | None = None
+    load_timings: dict[str, float] = field(default_factory=dict)
+
+
+def artifact_fingerprint(artifact_json: str | bytes) -> str:
+    """Return a short stable fingerprint for a raw artifact payload."""
+    raw = artifact_json.encode("utf-8") if isinstance(artifact_json, str) else bytes(artifact_json)
+    return hashlib.sha256(raw).hexdigest()[:16]
 
 
 def _load_latest_artifact_row(
@@ -56,11 +67,16 @@ def load_latest_lightgbm_model_artifact(
     artifact_view: str = DEFAULT_ML_ARTIFACT_VIEW,
 ) -> LightGBMModelArtifact:
     """Load and parse latest LightGBM model artifact from SQLite contract view."""
+    started = perf_counter()
     row = _load_latest_artifact_row(db_path=db_path, artifact_view=artifact_view)
+    read_done = perf_counter()
 
-    payload = json.loads(row["artifact_json"])
+    artifact_json = row["artifact_json"]
+    raw_artifact = artifact_json.encode("utf-8") if isinstance(artifact_json, str) else bytes(artifact_json)
+    payload = json.loads(artifact_json)
     model_payload = dict(payload.get("model", {}))
     feature_names = [str(name) for name in payload.get("feature_names", [])]
+    decode_done = perf_counter()
 
     return LightGBMModelArtifact(
         model_payload=model_payload,
@@ -68,4 +84,10 @@ def load_latest_lightgbm_model_artifact(
         model_type=str(row["model_type"]),
         feature_set_version=str(row["feature_set_version"]),
         created_at_utc=row["created_at_utc"],
+        fingerprint=artifact_fingerprint(raw_artifact),
+        artifact_bytes=len(raw_artifact),
+        load_timings={
+            "sqlite_read": read_done - started,
+            "json_decode": decode_done - read_done,
+        },
     )
@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
+import json
+import logging
 import sqlite3
 from dataclasses import dataclass, field
 from pathlib import Path
+from time import perf_counter
 from typing import Callable
 
-from .lightgbm_inference import LightGBMModelSpec
-from .ml_artifact import LightGBMModelArtifact, load_latest_lightgbm_model_artifact
+from .const import DEFAULT_MODEL_LOAD_BUDGET_SECONDS
+from .lightgbm_inference import LightGBMModelSpec, preload_booster
+from .ml_artifact import (
+    LightGBMModelArtifact,
+    artifact_fingerprint,
+    load_latest_lightgbm_model_artifact,
+)
+
+_LOGGER = logging.getLogger(__name__)
 
 
 @dataclass(slots=True)
@@ -32,11 +42,13 @@ class SqliteLightGBMModelProvider:
         artifact_view: str,
         fallback_feature_names: list[str],
         artifact_loader: Callable[[str, str], LightGBMModelArtifact] = load_latest_lightgbm_model_artifact,
+        load_budget_seconds: float | None = DEFAULT_MODEL_LOAD_BUDGET_SECONDS,
     ) -> None:
         self._db_path = db_path
         self._artifact_view = artifact_view
         self._fallback_feature_names = list(fallback_feature_names)
         self._artifact_loader = artifact_loader
+        self._load_budget_seconds = load_budget_seconds
 
     def _validate_contract_version(self) -> str | None:
         db_file = Path(self._db_path)
@@ -103,23 +115,67 @@ class SqliteLightGBMModelProvider:
             "artifact_created_at_utc": row["artifact_created_at_utc"],
         }
 
+    def _check_load_budget(self, timings: dict[str, float]) -> None:
+        total = timings.get("total", 0.0)
+        if self._load_budget_seconds is None or total <= self._load_budget_seconds:
+            return
+        _LOGGER.warning(
+            "Model load from %s took %.3fs (budget %.3fs); stages: %s",
+            self._artifact_view,
+            total,
+            self._load_budget_seconds,
+            ", ".join(
+                f"{stage}={seconds * 1000.0:.1f}ms"
+                for stage, seconds in timings.items()
+                if stage != "total"
+            ),
+        )
+
     def load(self) -> ModelProviderResult:
+        timings: dict[str, float] = {}
+        started = perf_counter()
         training_result = self._load_latest_training_result()
+        stage_started = perf_counter()
+        timings["training_result_read"] = stage_started - started
         try:
             contract_error = self._validate_contract_version()
+            timings["contract_check"] = perf_counter() - stage_started
             if contract_error is not None:
                 raise ValueError(contract_error)
+            stage_started = perf_counter()
             artifact = self._artifact_loader(self._db_path, self._artifact_view)
+            artifact_elapsed = perf_counter() - stage_started
+            # The loader's own stages run inside artifact_load; report only the
+            # remainder so the stages add up to ``total`` without double counting.
+            timings.update(artifact.load_timings)
+            timings["artifact_load"] = max(
+                artifact_elapsed - sum(artifact.load_timings.values()), 0.0
+            )
             model = LightGBMModelSpec(
                 feature_names=list(artifact.feature_names),
                 model_payload=dict(artifact.model_payload),
             )
+            stage_started = perf_counter()
+            if preload_booster(model):
+                timings["booster_parse"] = perf_counter() - stage_started
+            timings["total"] = perf_counter() - started
+            self._check_load_budget(timings)
+            fingerprint = artifact.fingerprint or artifact_fingerprint(
+                json.dumps(
+                    {"model": artifact.model_payload, "feature_names": artifact.feature_names},
+                    sort_keys=True,
+                    default=str,
+                )
+            )
             artifact_meta = {
+                "fingerprint": fingerprint,
                 "model_type": artifact.model_type,
                 "feature_set_version": artifact.feature_set_version,
                 "created_at_utc": artifact.created_at_utc,
                 "artifact_view": self._artifact_view,
                 "db_path": self._db_path,
+                "artifact_bytes": artifact.artifact_bytes,
+                "load_timings_ms": _timings_ms(timings),
             }
             return ModelProviderResult(
                 model=model,
@@ -129,6 +185,8 @@ class SqliteLightGBMModelProvider:
                 training_result=training_result,
             )
         except Exception as exc:  # pragma: no cover - runtime fallback guard
+            timings["total"] = perf_counter() - started
+            self._check_load_budget(timings)
             fallback = LightGBMModelSpec(
                 feature_names=list(self._fallback_feature_names),
                 model_payload={},
@@ -137,6 +195,10 @@ class SqliteLightGBMModelProvider:
                 model=fallback,
                 source="manual",
                 artifact_error=str(exc),
-                artifact_meta={},
+                artifact_meta={"load_timings_ms": _timings_ms(timings)},
                 training_result=training_result,
             )
+
+
+def _timings_ms(timings: dict[str, float]) -> dict[str, float]:
+    return {stage: round(seconds * 1000.0, 3) for stage, seconds in timings.items()}
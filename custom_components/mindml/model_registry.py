@@ -0,0 +1,150 @@
+"""In-memory registry of recently loaded model versions per config entry."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Callable
+
+from .const import DATA_MODEL_REGISTRY, DEFAULT_MODEL_HISTORY_SIZE
+from .domain_data import get_domain_singleton
+from .model_provider import ModelProviderResult
+
+
+@dataclass(slots=True)
+class ModelVersion:
+    """Parsed model plus the fingerprint it was loaded under."""
+
+    fingerprint: str
+    result: ModelProviderResult
+    loaded_at: str
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "loaded_at": self.loaded_at,
+            "created_at_utc": self.result.artifact_meta.get("created_at_utc"),
+            "model_type": self.result.artifact_meta.get("model_type"),
+            "feature_set_version": self.result.artifact_meta.get("feature_set_version"),
+            "training_status": self.result.training_result.get("status"),
+        }
+
+
+@dataclass(slots=True)
+class _EntryModels:
+    versions: deque[ModelVersion]
+    latest: ModelProviderResult | None = None
+    pinned: str | None = None
+    listeners: list[Callable[[], None]] = field(default_factory=list)
+
+
+class ModelRegistry:
+    """Keep the last N parsed models per entry so rollback is a pointer swap."""
+
+    def __init__(self, *, history_size: int = DEFAULT_MODEL_HISTORY_SIZE) -> None:
+        self._history_size = max(1, int(history_size))
+        self._entries: dict[str, _EntryModels] = {}
+
+    def _entry(self, entry_id: str) -> _EntryModels:
+        entry = self._entries.get(entry_id)
+        if entry is None:
+            entry = _EntryModels(versions=deque(maxlen=self._history_size))
+            self._entries[entry_id] = entry
+        return entry
+
+    def record(self, entry_id: str, result: ModelProviderResult) -> ModelProviderResult:
+        """Record a freshly loaded model and return the result that should be active."""
+        entry = self._entry(entry_id)
+        entry.latest = result
+        fingerprint = result.artifact_meta.get("fingerprint")
+        if result.source == "ml_data_layer" and fingerprint:
+            fingerprint = str(fingerprint)
+            for version in list(entry.versions):
+                if version.fingerprint == fingerprint:
+                    # Same artifact reloaded: keep the already parsed model (and its booster).
+                    result.model = version.result.model
+                    entry.versions.remove(version)
+            if (
+                len(entry.versions) == entry.versions.maxlen
+                and len(entry.versions) > 1
+                and entry.versions[0].fingerprint == entry.pinned
+            ):
+                # Never let the pinned version fall out of the ring.
+                del entry.versions[1]
+            entry.versions.append(
+                ModelVersion(
+                    fingerprint=fingerprint,
+                    result=result,
+                    loaded_at=datetime.now(UTC).isoformat(),
+                )
+            )
+        return self.active(entry_id) or result
+
+    def active(self, entry_id: str) -> ModelProviderResult | None:
+        """Return the pinned model if any, otherwise the most recently loaded one."""
+        entry = self._entries.get(entry_id)
+        if entry is None:
+            return None
+        if entry.pinned is not None:
+            for version in entry.versions:
+                if version.fingerprint == entry.pinned:
+                    return version.result
+        return entry.latest
+
+    def versions(self, entry_id: str) -> list[ModelVersion]:
+        """Return retained versions, newest first."""
+        entry = self._entries.get(entry_id)
+        if entry is None:
+            return []
+        return list(reversed(entry.versions))
+
+    def pinned_fingerprint(self, entry_id: str) -> str | None:
+        entry = self._entries.get(entry_id)
+        return entry.pinned if entry is not None else None
+
+    def pin(self, entry_id: str, fingerprint: str) -> ModelProviderResult:
+        """Pin an entry to a retained model version."""
+        entry = self._entries.get(entry_id)
+        if entry is None:
+            raise KeyError(f"No models recorded for entry {entry_id}")
+        for version in entry.versions:
+            if version.fingerprint == fingerprint:
+                entry.pinned = fingerprint
+                self._notify(entry)
+                return version.result
+        raise KeyError(f"Model version {fingerprint} is not retained for entry {entry_id}")
+
+    def unpin(self, entry_id: str) -> ModelProviderResult | None:
+        """Return an entry to the most recently loaded model."""
+        entry = self._entries.get(entry_id)
+        if entry is None:
+            raise KeyError(f"No models recorded for entry {entry_id}")
+        entry.pinned = None
+        self._notify(entry)
+        return entry.latest
+
+    def remove(self, entry_id: str) -> None:
+        """Forget every retained version (and its parsed booster) for an entry."""
+        self._entries.pop(entry_id, None)
+
+    def async_add_listener(self, entry_id: str, listener: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback fired when the active model for an entry changes."""
+        entry = self._entry(entry_id)
+        entry.listeners.append(listener)
+
+        def _remove() -> None:
+            if listener in entry.listeners:
+                entry.listeners.remove(listener)
+
+        return _remove
+
+    @staticmethod
+    def _notify(entry: _EntryModels) -> None:
+        for listener in list(entry.listeners):
+            listener()
+
+
+def get_model_registry(hass: Any) -> ModelRegistry:
+    """Return the domain-wide model registry, creating it on first use."""
+    return get_domain_singleton(hass, DATA_MODEL_REGISTRY, ModelRegistry)
@@ -0,0 +1,66 @@
+"""Backfill rolling window trackers from the Home Assistant recorder."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from .rolling_window import RollingWindowTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _history_events(
+    states_by_entity: dict[str, list[Any]],
+) -> list[tuple[datetime, str, str]]:
+    """Flatten recorder rows into tracker events, dropping attribute-only repeats."""
+    events: list[tuple[datetime, str, str]] = []
+    for entity_id, states in states_by_entity.items():
+        previous: str | None = None
+        for state in states:
+            value = getattr(state, "state", None)
+            if value is None or value == previous:
+                continue
+            previous = value
+            events.append((state.last_changed, entity_id, value))
+    return events
+
+
+async def async_backfill_tracker(
+    hass: Any,
+    tracker: RollingWindowTracker,
+    entity_ids: list[str],
+    *,
+    window_hours: float,
+    until: datetime,
+) -> int:
+    """Replay recorder history for ``entity_ids`` over the window into ``tracker``.
+
+    Runs one bulk history query in the recorder executor. Returns the number of
+    events replayed, or 0 when the recorder is unavailable.
+    """
+    if not entity_ids:
+        return 0
+    try:
+        from homeassistant.components.recorder import get_instance, history
+    except ImportError:
+        return 0
+
+    start = until - timedelta(hours=window_hours)
+    try:
+        states_by_entity = await get_instance(hass).async_add_executor_job(
+            lambda: history.get_significant_states(
+                hass,
+                start,
+                end_time=until,
+                entity_ids=entity_ids,
+                include_start_time_state=False,
+                significant_changes_only=False,
+                no_attributes=True,
+            )
+        )
+    except Exception as exc:
+        _LOGGER.debug("Rolling window backfill skipped: %s", exc)
+        return 0
+    return tracker.replay_events(_history_events(states_by_entity), until=until)
@@ -2,45 +2,1099 @@
 
 from __future__ import annotations
 
+from array import array
 from collections import deque
-from datetime import UTC, datetime, timedelta
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, datetime
+import math
+import re
+from time import monotonic
+from typing import Any, Final
+
+from .const import DEFAULT_ROLLING_WINDOW_MAX_EVENTS
+
+WINDOW_EVENT_COUNT: Final = "event_count"
+WINDOW_ON_RATIO: Final = "on_ratio"
+WINDOW_SECONDS_SINCE_LAST_EVENT: Final = "seconds_since_last_event"
+WINDOW_ON_DURATION_SECONDS: Final = "on_duration_seconds"
+ENTITY_FEATURE_SEPARATOR: Final = "@"
+_GLOBAL_AGGREGATES: Final = frozenset({WINDOW_EVENT_COUNT, WINDOW_ON_RATIO})
+_ENTITY_AGGREGATES: Final = frozenset(
+    {
+        WINDOW_EVENT_COUNT,
+        WINDOW_ON_RATIO,
+        WINDOW_SECONDS_SINCE_LAST_EVENT,
+        WINDOW_ON_DURATION_SECONDS,
+    }
+)
+
+NUMERIC_MEAN: Final = "mean"
+NUMERIC_MIN: Final = "min"
+NUMERIC_MAX: Final = "max"
+NUMERIC_VARIANCE: Final = "variance"
+NUMERIC_STD: Final = "std"
+NUMERIC_EWMA: Final = "ewma"
+
+_NUMERIC_PATTERN: Final = re.compile(r"^(mean|min|max|variance|std|ewma)(?:_(\d+)([mhd]))?$")
+_HORIZON_PATTERN: Final = re.compile(r"^(event_count|on_ratio)_(\d+)([mhd])$")
+_HORIZON_UNIT_SECONDS: Final = {"m": 60.0, "h": 3600.0, "d": 86400.0}
+
+OVERFLOW_DROP_OLDEST: Final = "drop_oldest"
+OVERFLOW_DROP_NEWEST: Final = "drop_newest"
+# Bytes per ring entry: float64 timestamp + uint32 entity, state and count.
+EVENT_BYTES: Final = 20
+_INITIAL_CAPACITY: Final = 64
+
+# Kinds of entries in a compiled feature plan (see ``RollingWindowTracker._plan``).
+_PLAN_HORIZON: Final = 0
+_PLAN_NUMERIC: Final = 1
+_PLAN_DURATION: Final = 2
+_PLAN_ENTITY: Final = 3
+_MAX_PLANS: Final = 8
+
+
+def parse_horizon_feature(feature: str) -> tuple[str, float] | None:
+    """Parse ``event_count_1h`` or ``on_ratio_15m`` into (aggregate, horizon seconds)."""
+    match = _HORIZON_PATTERN.match(feature)
+    if match is None or int(match.group(2)) <= 0:
+        return None
+    return match.group(1), int(match.group(2)) * _HORIZON_UNIT_SECONDS[match.group(3)]
+
+
+def parse_numeric_feature(feature: str) -> tuple[str, str, float | None] | None:
+    """Parse ``mean_1h@sensor.temperature`` into (statistic, entity_id, horizon seconds).
+
+    Without a horizon suffix (``max@sensor.power``) the horizon is ``None``,
+    meaning the tracker's main window.
+    """
+    aggregate, separator, entity_id = feature.partition(ENTITY_FEATURE_SEPARATOR)
+    match = _NUMERIC_PATTERN.match(aggregate)
+    if not separator or not entity_id or match is None:
+        return None
+    if match.group(2) is None:
+        return match.group(1), entity_id, None
+    if int(match.group(2)) <= 0:
+        return None
+    return (
+        match.group(1),
+        entity_id,
+        int(match.group(2)) * _HORIZON_UNIT_SECONDS[match.group(3)],
+    )
+
+
+def parse_window_feature(feature: str) -> tuple[str, str | None] | None:
+    """Parse ``event_count`` or ``on_ratio@binary_sensor.door`` into (aggregate, entity_id)."""
+    aggregate, separator, entity_id = feature.partition(ENTITY_FEATURE_SEPARATOR)
+    if not separator:
+        if aggregate in _GLOBAL_AGGREGATES or parse_horizon_feature(aggregate) is not None:
+            return aggregate, None
+        return None
+    if entity_id and (aggregate in _ENTITY_AGGREGATES or parse_numeric_feature(feature)):
+        return aggregate, entity_id
+    return None
+
+
+def is_window_feature(feature: str) -> bool:
+    """Return whether a feature name is served by the rolling window tracker."""
+    return parse_window_feature(feature) is not None
+
+
+def _numeric_value(state: str) -> float | None:
+    try:
+        value = float(state)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _reading(timestamp: float, value: float) -> tuple[float, int, float, float, float, float, float]:
+    """A single numeric reading in ``_NumericWindow`` entry form."""
+    return (timestamp, 1, value, 0.0, value, value, value)
+
+
+class _EventRing:
+    """Growable ring of (timestamp, entity code, state code, count) up to ``max_events``.
+
+    Raw events have a count of 1; closed time buckets store one entry per
+    (entity, state) with the number of events it stands for.
+    """
+
+    __slots__ = ("max_events", "timestamps", "entity_codes", "state_codes", "counts", "head", "size")
+
+    def __init__(self, max_events: int) -> None:
+        self.max_events = max_events
+        capacity = min(_INITIAL_CAPACITY, max_events)
+        self.timestamps = array("d", [0.0]) * capacity
+        self.entity_codes = array("I", [0]) * capacity
+        self.state_codes = array("I", [0]) * capacity
+        self.counts = array("I", [0]) * capacity
+        self.head = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.max_events
+
+    def _grow(self) -> None:
+        capacity = len(self.timestamps)
+        padding = min(capacity * 2, self.max_events) - self.size
+        order = [(self.head + offset) % capacity for offset in range(self.size)]
+
+        def _regrown(values: array) -> array:
+            return array(values.typecode, [values[i] for i in order]) + array(
+                values.typecode, [0]
+            ) * padding
+
+        self.timestamps = _regrown(self.timestamps)
+        self.entity_codes = _regrown(self.entity_codes)
+        self.state_codes = _regrown(self.state_codes)
+        self.counts = _regrown(self.counts)
+        self.head = 0
+
+    def append(self, timestamp: float, entity_code: int, state_code: int, count: int = 1) -> None:
+        if self.size == len(self.timestamps):
+            self._grow()
+        index = (self.head + self.size) % len(self.timestamps)
+        self.timestamps[index] = timestamp
+        self.entity_codes[index] = entity_code
+        self.state_codes[index] = state_code
+        self.counts[index] = count
+        self.size += 1
+
+    def at(self, offset: int) -> tuple[float, int, int]:
+        """Return (timestamp, state code, count) of the entry ``offset`` places after the oldest."""
+        index = (self.head + offset) % len(self.timestamps)
+        return self.timestamps[index], self.state_codes[index], self.counts[index]
+
+    def popleft(self) -> tuple[int, int]:
+        """Drop the oldest entry and return its (state code, count)."""
+        head = self.head
+        self.head = (head + 1) % len(self.timestamps)
+        self.size -= 1
+        return self.state_codes[head], self.counts[head]
+
+    def __iter__(self) -> Iterator[tuple[float, int, int, int]]:
+        capacity = len(self.timestamps)
+        for offset in range(self.size):
+            index = (self.head + offset) % capacity
+            yield (
+                self.timestamps[index],
+                self.entity_codes[index],
+                self.state_codes[index],
+                self.counts[index],
+            )
+
+
+class _Horizon:
+    """Prune cursor and running counts for one horizon over the shared event ring.
+
+    ``cursor`` is the absolute sequence number of the oldest ring entry still
+    inside the horizon; everything from there to the newest entry is counted.
+    """
+
+    __slots__ = ("seconds", "cursor", "event_count", "on_count")
+
+    def __init__(self, seconds: float, cursor: int = 0) -> None:
+        self.seconds = seconds
+        self.cursor = cursor
+        self.event_count = 0
+        self.on_count = 0
+
+
+class _EntityWindow:
+    """Window events and running counts for a single entity.
+
+    Entries are ``[timestamp, count, on_count]``. With ``bucket_seconds`` set,
+    events of one bucket share a single entry timestamped at the bucket start,
+    as closed buckets do in the global ring.
+    """
+
+    __slots__ = ("bucket_seconds", "events", "event_count", "on_count", "last_event_at")
+
+    def __init__(self, bucket_seconds: float | None = None) -> None:
+        self.bucket_seconds = bucket_seconds
+        self.events: deque[list[Any]] = deque()
+        self.event_count = 0
+        self.on_count = 0
+        self.last_event_at: float | None = None
+
+    def append(self, timestamp: float, count: int, on_count: int) -> None:
+        if self.last_event_at is None or timestamp > self.last_event_at:
+            self.last_event_at = timestamp
+        events = self.events
+        if self.bucket_seconds is not None:
+            timestamp = timestamp // self.bucket_seconds * self.bucket_seconds
+            if events and events[-1][0] == timestamp:
+                events[-1][1] += count
+                events[-1][2] += on_count
+                self.event_count += count
+                self.on_count += on_count
+                return
+        events.append([timestamp, count, on_count])
+        self.event_count += count
+        self.on_count += on_count
+
+    def replay(self, entries: list[tuple[float, int, int]]) -> None:
+        merged = sorted([*entries, *self.events], key=lambda entry: entry[0])
+        self.events = deque()
+        self.event_count = 0
+        self.on_count = 0
+        for timestamp, count, on_count in merged:
+            self.append(timestamp, count, on_count)
+
+    def prune(self, cutoff: float) -> None:
+        events = self.events
+        while events and events[0][0] < cutoff:
+            _, count, on_count = events.popleft()
+            self.event_count -= count
+            self.on_count -= on_count
+
+
+class _StateIntervals:
+    """Closed "on" intervals plus a running total, for O(1) amortized duration reads."""
+
+    __slots__ = ("active_state", "intervals", "closed_seconds", "active_since", "last_transition_at")
+
+    def __init__(self, active_state: str) -> None:
+        self.active_state = active_state
+        self.intervals: deque[tuple[float, float]] = deque()
+        self.closed_seconds = 0.0
+        self.active_since: float | None = None
+        self.last_transition_at: float | None = None
+
+    def transition(self, timestamp: float, state: str) -> None:
+        if self.last_transition_at is not None and timestamp < self.last_transition_at:
+            return
+        self.last_transition_at = timestamp
+        if state == self.active_state:
+            if self.active_since is None:
+                self.active_since = timestamp
+        elif self.active_since is not None:
+            self.intervals.append((self.active_since, timestamp))
+            self.closed_seconds += timestamp - self.active_since
+            self.active_since = None
+
+    def active_seconds(self, now: float, cutoff: float) -> float:
+        intervals = self.intervals
+        while intervals and intervals[0][1] <= cutoff:
+            start, end = intervals.popleft()
+            self.closed_seconds -= end - start
+        total = self.closed_seconds
+        if intervals and intervals[0][0] < cutoff:
+            # The oldest interval straddles the window edge; count only its tail.
+            total -= cutoff - intervals[0][0]
+        if self.active_since is not None:
+            total += now - max(self.active_since, cutoff)
+        return max(total, 0.0)
+
+
+def _combine_moments(
+    count: int, mean: float, m2: float, other_count: int, other_mean: float, other_m2: float
+) -> tuple[int, float, float]:
+    """Count, mean and sum of squared deviations of two sample sets taken together."""
+    total = count + other_count
+    delta = other_mean - mean
+    return (
+        total,
+        mean + delta * other_count / total,
+        m2 + other_m2 + delta * delta * count * other_count / total,
+    )
+
+
+def _remove_moments(
+    count: int, mean: float, m2: float, other_count: int, other_mean: float, other_m2: float
+) -> tuple[int, float, float]:
+    """Inverse of ``_combine_moments``: take the ``other`` sample set back out."""
+    remaining = count - other_count
+    if remaining <= 0:
+        return 0, 0.0, 0.0
+    remaining_mean = (mean * count - other_mean * other_count) / remaining
+    delta = other_mean - remaining_mean
+    remaining_m2 = m2 - other_m2 - delta * delta * remaining * other_count / count
+    return remaining, remaining_mean, max(remaining_m2, 0.0)
+
+
+class _NumericWindow:
+    """Streaming mean/variance/min/max over a time window, plus a time-decayed EWMA.
+
+    Samples are ``[timestamp, count, mean, m2, last, min, max]`` entries. Mean
+    and variance combine entries with Welford updates and take them back out on
+    expiry; min and max use monotonic deques, so every entry is added and
+    removed once. With ``bucket_seconds`` set, readings of one bucket share a
+    single entry timestamped at the bucket start, so memory follows the number
+    of buckets rather than the reading rate.
+
+    A reading holds until the entity reports a new one: when samples expire, the
+    newest of them is carried at the window start, so a quiet entity keeps its
+    last value instead of dropping out of the window.
+    """
+
+    __slots__ = (
+        "seconds",
+        "bucket_seconds",
+        "samples",
+        "count",
+        "mean",
+        "m2",
+        "minima",
+        "maxima",
+        "ewma",
+        "ewma_at",
+        "carried",
+    )
+
+    def __init__(self, seconds: float, bucket_seconds: float | None = None) -> None:
+        self.seconds = seconds
+        self.bucket_seconds = bucket_seconds
+        self._reset()
+
+    def _reset(self) -> None:
+        self.samples: deque[list[Any]] = deque()
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minima: deque[tuple[float, float]] = deque()
+        self.maxima: deque[tuple[float, float]] = deque()
+        self.ewma: float | None = None
+        self.ewma_at = 0.0
+        self.carried = False
+
+    def add(self, timestamp: float, value: float) -> None:
+        self._merge(timestamp, 1, value, 0.0, value, value, value)
+        self._decay(timestamp, value)
+
+    def _decay(self, timestamp: float, value: float) -> None:
+        if self.ewma is None:
+            self.ewma = value
+        else:
+            weight = 1.0 - math.exp(-max(timestamp - self.ewma_at, 0.0) / self.seconds)
+            self.ewma += weight * (value - self.ewma)
+        self.ewma_at = timestamp
+
+    def _merge(
+        self,
+        timestamp: float,
+        count: int,
+        mean: float,
+        m2: float,
+        last: float,
+        low: float,
+        high: float,
+    ) -> None:
+        """Append ``count`` readings summarized by their moments, last value and range."""
+        samples = self.samples
+        if self.bucket_seconds is not None:
+            timestamp = timestamp // self.bucket_seconds * self.bucket_seconds
+        newest = samples[-1] if samples else None
+        if (
+            self.bucket_seconds is not None
+            and newest is not None
+            and newest[0] == timestamp
+            and not (self.carried and len(samples) == 1)
+        ):
+            newest[1], newest[2], newest[3] = _combine_moments(
+                newest[1], newest[2], newest[3], count, mean, m2
+            )
+            newest[4] = last
+            newest[5] = min(newest[5], low)
+            newest[6] = max(newest[6], high)
+        else:
+            samples.append([timestamp, count, mean, m2, last, low, high])
+        self.count, self.mean, self.m2 = _combine_moments(
+            self.count, self.mean, self.m2, count, mean, m2
+        )
+        minima = self.minima
+        while minima and minima[-1][1] >= low:
+            minima.pop()
+        # An earlier, lower entry of the same timestamp expires together with this one.
+        if not minima or minima[-1][0] != timestamp:
+            minima.append((timestamp, low))
+        maxima = self.maxima
+        while maxima and maxima[-1][1] <= high:
+            maxima.pop()
+        if not maxima or maxima[-1][0] != timestamp:
+            maxima.append((timestamp, high))
+
+    def _carry(self, timestamp: float, value: float) -> None:
+        """Insert ``value`` as the oldest sample, ahead of every current one."""
+        self.samples.appendleft([timestamp, 1, value, 0.0, value, value, value])
+        self.count, self.mean, self.m2 = _combine_moments(
+            self.count, self.mean, self.m2, 1, value, 0.0
+        )
+        if not self.minima or value < self.minima[0][1]:
+            self.minima.appendleft((timestamp, value))
+        if not self.maxima or value > self.maxima[0][1]:
+            self.maxima.appendleft((timestamp, value))
+        self.carried = True
+
+    def prune(self, cutoff: float) -> None:
+        samples = self.samples
+        expired: float | None = None
+        while samples and samples[0][0] < cutoff:
+            _, count, mean, m2, expired, _, _ = samples.popleft()
+            self.carried = False
+            self.count, self.mean, self.m2 = _remove_moments(
+                self.count, self.mean, self.m2, count, mean, m2
+            )
+        while self.minima and self.minima[0][0] < cutoff:
+            self.minima.popleft()
+        while self.maxima and self.maxima[0][0] < cutoff:
+            self.maxima.popleft()
+        if expired is not None and (not samples or samples[0][0] > cutoff):
+            self._carry(cutoff, expired)
+
+    def next_change(self) -> float | None:
+        """Monotonic time at which pruning next changes the aggregates, if any.
+
+        Re-carrying the same value does not; dropping it for a newer one does.
+        """
+        index = 1 if self.carried else 0
+        if len(self.samples) <= index:
+            return None
+        return self.samples[index][0] + self.seconds
+
+    def rebuild(self, entries: Iterable[tuple[Any, ...]]) -> None:
+        """Replace the window contents with ``entries`` merged with the current ones."""
+        merged = sorted([*entries, *self.samples], key=lambda entry: entry[0])
+        self._reset()
+        for entry in merged:
+            self._merge(*entry)
+            self._decay(entry[0], entry[4])
+
+    def aggregate(self, statistic: str) -> float | None:
+        if statistic == NUMERIC_EWMA:
+            return self.ewma
+        count = self.count
+        if not count:
+            return None
+        if statistic == NUMERIC_MEAN:
+            return self.mean
+        if statistic == NUMERIC_MIN:
+            return self.minima[0][1]
+        if statistic == NUMERIC_MAX:
+            return self.maxima[0][1]
+        variance = self.m2 / count
+        return variance if statistic == NUMERIC_VARIANCE else math.sqrt(variance)
 
 
 class RollingWindowTracker:
+    """Windowed event aggregates over monotonic time.
+
+    Time comes from ``clock`` (``time.monotonic`` by default), and
+    ``record_event`` also accepts an explicit timestamp on that clock. Together
+    they allow event streams to be replayed deterministically, faster than real
+    time.
+
+    Global events live in a compact ring buffer (float timestamps plus interned
+    entity/state codes) capped at ``max_events``; when full, ``overflow`` either
+    drops the oldest event or the incoming one. Every horizon (the main window
+    plus any ``event_count_1h``-style features) shares that ring and keeps only
+    its own prune cursor and counts.
+
+    With ``bucket_seconds`` set, events of the newest (partial) bucket are kept
+    raw and exact; once the bucket closes they collapse into one ring entry per
+    (entity, state), timestamped at the bucket start. Memory is then bounded by
+    window / bucket size times distinct (entity, state) pairs, whatever the
+    event rate. Per-entity and numeric windows collapse to one entry per bucket
+    the same way.
+    """
 
     def __init__(
         self,
         *,
         window_hours: float = 7.0,
         feature_states: dict[str, str] | None = None,
+        required_features: list[str] | None = None,
+        max_events: int = DEFAULT_ROLLING_WINDOW_MAX_EVENTS,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+        bucket_seconds: float | None = None,
+        clock: Callable[[], float] | None = None,
     ) -> None:
+        if overflow not in (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST):
+            raise ValueError(f"Unsupported overflow policy: {overflow}")
+        self._clock = clock if clock is not None else monotonic
         self._window_hours = window_hours
+        self._window_seconds = window_hours * 3600.0
         self._feature_states: dict[str, str] = dict(feature_states) if feature_states else {}
-        self._events: deque[tuple[datetime, str, str]] = deque()
+        self._overflow = overflow
+        self._ring = _EventRing(max(1, int(max_events)))
+        # Absolute sequence number of the oldest event still in the ring.
+        self._base_seq = 0
+        self._dropped_events = 0
+        self._bucket_seconds = bucket_seconds if bucket_seconds and bucket_seconds > 0 else None
+        # Raw (timestamp, entity code, state code, count) entries of the open bucket.
+        self._partial: list[tuple[float, int, int, int]] = []
+        self._partial_bucket: int | None = None
+        # Interning tables: entity IDs and states are stored as small integer codes.
+        self._entity_codes: dict[str, int] = {}
+        self._entity_names: list[str] = []
+        self._state_codes: dict[str, int] = {}
+        self._state_names: list[str] = []
+        self._on_code = self._intern_state("on")
+        # The main window plus one entry per distinct horizon feature, keyed by seconds.
+        self._window = _Horizon(self._window_seconds)
+        self._horizons: dict[float, _Horizon] = {self._window_seconds: self._window}
+        # Wall-clock anchor for converting recorder/restore timestamps to monotonic time.
+        self._anchor_monotonic = self._clock()
+        self._anchor_wall = datetime.now(UTC)
+        # Per-entity windows exist only for entities named by a required feature.
+        self._entity_windows: dict[str, _EntityWindow] = {}
+        # Duration tracking sees every transition, before the feature_states filter.
+        self._durations: dict[str, _StateIntervals] = {}
+        # Entities with live transitions; history and restored state must precede them.
+        self._live_transitions: set[str] = set()
+        # Newest live timestamp; later ones never go below it.
+        self._last_recorded_at = -math.inf
+        # Numeric statistics per entity, one window per distinct horizon.
+        self._numeric_windows: dict[str, dict[float, _NumericWindow]] = {}
+        for feature in required_features or []:
+            horizon = parse_horizon_feature(feature)
+            if horizon is not None:
+                self._horizons.setdefault(horizon[1], _Horizon(horizon[1]))
+                continue
+            numeric = parse_numeric_feature(feature)
+            if numeric is not None:
+                _, entity_id, seconds = numeric
+                seconds = self._window_seconds if seconds is None else seconds
+                self._numeric_windows.setdefault(entity_id, {}).setdefault(
+                    seconds, _NumericWindow(seconds, self._bucket_seconds)
+                )
+                continue
+            parsed = parse_window_feature(feature)
+            if parsed is None or parsed[1] is None:
+                continue
+            aggregate, entity_id = parsed
+            if aggregate == WINDOW_ON_DURATION_SECONDS:
+                self._durations.setdefault(
+                    entity_id, _StateIntervals(self._feature_states.get(entity_id, "on"))
+                )
+            else:
+                self._entity_windows.setdefault(entity_id, _EntityWindow(self._bucket_seconds))
+        self._retention_seconds = max(self._horizons)
+        # Compiled plans per required-feature list, so names are parsed only once.
+        self._plans: dict[tuple[str, ...], tuple[list[tuple[int, str, Any, str]], list[Any]]] = {}
 
     @property
     def event_count(self) -> int:
-        return len(self._events)
+        return self._window.event_count + sum(entry[3] for entry in self._partial)
+
+    @property
+    def retention_hours(self) -> float:
+        """Longest horizon, i.e. how much history the tracker needs to be exact."""
+        return self._retention_seconds / 3600.0
+
+    @property
+    def dropped_events(self) -> int:
+        """Events discarded because the ring buffer hit ``max_events``."""
+        return self._dropped_events
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the global event buffer."""
+        return len(self._ring.timestamps) * EVENT_BYTES
+
+    @property
+    def watched_entities(self) -> list[str]:
+        """Entities referenced by per-entity window features."""
+        return list(
+            dict.fromkeys([*self._entity_windows, *self._durations, *self._numeric_windows])
+        )
+
+    @property
+    def duration_entities(self) -> list[str]:
+        """Entities with on-duration tracking."""
+        return list(self._durations)
+
+    @property
+    def seeded_entities(self) -> list[str]:
+        """Entities whose current state should be passed to ``observe_state`` at startup."""
+        return list(dict.fromkeys([*self._durations, *self._numeric_windows]))
+
+    @property
+    def _end_seq(self) -> int:
+        return self._base_seq + len(self._ring)
+
+    def _intern_entity(self, entity_id: str) -> int:
+        code = self._entity_codes.get(entity_id)
+        if code is None:
+            code = len(self._entity_names)
+            self._entity_codes[entity_id] = code
+            self._entity_names.append(entity_id)
+        return code
+
+    def _intern_state(self, state: str) -> int:
+        code = self._state_codes.get(state)
+        if code is None:
+            code = len(self._state_names)
+            self._state_codes[state] = code
+            self._state_names.append(state)
+        return code
+
+    def _to_monotonic(self, timestamp: datetime) -> float:
+        return self._anchor_monotonic + (timestamp - self._anchor_wall).total_seconds()
 
-    def record_event(self, entity_id: str, state: str) -> None:
+    def timestamp_for(self, moment: datetime) -> float:
+        """Map a wall-clock time (e.g. an event's ``time_fired``) onto the tracker clock.
+
+        Clamped to the current clock reading so skew cannot place events in the
+        future; ``record_event`` keeps the result from going backwards.
+        """
+        return min(self._to_monotonic(moment), self._clock())
+
+    def events(self) -> Iterator[tuple[float, str, str]]:
+        """Yield (monotonic timestamp, entity_id, state) for buffered events, oldest first."""
+        entity_names = self._entity_names
+        state_names = self._state_names
+        for timestamp, entity_code, state_code, count in self._entries():
+            event = (timestamp, entity_names[entity_code], state_names[state_code])
+            for _ in range(count):
+                yield event
+
+    def _entries(self) -> Iterator[tuple[float, int, int, int]]:
+        yield from self._ring
+        yield from self._partial
+
+    def observe_state(self, entity_id: str, state: str, since: datetime) -> None:
+        """Seed duration and numeric tracking with a current state when nothing is known yet."""
+        intervals = self._durations.get(entity_id)
+        if intervals is not None and intervals.last_transition_at is None:
+            intervals.transition(self._to_monotonic(since), state)
+        windows = self._numeric_windows.get(entity_id)
+        value = _numeric_value(state) if windows else None
+        if value is None:
+            return
+        now = self._clock()
+        for window in windows.values():
+            if not window.samples and window.ewma is None:
+                # The value has held since ``since``; count it from the window start at most.
+                window.add(max(self._to_monotonic(since), now - window.seconds), value)
+
+    def _accepts(self, entity_id: str, state: str) -> bool:
+        expected_state = self._feature_states.get(entity_id)
+        return expected_state is None or expected_state == state
+
+    def _drop_oldest(self) -> None:
+        state_code, count = self._ring.popleft()
+        on_count = count if state_code == self._on_code else 0
+        dropped_seq = self._base_seq
+        self._base_seq += 1
+        self._dropped_events += count
+        for horizon in self._horizons.values():
+            if horizon.cursor <= dropped_seq:
+                horizon.cursor = self._base_seq
+                horizon.event_count -= count
+                horizon.on_count -= on_count
+
+    def _store(self, timestamp: float, entity_code: int, state_code: int, count: int) -> None:
+        if self._ring.full:
+            if self._overflow == OVERFLOW_DROP_NEWEST:
+                self._dropped_events += count
+                return
+            self._drop_oldest()
+        self._ring.append(timestamp, entity_code, state_code, count)
+        on_count = count if state_code == self._on_code else 0
+        for horizon in self._horizons.values():
+            horizon.event_count += count
+            horizon.on_count += on_count
+
+    def _ingest(self, timestamp: float, entity_code: int, state_code: int, count: int = 1) -> None:
+        if self._bucket_seconds is None:
+            self._store(timestamp, entity_code, state_code, count)
+            return
+        bucket = int(timestamp // self._bucket_seconds)
+        if bucket != self._partial_bucket:
+            self._close_bucket()
+            self._partial_bucket = bucket
+        self._partial.append((timestamp, entity_code, state_code, count))
+
+    def _close_bucket(self) -> None:
+        """Collapse the open bucket into one ring entry per (entity, state)."""
+        if not self._partial:
+            return
+        totals: dict[tuple[int, int], int] = {}
+        for _, entity_code, state_code, count in self._partial:
+            key = (entity_code, state_code)
+            totals[key] = totals.get(key, 0) + count
+        start = self._partial_bucket * self._bucket_seconds
+        for (entity_code, state_code), count in totals.items():
+            self._store(start, entity_code, state_code, count)
+        self._partial = []
+
+    def record_event(self, entity_id: str, state: str, timestamp: float | None = None) -> None:
+        """Record a state change at ``timestamp`` (tracker clock), defaulting to now.
+
+        A timestamp older than the previous one (e.g. a ``time_fired`` from before
+        an NTP step back) is clamped to it, so windows stay in time order.
+        """
+        now = self._clock() if timestamp is None else timestamp
+        if now < self._last_recorded_at:
+            now = self._last_recorded_at
+        self._last_recorded_at = now
+        intervals = self._durations.get(entity_id)
+        if intervals is not None:
+            intervals.transition(now, state)
+            self._live_transitions.add(entity_id)
+        windows = self._numeric_windows.get(entity_id)
+        if windows:
+            value = _numeric_value(state)
+            if value is not None:
+                for numeric_window in windows.values():
+                    numeric_window.add(now, value)
+        window = self._entity_windows.get(entity_id)
+        if window is not None and self._accepts(entity_id, state):
+            window.append(now, 1, int(state == "on"))
         if self._feature_states:
             expected_state = self._feature_states.get(entity_id)
             if expected_state is None or expected_state != state:
                 return
-        self._events.append((datetime.now(UTC), entity_id, state))
+        self._ingest(now, self._intern_entity(entity_id), self._intern_state(state))
 
-    def _prune(self, now: datetime) -> None:
-        cutoff = now - timedelta(hours=self._window_hours)
-        while self._events and self._events[0][0] < cutoff:
-            self._events.popleft()
+    def replay_events(
+        self,
+        events: Iterable[tuple[datetime, str, str]],
+        *,
+        until: datetime | None = None,
+    ) -> int:
+        """Merge historical (timestamp, entity_id, state) events into the window.
 
-    def compute_features(self, required_features: list[str]) -> dict[str, float]:
-        self._prune(datetime.now(UTC))
-        event_count = len(self._events)
-        on_count = sum(1 for _, _, state in self._events if state == "on")
-        on_ratio = (on_count / event_count) if event_count else 0.0
+        Events at or after ``until`` are skipped because live recording already
+        covers them. Returns the number of events added to the global window.
+        """
+        now = self._clock()
+        cutoff = now - self._window_seconds
+        retention_cutoff = now - self._retention_seconds
+        feature_states = self._feature_states
+        ordered = sorted(
+            (self._to_monotonic(timestamp), entity_id, state)
+            for timestamp, entity_id, state in events
+            if until is None or timestamp < until
+        )
+        accepted = [
+            event
+            for event in ordered
+            if event[0] >= retention_cutoff
+            and (not feature_states or feature_states.get(event[1]) == event[2])
+        ]
+        if accepted:
+            self._merge_entries(
+                (timestamp, self._intern_entity(entity_id), self._intern_state(state), 1)
+                for timestamp, entity_id, state in accepted
+            )
+        if self._entity_windows:
+            per_entity: dict[str, list[tuple[float, int, int]]] = {}
+            for timestamp, entity_id, state in ordered:
+                if (
+                    timestamp >= cutoff
+                    and entity_id in self._entity_windows
+                    and self._accepts(entity_id, state)
+                ):
+                    per_entity.setdefault(entity_id, []).append(
+                        (timestamp, 1, int(state == "on"))
+                    )
+            for entity_id, entity_events in per_entity.items():
+                self._entity_windows[entity_id].replay(entity_events)
+        if self._numeric_windows:
+            samples: dict[str, list[tuple[Any, ...]]] = {}
+            for timestamp, entity_id, state in ordered:
+                if entity_id in self._numeric_windows:
+                    value = _numeric_value(state)
+                    if value is not None:
+                        samples.setdefault(entity_id, []).append(_reading(timestamp, value))
+            self._merge_numeric_samples(samples, now)
+        if self._durations:
+            # Only entities without live transitions yet; history must precede them.
+            fresh = {
+                entity_id: intervals
+                for entity_id, intervals in self._durations.items()
+                if entity_id not in self._live_transitions
+            }
+            for timestamp, entity_id, state in ordered:
+                intervals = fresh.get(entity_id)
+                if intervals is not None:
+                    intervals.transition(timestamp, state)
+        return sum(1 for event in accepted if event[0] >= cutoff)
+
+    def _merge_numeric_samples(
+        self, samples: dict[str, list[tuple[Any, ...]]], now: float
+    ) -> None:
+        for entity_id, entity_samples in samples.items():
+            for window in self._numeric_windows.get(entity_id, {}).values():
+                window.rebuild(entity_samples)
+                window.prune(now - window.seconds)
+
+    def _merge_entries(self, entries: Iterable[tuple[float, int, int, int]]) -> None:
+        """Rebuild the ring with older entries merged in timestamp order."""
+        merged = sorted([*entries, *self._entries()], key=lambda entry: entry[0])
+        self._ring = _EventRing(self._ring.max_events)
+        self._base_seq = 0
+        self._partial = []
+        self._partial_bucket = None
+        for horizon in self._horizons.values():
+            horizon.cursor = 0
+            horizon.event_count = 0
+            horizon.on_count = 0
+        for entry in merged:
+            self._ingest(*entry)
 
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize window state with wall-clock (epoch) timestamps for storage."""
+        offset = self._anchor_wall.timestamp() - self._anchor_monotonic
         return {
-            "event_count": float(event_count),
-            "on_ratio": float(on_ratio),
+            "saved_at": round(self._clock() + offset, 3),
+            "entities": list(self._entity_names),
+            "states": list(self._state_names),
+            "events": [
+                [round(timestamp + offset, 3), entity_code, state_code, count]
+                for timestamp, entity_code, state_code, count in self._entries()
+            ],
+            "entity_windows": {
+                entity_id: [
+                    # Single events keep the compact [timestamp, is_on] form.
+                    [round(timestamp + offset, 3), on_count]
+                    if count == 1
+                    else [round(timestamp + offset, 3), count, on_count]
+                    for timestamp, count, on_count in window.events
+                ]
+                for entity_id, window in self._entity_windows.items()
+                if window.events
+            },
+            "durations": {
+                entity_id: {
+                    "intervals": [
+                        [round(start + offset, 3), round(end + offset, 3)]
+                        for start, end in intervals.intervals
+                    ],
+                    "active_since": (
+                        None if intervals.active_since is None else intervals.active_since + offset
+                    ),
+                    "last_transition_at": intervals.last_transition_at + offset,
+                }
+                for entity_id, intervals in self._durations.items()
+                if intervals.last_transition_at is not None
+            },
+            # The longest window per entity holds every sample the others need.
+            "numeric_samples": {
+                entity_id: [
+                    # Single readings keep the compact [timestamp, value] form.
+                    [round(entry[0] + offset, 3), entry[4]]
+                    if entry[1] == 1
+                    else [round(entry[0] + offset, 3), *entry[1:]]
+                    for entry in max(windows.values(), key=lambda window: window.seconds).samples
+                ]
+                for entity_id, windows in self._numeric_windows.items()
+            },
+        }
+
+    def restore(self, data: dict[str, Any]) -> int:
+        """Merge state saved by ``as_dict``, dropping anything already expired.
+
+        Returns the number of events restored into the main window.
+        """
+        offset = self._anchor_monotonic - self._anchor_wall.timestamp()
+        now = self._clock()
+        cutoff = now - self._window_seconds
+        retention_cutoff = now - self._retention_seconds
+        entities = [self._intern_entity(str(name)) for name in data["entities"]]
+        states = [self._intern_state(str(name)) for name in data["states"]]
+        entries = [
+            (float(timestamp) + offset, entities[entity_code], states[state_code], int(count))
+            for timestamp, entity_code, state_code, count in data["events"]
+            if float(timestamp) + offset >= retention_cutoff
+        ]
+        if entries:
+            self._merge_entries(entries)
+        for entity_id, events in dict(data.get("entity_windows") or {}).items():
+            window = self._entity_windows.get(entity_id)
+            restored = [
+                (float(row[0]) + offset, 1, int(row[1]))
+                if len(row) == 2
+                else (float(row[0]) + offset, int(row[1]), int(row[2]))
+                for row in events
+                if float(row[0]) + offset >= cutoff
+            ]
+            if window is not None and restored:
+                window.replay(restored)
+        for entity_id, saved in dict(data.get("durations") or {}).items():
+            intervals = self._durations.get(entity_id)
+            if intervals is None or intervals.last_transition_at is not None:
+                continue
+            for start, end in saved["intervals"]:
+                start, end = float(start) + offset, float(end) + offset
+                if end > cutoff:
+                    intervals.intervals.append((start, end))
+                    intervals.closed_seconds += end - start
+            if saved.get("active_since") is not None:
+                intervals.active_since = float(saved["active_since"]) + offset
+            intervals.last_transition_at = float(saved["last_transition_at"]) + offset
+        self._merge_numeric_samples(
+            {
+                entity_id: [
+                    _reading(float(row[0]) + offset, float(row[1]))
+                    if len(row) == 2
+                    else (float(row[0]) + offset, int(row[1]), *map(float, row[2:]))
+                    for row in samples
+                ]
+                for entity_id, samples in dict(data.get("numeric_samples") or {}).items()
+            },
+            now,
+        )
+        return sum(count for timestamp, _, _, count in entries if timestamp >= cutoff)
+
+    def _prune(self, now: float) -> None:
+        if self._partial and int(now // self._bucket_seconds) != self._partial_bucket:
+            self._close_bucket()
+        ring = self._ring
+        on_code = self._on_code
+        base_seq = self._base_seq
+        end_seq = self._end_seq
+        for horizon in self._horizons.values():
+            cutoff = now - horizon.seconds
+            cursor = horizon.cursor
+            while cursor < end_seq:
+                timestamp, state_code, count = ring.at(cursor - base_seq)
+                if timestamp >= cutoff:
+                    break
+                horizon.event_count -= count
+                if state_code == on_code:
+                    horizon.on_count -= count
+                cursor += 1
+            horizon.cursor = cursor
+        # Events behind every cursor are out of all horizons.
+        oldest_needed = min(horizon.cursor for horizon in self._horizons.values())
+        while self._base_seq < oldest_needed:
+            ring.popleft()
+            self._base_seq += 1
+
+    def next_expiry(self) -> float | None:
+        """Monotonic time at which the next buffered event leaves a window, if any.
+
+        Meant to be read right after ``compute_features``. On-duration and
+        ``seconds_since_last_event`` change continuously and are not included.
+        """
+        candidates: list[float] = []
+        ring = self._ring
+        end_seq = self._end_seq
+        for horizon in self._horizons.values():
+            if horizon.cursor < end_seq:
+                candidates.append(ring.at(horizon.cursor - self._base_seq)[0] + horizon.seconds)
+        if self._partial:
+            # Closing the bucket restamps its events to the bucket start.
+            candidates.append((self._partial_bucket + 1) * self._bucket_seconds)
+        for window in self._entity_windows.values():
+            if window.events:
+                candidates.append(window.events[0][0] + self._window_seconds)
+        for windows in self._numeric_windows.values():
+            for numeric_window in windows.values():
+                expiry = numeric_window.next_change()
+                if expiry is not None:
+                    candidates.append(expiry)
+        return min(candidates) if candidates else None
+
+    def _horizon_aggregate(self, horizon: _Horizon, aggregate: str, now: float) -> float:
+        count = horizon.event_count
+        on_count = horizon.on_count
+        if self._partial:
+            cutoff = now - horizon.seconds
+            for timestamp, _, state_code, entry_count in self._partial:
+                if timestamp >= cutoff:
+                    count += entry_count
+                    if state_code == self._on_code:
+                        on_count += entry_count
+        if aggregate == WINDOW_EVENT_COUNT:
+            return float(count)
+        return on_count / count if count else 0.0
+
+    def compute_features(self, required_features: list[str]) -> dict[str, float]:
+        now = self._clock()
+        self._prune(now)
+
+        features = {
+            "event_count": self._horizon_aggregate(self._window, WINDOW_EVENT_COUNT, now),
+            "on_ratio": self._horizon_aggregate(self._window, WINDOW_ON_RATIO, now),
         }
+        if (
+            len(self._horizons) == 1
+            and not self._entity_windows
+            and not self._durations
+            and not self._numeric_windows
+        ):
+            return features
+
+        cutoff = now - self._window_seconds
+        key = tuple(required_features)
+        plan = self._plans.get(key)
+        if plan is None:
+            if len(self._plans) >= _MAX_PLANS:
+                self._plans.clear()
+            plan = self._plans[key] = self._plan(key)
+        steps, entity_windows = plan
+        for window in entity_windows:
+            window.prune(cutoff)
+        for kind, feature, target, aggregate in steps:
+            if kind == _PLAN_HORIZON:
+                features[feature] = self._horizon_aggregate(target, aggregate, now)
+            elif kind == _PLAN_NUMERIC:
+                target.prune(now - target.seconds)
+                value = target.aggregate(aggregate)
+                if value is not None:
+                    features[feature] = value
+            elif kind == _PLAN_DURATION:
+                features[feature] = target.active_seconds(now, cutoff)
+            else:
+                features[feature] = self._entity_aggregate(target, aggregate, now)
+        return features
+
+    def _plan(
+        self, required_features: tuple[str, ...]
+    ) -> tuple[list[tuple[int, str, Any, str]], list[Any]]:
+        """Resolve feature names to (kind, name, window, aggregate) steps.
+
+        Names the tracker does not serve, such as plain entity features, are left
+        out, so ``compute_features`` costs nothing for them.
+        """
+        steps: list[tuple[int, str, Any, str]] = []
+        entity_windows: dict[str, _EntityWindow] = {}
+        for feature in required_features:
+            horizon_feature = parse_horizon_feature(feature)
+            if horizon_feature is not None:
+                aggregate, seconds = horizon_feature
+                horizon = self._horizons.get(seconds)
+                if horizon is not None:
+                    steps.append((_PLAN_HORIZON, feature, horizon, aggregate))
+                continue
+            numeric = parse_numeric_feature(feature)
+            if numeric is not None:
+                statistic, entity_id, seconds = numeric
+                window = self._numeric_windows.get(entity_id, {}).get(
+                    self._window_seconds if seconds is None else seconds
+                )
+                if window is not None:
+                    steps.append((_PLAN_NUMERIC, feature, window, statistic))
+                continue
+            parsed = parse_window_feature(feature)
+            if parsed is None or parsed[1] is None:
+                continue
+            aggregate, entity_id = parsed
+            if aggregate == WINDOW_ON_DURATION_SECONDS:
+                intervals = self._durations.get(entity_id)
+                if intervals is not None:
+                    steps.append((_PLAN_DURATION, feature, intervals, aggregate))
+                continue
+            window = self._entity_windows.get(entity_id)
+            if window is not None:
+                entity_windows[entity_id] = window
+                steps.append((_PLAN_ENTITY, feature, window, aggregate))
+        return steps, list(entity_windows.values())
+
+    def _entity_aggregate(self, window: _EntityWindow, aggregate: str, now: float) -> float:
+        count = window.event_count
+        if aggregate == WINDOW_EVENT_COUNT:
+            return float(count)
+        if aggregate == WINDOW_ON_RATIO:
+            return window.on_count / count if count else 0.0
+        if window.last_event_at is None:
+            return self._window_seconds
+        return min(now - window.last_event_at, self._window_seconds)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from datetime import UTC, datetime
+from functools import partial
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
@@ -14,30 +15,53 @@ from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import (
+    CONF_ROLLING_WINDOW_BUCKET_SECONDS,
     CONF_ROLLING_WINDOW_HOURS,
+    CONF_ROLLING_WINDOW_MAX_EVENTS,
+    CONF_ROLLING_WINDOW_OVERFLOW,
     CONF_FEATURE_STATES,
+    CONF_FEATURE_TTL_SECONDS,
     CONF_FEATURE_TYPES,
     CONF_ML_ARTIFACT_VIEW,
     CONF_ML_DB_PATH,
     CONF_ML_FEATURE_SOURCE,
     CONF_ML_FEATURE_VIEW,
+    CONF_ML_SHADOW_ARTIFACT_VIEW,
+    CONF_MODEL_LOAD_BUDGET_SECONDS,
     CONF_NAME,
     CONF_REQUIRED_FEATURES,
     CONF_STATE_MAPPINGS,
     CONF_THRESHOLD,
     DEFAULT_ML_ARTIFACT_VIEW,
     DEFAULT_ROLLING_WINDOW_HOURS,
+    DEFAULT_ROLLING_WINDOW_MAX_EVENTS,
+    DEFAULT_ROLLING_WINDOW_OVERFLOW,
     DEFAULT_ML_FEATURE_SOURCE,
     DEFAULT_ML_FEATURE_VIEW,
+    DEFAULT_ML_SHADOW_ARTIFACT_VIEW,
+    DEFAULT_MODEL_LOAD_BUDGET_SECONDS,
     DEFAULT_THRESHOLD,
     DOMAIN,
 )
-from .feature_provider import RealtimeHistoryFeatureProvider, SqliteSnapshotFeatureProvider
-from .rolling_window import RollingWindowTracker
+from .feature_mapping import split_feature_reference
+from .feature_provider import (
+    FeatureVectorResult,
+    RealtimeHistoryFeatureProvider,
+    SqliteSnapshotFeatureProvider,
+    as_async_provider,
+)
+from .rolling_window import RollingWindowTracker, is_window_feature
 from .ingestion_rules import sync_ingestion_rules
 from .lightgbm_inference import LightGBMModelSpec, run_lightgbm_inference
 from .model_provider import ModelProviderResult, SqliteLightGBMModelProvider
+from .model_registry import get_model_registry
 from .paths import resolve_ml_db_path
+from .decay_scheduler import DecayScheduler, get_decay_scheduler
+from .recorder_backfill import async_backfill_tracker
+from .shadow import ShadowScoreStats, score_shadow
+from .sqlite_connections import get_read_only_pool
+from .time_features import get_time_clock, is_time_feature
+from .tracker_registry import SharedTracker, get_tracker_registry, tracker_key
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -79,18 +103,41 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
         ).strip() or DEFAULT_ML_FEATURE_VIEW
 
         requested_features = list(config.get(CONF_REQUIRED_FEATURES, []))
+        load_budget_seconds = float(
+            config.get(CONF_MODEL_LOAD_BUDGET_SECONDS, DEFAULT_MODEL_LOAD_BUDGET_SECONDS)
+        )
         model_provider = SqliteLightGBMModelProvider(
             db_path=self._ml_db_path,
             artifact_view=self._ml_artifact_view,
             fallback_feature_names=requested_features,
+            load_budget_seconds=load_budget_seconds,
         )
-        model_result: ModelProviderResult = model_provider.load()
-
-        self._model: LightGBMModelSpec = model_result.model
-        self._model_source = model_result.source
-        self._model_artifact_error = model_result.artifact_error
-        self._model_artifact_meta: dict[str, Any] = dict(model_result.artifact_meta)
-        self._training_result: dict[str, Any] = dict(model_result.training_result)
+        self._model_registry = get_model_registry(self.hass)
+        model_result: ModelProviderResult = self._model_registry.record(
+            self._entry_id, model_provider.load()
+        )
+        self._required_features: list[str] = list(requested_features)
+        self._apply_model_result(model_result)
+
+        self._ml_shadow_artifact_view = str(
+            config.get(CONF_ML_SHADOW_ARTIFACT_VIEW, DEFAULT_ML_SHADOW_ARTIFACT_VIEW) or ""
+        ).strip()
+        self._shadow_model: LightGBMModelSpec | None = None
+        self._shadow_model_meta: dict[str, Any] = {}
+        self._shadow_artifact_error: str | None = None
+        self._shadow_stats = ShadowScoreStats()
+        if self._ml_shadow_artifact_view:
+            shadow_result = SqliteLightGBMModelProvider(
+                db_path=self._ml_db_path,
+                artifact_view=self._ml_shadow_artifact_view,
+                fallback_feature_names=requested_features,
+                load_budget_seconds=load_budget_seconds,
+            ).load()
+            if shadow_result.source == "ml_data_layer":
+                self._shadow_model = shadow_result.model
+                self._shadow_model_meta = dict(shadow_result.artifact_meta)
+            else:
+                self._shadow_artifact_error = shadow_result.artifact_error
         self._ingestion_sync_error: str | None = None
         self._ingestion_rules_count: int = 0
 
@@ -107,15 +154,6 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
         except Exception as exc:  # pragma: no cover - diagnostics-only
             self._ingestion_sync_error = str(exc)
 
-        self._required_features: list[str] = list(config.get(CONF_REQUIRED_FEATURES, []))
-        self._feature_mismatch: str | None = None
-        if self._model.feature_names and set(self._model.feature_names) != set(self._required_features):
-            self._feature_mismatch = (
-                f"Model features {sorted(self._model.feature_names)} "
-                f"do not match configured features {sorted(self._required_features)}"
-            )
-            _LOGGER.warning("Feature mismatch: %s", self._feature_mismatch)
-
         self._feature_types: dict[str, str] = {
             feature_id: str(feature_type).strip().casefold()
             for feature_id, feature_type in dict(config.get(CONF_FEATURE_TYPES, {})).items()
@@ -132,7 +170,14 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
 
         self._threshold = float(config.get(CONF_THRESHOLD, DEFAULT_THRESHOLD))
 
+        self._time_clock = get_time_clock(self.hass)
+        self._uses_time_features = any(
+            is_time_feature(feature) for feature in self._required_features
+        )
+
         self._rolling_window_tracker = None
+        self._shared_tracker: SharedTracker | None = None
+        self._decay_scheduler: DecayScheduler | None = None
         self._rolling_window_hours = float(config.get(CONF_ROLLING_WINDOW_HOURS, DEFAULT_ROLLING_WINDOW_HOURS))
 
         if self._ml_feature_source == "ml_snapshot" and self._ml_db_path:
@@ -140,21 +185,56 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
                 db_path=self._ml_db_path,
                 snapshot_view=self._ml_feature_view,
                 required_features=self._required_features,
+                connection_pool=get_read_only_pool(self.hass),
+                time_features=self._time_clock.features,
+                feature_ttls={
+                    str(feature): float(ttl)
+                    for feature, ttl in dict(config.get(CONF_FEATURE_TTL_SECONDS) or {}).items()
+                },
             )
         else:
             self._ml_feature_source = "hass_state"
-            self._rolling_window_tracker = RollingWindowTracker(
-                window_hours=self._rolling_window_hours,
-                feature_states=self._feature_states,
+            max_events = int(
+                config.get(CONF_ROLLING_WINDOW_MAX_EVENTS, DEFAULT_ROLLING_WINDOW_MAX_EVENTS)
+            )
+            overflow = str(
+                config.get(CONF_ROLLING_WINDOW_OVERFLOW) or DEFAULT_ROLLING_WINDOW_OVERFLOW
+            )
+            bucket_seconds = float(config.get(CONF_ROLLING_WINDOW_BUCKET_SECONDS) or 0.0)
+            # Entries with the same inputs share one tracker, so events are stored once.
+            self._shared_tracker = get_tracker_registry(self.hass).acquire(
+                entry.entry_id,
+                tracker_key(
+                    required_features=self._required_features,
+                    feature_states=self._feature_states,
+                    window_hours=self._rolling_window_hours,
+                    max_events=max_events,
+                    overflow=overflow,
+                    bucket_seconds=bucket_seconds,
+                ),
+                lambda: RollingWindowTracker(
+                    window_hours=self._rolling_window_hours,
+                    feature_states=self._feature_states,
+                    required_features=self._required_features,
+                    max_events=max_events,
+                    overflow=overflow,
+                    bucket_seconds=bucket_seconds,
+                ),
             )
+            self._rolling_window_tracker = self._shared_tracker.tracker
             self._feature_provider = RealtimeHistoryFeatureProvider(
                 hass=self.hass,
                 required_features=self._required_features,
                 feature_types=self._feature_types,
                 state_mappings=self._state_mappings,
                 history_feature_loader=self._rolling_window_tracker.compute_features,
+                time_features=self._time_clock.features,
+                history_features=is_window_feature,
             )
 
+        self._async_feature_provider = as_async_provider(self._feature_provider, hass=self.hass)
+        self._loads_inline = bool(getattr(self._async_feature_provider, "runs_inline", False))
+
         self._attr_name = self._name
         self._attr_unique_id = f"{entry.entry_id}_mindml_probability"
         self._attr_native_unit_of_measurement = "%"
@@ -164,15 +244,19 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
         self._native_value: float | None = None
         self._raw_probability: float | None = None
         self._linear_score: float | None = None
-        self._missing_features: list[str] = []
-        self._feature_values: dict[str, float] = {}
+        self._feature_vector = FeatureVectorResult(
+            feature_values={},
+            missing_features=[],
+            mapped_state_values={},
+        )
         self._feature_contributions: dict[str, float] = {}
-        self._mapped_state_values: dict[str, str] = {}
         self._feature_provider_error: str | None = None
         self._unavailable_reason: str | None = None
         self._last_computed_at: str | None = None
         self._is_above_threshold: bool | None = None
         self._decision: str | None = None
+        self._scored_model: LightGBMModelSpec | None = None
+        self._skipped_polls = 0
 
     async def async_added_to_hass(self) -> None:
         """Subscribe to source entity updates."""
@@ -188,27 +272,51 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
                 self._raw_probability = attrs["raw_probability"]
             if attrs.get("linear_score") is not None:
                 self._linear_score = attrs["linear_score"]
-            self._feature_values = dict(attrs.get("feature_values") or {})
+            self._feature_vector = FeatureVectorResult(
+                feature_values=dict(attrs.get("feature_values") or {}),
+                missing_features=list(attrs.get("missing_features") or []),
+                mapped_state_values={},
+            )
             self._feature_contributions = dict(attrs.get("feature_contributions") or {})
-            self._missing_features = list(attrs.get("missing_features") or [])
             self._last_computed_at = attrs.get("last_computed_at")
             self._is_above_threshold = attrs.get("is_above_threshold")
             self._decision = attrs.get("decision")
 
+        self.async_on_remove(
+            self._model_registry.async_add_listener(self._entry_id, self._handle_model_swap)
+        )
+
         if self._ml_feature_source == "hass_state":
             watched_entities = list(dict.fromkeys(
-                list(self._required_features) + list(self._feature_states.keys())
+                self._feature_provider.watched_entities
+                + self._rolling_window_tracker.watched_entities
+                + [split_feature_reference(entity_id)[0] for entity_id in self._feature_states]
             ))
 
             @callback
             def _handle_state_change(event: Event) -> None:
-                if self._rolling_window_tracker is not None:
-                    entity_id = event.data.get("entity_id", "")
-                    new_state = event.data.get("new_state")
-                    if new_state is not None:
-                        self._rolling_window_tracker.record_event(
-                            entity_id, new_state.state
-                        )
+                entity_id = event.data.get("entity_id", "")
+                new_state = event.data.get("new_state")
+                old_state = event.data.get("old_state")
+                if (
+                    old_state is not None
+                    and new_state is not None
+                    and old_state.state == new_state.state
+                    and not self._feature_provider.attributes_changed(
+                        entity_id, old_state, new_state
+                    )
+                ):
+                    # Attribute-only update that touches no attribute feature.
+                    return
+                self._feature_provider.update_entity(entity_id, new_state)
+                if (
+                    self._shared_tracker is not None
+                    and new_state is not None
+                    and (old_state is None or old_state.state != new_state.state)
+                ):
+                    self._shared_tracker.record_state(
+                        entity_id, new_state, getattr(event, "time_fired", None)
+                    )
                 self._recompute_state(datetime.now(UTC))
                 self.async_write_ha_state()
 
@@ -219,12 +327,89 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
                     _handle_state_change,
                 )
             )
+            self._feature_provider.rebuild()
+            if self._shared_tracker is not None:
+                self.async_on_remove(
+                    partial(get_tracker_registry(self.hass).release, self._entry_id)
+                )
+            if self._shared_tracker is not None and self._shared_tracker.claim_startup():
+                # Live events are recorded from here on; saved state covers the window
+                # up to the last save and history only the gap since then.
+                backfill_until = datetime.now(UTC)
+                backfill_hours = self._rolling_window_tracker.retention_hours
+                saved_at = await self._shared_tracker.async_restore(self._entry_id)
+                if saved_at is not None:
+                    gap_hours = (backfill_until - saved_at).total_seconds() / 3600.0
+                    backfill_hours = min(backfill_hours, max(gap_hours, 0.0))
+                if backfill_hours > 0:
+                    await async_backfill_tracker(
+                        self.hass,
+                        self._rolling_window_tracker,
+                        watched_entities,
+                        window_hours=backfill_hours,
+                        until=backfill_until,
+                    )
+                for entity_id in self._rolling_window_tracker.seeded_entities:
+                    current = self.hass.states.get(entity_id)
+                    if current is not None:
+                        self._rolling_window_tracker.observe_state(
+                            entity_id, current.state, current.last_changed
+                        )
+            if self._rolling_window_tracker is not None:
+                # Window counts also fall as events expire; rescore at the next expiry.
+                self._decay_scheduler = get_decay_scheduler(self.hass)
+                self.async_on_remove(partial(self._decay_scheduler.async_cancel, self._entry_id))
+            if self._uses_time_features:
+                # Time-only inputs change without state events; share the domain minute tick.
+                self.async_on_remove(
+                    self._time_clock.async_add_listener(self._handle_time_tick)
+                )
 
+        await self._async_recompute_state(datetime.now(UTC))
+
+    @callback
+    def _handle_time_tick(self) -> None:
+        """Rescore when the shared clock advances a minute."""
+        self._recompute_state(datetime.now(UTC))
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_decay(self) -> None:
+        """Rescore when a rolling window event has expired."""
         self._recompute_state(datetime.now(UTC))
+        self.async_write_ha_state()
 
     async def async_update(self) -> None:
         """Refresh state when polling is enabled."""
+        await self._async_recompute_state(datetime.now(UTC))
+
+    def _apply_model_result(self, model_result: ModelProviderResult) -> None:
+        """Make a loaded model the one used for scoring."""
+        self._model: LightGBMModelSpec = model_result.model
+        self._model_source = model_result.source
+        self._model_artifact_error = model_result.artifact_error
+        self._model_artifact_meta: dict[str, Any] = dict(model_result.artifact_meta)
+        self._training_result: dict[str, Any] = dict(model_result.training_result)
+        self._feature_mismatch: str | None = None
+        if self._model.feature_names and set(self._model.feature_names) != set(self._required_features):
+            self._feature_mismatch = (
+                f"Model features {sorted(self._model.feature_names)} "
+                f"do not match configured features {sorted(self._required_features)}"
+            )
+            _LOGGER.warning("Feature mismatch: %s", self._feature_mismatch)
+
+    @callback
+    def _handle_model_swap(self) -> None:
+        """Switch to the registry's active model version without reloading."""
+        model_result = self._model_registry.active(self._entry_id)
+        if model_result is None or model_result.model is self._model:
+            return
+        self._apply_model_result(model_result)
+        if not self._loads_inline:
+            self.hass.async_create_task(self._async_refresh())
+            return
         self._recompute_state(datetime.now(UTC))
+        self.async_write_ha_state()
 
 
     @property
@@ -236,10 +421,11 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
         return {
             "raw_probability": self._raw_probability,
             "linear_score": self._linear_score,
-            "feature_values": dict(self._feature_values),
+            "feature_values": dict(self._feature_vector.feature_values),
             "feature_contributions": dict(self._feature_contributions),
-            "mapped_state_values": dict(self._mapped_state_values),
-            "missing_features": list(self._missing_features),
+            "mapped_state_values": dict(self._feature_vector.mapped_state_values),
+            "missing_features": self._feature_vector.missing_features,
+            "stale_features": list(self._feature_vector.stale_features),
             "required_features": list(self._required_features),
             "state_mappings": {
                 entity_id: dict(states) for entity_id, states in self._state_mappings.items()
@@ -254,11 +440,15 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
             "model_runtime": "lightgbm",
             "model_artifact_error": self._model_artifact_error,
             "model_artifact_meta": dict(self._model_artifact_meta),
+            "model_fingerprint": self._model_artifact_meta.get("fingerprint"),
+            "model_pinned": self._model_registry.pinned_fingerprint(self._entry_id) is not None,
             "feature_source": self._ml_feature_source,
             "feature_view": self._ml_feature_view,
             "feature_mismatch": self._feature_mismatch,
             "rolling_window_hours": self._rolling_window_hours,
             "rolling_window_event_count": self._rolling_window_tracker.event_count if self._rolling_window_tracker else None,
+            "rolling_window_dropped_events": self._rolling_window_tracker.dropped_events if self._rolling_window_tracker else None,
+            "rolling_window_subscribers": len(self._shared_tracker.subscribers) if self._shared_tracker else None,
             "ingestion_rules_count": self._ingestion_rules_count,
             "ingestion_sync_error": self._ingestion_sync_error,
             "training_status": self._training_result.get("status"),
@@ -268,29 +458,68 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
             "training_finished_at_utc": self._training_result.get("finished_at_utc"),
         }
 
-    def _recompute_state(self, now: datetime) -> None:
+    def _recompute_state(self, now: datetime) -> bool:
+        """Rescore inline; only used from callbacks whose provider does not block."""
         try:
             feature_vector = self._feature_provider.load()
-            self._feature_provider_error = None
         except Exception as exc:  # pragma: no cover
-            self._feature_values = {}
-            self._mapped_state_values = {}
-            self._missing_features = list(self._required_features)
-            self._last_computed_at = now.astimezone(UTC).isoformat()
-            self._feature_provider_error = str(exc)
-            self._native_value = None
-            self._raw_probability = None
-            self._linear_score = None
-            self._feature_contributions = {}
-            self._unavailable_reason = "feature_source_error"
-            self._is_above_threshold = None
-            self._decision = None
+            return self._apply_feature_error(now, exc)
+        if self._decay_scheduler is not None:
+            self._decay_scheduler.async_schedule(
+                self._entry_id, self._rolling_window_tracker.next_expiry(), self._handle_decay
+            )
+        return self._score_feature_vector(now, feature_vector)
+
+    async def _async_recompute_state(self, now: datetime) -> bool:
+        """Rescore after awaiting the provider (executor-backed for SQLite sources)."""
+        if self._loads_inline:
+            return self._recompute_state(now)
+        try:
+            feature_vector = await self._async_feature_provider.async_load()
+        except Exception as exc:
+            return self._apply_feature_error(now, exc)
+        return self._score_feature_vector(now, feature_vector)
+
+    async def _async_refresh(self) -> None:
+        await self._async_recompute_state(datetime.now(UTC))
+        self.async_write_ha_state()
+
+    def _apply_feature_error(self, now: datetime, exc: Exception) -> bool:
+        """Mark the sensor unavailable because the feature source failed."""
+        self._feature_vector = FeatureVectorResult(
+            feature_values={},
+            missing_features=list(self._required_features),
+            mapped_state_values={},
+        )
+        self._last_computed_at = now.astimezone(UTC).isoformat()
+        self._feature_provider_error = str(exc)
+        self._native_value = None
+        self._raw_probability = None
+        self._linear_score = None
+        self._feature_contributions = {}
+        self._unavailable_reason = "feature_source_error"
+        self._is_above_threshold = None
+        self._decision = None
+        self._scored_model = None
+        self._store_runtime_diagnostics()
+        return True
+
+    def _score_feature_vector(self, now: datetime, feature_vector: FeatureVectorResult) -> bool:
+        """Score a loaded vector; return False when nothing changed since the last score."""
+        if (
+            feature_vector.unchanged
+            and self._feature_provider_error is None
+            and self._scored_model is self._model
+        ):
+            # Snapshot DB untouched since the last poll: keep state and attributes as-is
+            # so Home Assistant sees an identical state and records nothing new.
+            self._skipped_polls += 1
             self._store_runtime_diagnostics()
-            return
+            return False
 
-        self._feature_values = dict(feature_vector.feature_values)
-        self._mapped_state_values = dict(feature_vector.mapped_state_values)
-        self._missing_features = list(feature_vector.missing_features)
+        self._feature_provider_error = None
+        self._scored_model = self._model
+        self._feature_vector = feature_vector
         self._last_computed_at = now.astimezone(UTC).isoformat()
 
         if self._feature_mismatch:
@@ -302,14 +531,23 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
             self._is_above_threshold = None
             self._decision = None
             self._store_runtime_diagnostics()
-            return
+            return True
 
+        missing_features = feature_vector.missing_features
         result = run_lightgbm_inference(
-            feature_values=self._feature_values,
-            missing_features=self._missing_features,
+            ordered_row=feature_vector.ordered_row(self._model.feature_names),
+            missing_features=missing_features,
             model=self._model,
             threshold=self._threshold,
         )
+        if self._shadow_model is not None:
+            score_shadow(
+                primary=result,
+                feature_vector=feature_vector,
+                model=self._shadow_model,
+                threshold=self._threshold,
+                stats=self._shadow_stats,
+            )
         self._native_value = result.native_value
         self._raw_probability = result.raw_probability
         self._linear_score = result.linear_score
@@ -325,18 +563,44 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
         self._is_above_threshold = result.is_above_threshold
         self._decision = result.decision
         self._store_runtime_diagnostics()
+        return True
 
     def _store_runtime_diagnostics(self) -> None:
         """Persist lightweight runtime status for diagnostics endpoint."""
-        if not isinstance(getattr(self.hass, "data", None), dict):
-            self.hass.data = {}
         domain_data = self.hass.data.setdefault(DOMAIN, {})
         entry_data = domain_data.setdefault(self._entry_id, {})
         entry_data["runtime"] = {
             "feature_source": self._ml_feature_source,
-            "missing_features": list(self._missing_features),
+            "missing_features": self._feature_vector.missing_features,
+            "stale_features": list(self._feature_vector.stale_features),
             "unavailable_reason": self._unavailable_reason,
             "feature_provider_error": self._feature_provider_error,
             "last_computed_at": self._last_computed_at,
+            "skipped_polls": self._skipped_polls,
             "model_source": self._model_source,
+            "model_fingerprint": self._model_artifact_meta.get("fingerprint"),
+            "model_load": {
+                "artifact_bytes": self._model_artifact_meta.get("artifact_bytes"),
+                "load_timings_ms": dict(self._model_artifact_meta.get("load_timings_ms") or {}),
+            },
+            "pinned_model_fingerprint": self._model_registry.pinned_fingerprint(self._entry_id),
+            "model_versions": [
+                version.as_dict() for version in self._model_registry.versions(self._entry_id)
+            ],
+            "rolling_window": (
+                {
+                    "event_count": self._rolling_window_tracker.event_count,
+                    "dropped_events": self._rolling_window_tracker.dropped_events,
+                    "memory_bytes": self._rolling_window_tracker.memory_bytes,
+                    "subscribers": len(self._shared_tracker.subscribers),
+                }
+                if self._shared_tracker is not None
+                else None
+            ),
+            "shadow": {
+                "artifact_view": self._ml_shadow_artifact_view or None,
+                "model_fingerprint": self._shadow_model_meta.get("fingerprint"),
+                "artifact_error": self._shadow_artifact_error,
+                **self._shadow_stats.as_dict(),
+            },
         }
@@ -0,0 +1,110 @@
+"""Shadow scoring of a candidate model against the production model."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from .feature_provider import FeatureVectorResult
+from .lightgbm_inference import InferenceResult, LightGBMModelSpec, run_lightgbm_inference
+
+
+@dataclass(slots=True)
+class ShadowScoreStats:
+    """Running agreement/delta/latency statistics for a shadow model."""
+
+    evaluations: int = 0
+    compared: int = 0
+    agreements: int = 0
+    shadow_unavailable: int = 0
+    feature_mismatch: int = 0
+    abs_delta_sum: float = 0.0
+    max_abs_delta: float = 0.0
+    added_latency_seconds: float = 0.0
+
+    def record(
+        self,
+        primary: InferenceResult,
+        shadow: InferenceResult,
+        elapsed_seconds: float,
+    ) -> None:
+        self.evaluations += 1
+        self.added_latency_seconds += elapsed_seconds
+        if not shadow.available or shadow.raw_probability is None:
+            self.shadow_unavailable += 1
+            return
+        if not primary.available or primary.raw_probability is None:
+            return
+        self.compared += 1
+        if primary.decision == shadow.decision:
+            self.agreements += 1
+        delta = abs(primary.raw_probability - shadow.raw_probability)
+        self.abs_delta_sum += delta
+        if delta > self.max_abs_delta:
+            self.max_abs_delta = delta
+
+    def record_feature_mismatch(self, elapsed_seconds: float) -> None:
+        """Count an evaluation skipped because the vector lacks a candidate feature."""
+        self.evaluations += 1
+        self.feature_mismatch += 1
+        self.added_latency_seconds += elapsed_seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "evaluations": self.evaluations,
+            "compared": self.compared,
+            "shadow_unavailable": self.shadow_unavailable,
+            "feature_mismatch": self.feature_mismatch,
+            "agreement_rate": (self.agreements / self.compared) if self.compared else None,
+            "mean_abs_probability_delta": (
+                self.abs_delta_sum / self.compared if self.compared else None
+            ),
+            "max_abs_probability_delta": self.max_abs_delta if self.compared else None,
+            "mean_added_latency_ms": (
+                self.added_latency_seconds * 1000.0 / self.evaluations
+                if self.evaluations
+                else None
+            ),
+        }
+
+
+def score_shadow(
+    *,
+    primary: InferenceResult,
+    feature_vector: FeatureVectorResult,
+    model: LightGBMModelSpec,
+    threshold: float,
+    stats: ShadowScoreStats,
+) -> InferenceResult:
+    """Score the shadow model on the primary's feature vector and fold it into stats.
+
+    Candidate features the production vector does not carry at all are not
+    zero-filled: the evaluation is counted under ``feature_mismatch`` instead.
+    """
+    started = perf_counter()
+    present = feature_vector.feature_values
+    masked = set(feature_vector.missing_features)
+    absent = [
+        name for name in model.feature_names if name not in present and name not in masked
+    ]
+    if absent:
+        stats.record_feature_mismatch(perf_counter() - started)
+        return InferenceResult(
+            available=False,
+            native_value=None,
+            raw_probability=None,
+            linear_score=None,
+            feature_contributions={},
+            unavailable_reason="shadow_feature_mismatch",
+            is_above_threshold=None,
+            decision=None,
+        )
+    shadow = run_lightgbm_inference(
+        ordered_row=feature_vector.ordered_row(model.feature_names),
+        missing_features=[name for name in model.feature_names if name in masked],
+        model=model,
+        threshold=threshold,
+    )
+    stats.record(primary, shadow, perf_counter() - started)
+    return shadow
@@ -0,0 +1,174 @@
+"""Long-lived read-only SQLite connections shared across polls and entries."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .const import DATA_SQLITE_POOL
+from .domain_data import get_domain_singleton
+
+DEFAULT_MMAP_SIZE_BYTES = 64 * 1024 * 1024
+DEFAULT_CACHE_SIZE_KIB = 8 * 1024
+DEFAULT_MAX_IDLE_CONNECTIONS = 4
+
+
+@dataclass(slots=True)
+class _PathConnections:
+    identity: tuple[int, int] | None = None
+    generation: int = 0
+    idle: list[sqlite3.Connection] = field(default_factory=list)
+    # Reserved for PRAGMA data_version so change checks always read one counter.
+    watcher: sqlite3.Connection | None = None
+    watch_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class SqliteReadOnlyConnectionPool:
+    """Per-DB-path pool of read-only connections that survives DB file replacement."""
+
+    def __init__(
+        self,
+        *,
+        mmap_size_bytes: int = DEFAULT_MMAP_SIZE_BYTES,
+        cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+        max_idle_connections: int = DEFAULT_MAX_IDLE_CONNECTIONS,
+    ) -> None:
+        self._mmap_size_bytes = int(mmap_size_bytes)
+        self._cache_size_kib = int(cache_size_kib)
+        self._max_idle_connections = max(1, int(max_idle_connections))
+        self._lock = threading.Lock()
+        self._paths: dict[str, _PathConnections] = {}
+        self._serials: dict[int, int] = {}
+        self._next_serial = 0
+
+    def _open(self, db_file: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"{db_file.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA mmap_size = {self._mmap_size_bytes}")
+        conn.execute(f"PRAGMA cache_size = -{self._cache_size_kib}")
+        with self._lock:
+            self._next_serial += 1
+            self._serials[id(conn)] = self._next_serial
+        return conn
+
+    def _close(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._serials.pop(id(conn), None)
+        conn.close()
+
+    def _refresh(self, db_path: str) -> _PathConnections:
+        try:
+            stat = os.stat(db_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(db_path) from None
+        identity = (stat.st_dev, stat.st_ino)
+
+        stale: list[sqlite3.Connection] = []
+        watcher = None
+        with self._lock:
+            entry = self._paths.setdefault(db_path, _PathConnections())
+            if entry.identity != identity:
+                # The trainer replaced the DB file; drop connections to the old inode.
+                stale, entry.idle = entry.idle, []
+                watcher, entry.watcher = entry.watcher, None
+                entry.identity = identity
+                entry.generation += 1
+        for old_conn in stale:
+            self._close(old_conn)
+        if watcher is not None:
+            with entry.watch_lock:
+                self._close(watcher)
+        return entry
+
+    def _checkout(self, db_path: str) -> tuple[sqlite3.Connection, int]:
+        entry = self._refresh(db_path)
+        with self._lock:
+            generation = entry.generation
+            conn = entry.idle.pop() if entry.idle else None
+        if conn is None:
+            conn = self._open(Path(db_path))
+        return conn, generation
+
+    def data_version(self, db_path: str) -> tuple[int, int]:
+        """Return (watcher serial, PRAGMA data_version) for change detection.
+
+        Both come from one connection per path reserved for this check, so the
+        pair only changes when another process commits or the file is replaced,
+        however the pooled query connections are handed out.
+        """
+        entry = self._refresh(db_path)
+        with entry.watch_lock:
+            with self._lock:
+                watcher = entry.watcher
+            if watcher is None:
+                watcher = self._open(Path(db_path))
+                with self._lock:
+                    entry.watcher = watcher
+            try:
+                version = int(watcher.execute("PRAGMA data_version").fetchone()[0])
+            except sqlite3.DatabaseError:
+                with self._lock:
+                    if entry.watcher is watcher:
+                        entry.watcher = None
+                self._close(watcher)
+                raise
+            with self._lock:
+                serial = self._serials[id(watcher)]
+        return serial, version
+
+    def _checkin(self, db_path: str, conn: sqlite3.Connection, generation: int, healthy: bool) -> None:
+        with self._lock:
+            entry = self._paths.get(db_path)
+            if (
+                healthy
+                and entry is not None
+                and entry.generation == generation
+                and len(entry.idle) < self._max_idle_connections
+            ):
+                entry.idle.append(conn)
+                return
+        self._close(conn)
+
+    @contextmanager
+    def connection(self, db_path: str) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection for the given DB path."""
+        conn, generation = self._checkout(db_path)
+        healthy = True
+        try:
+            yield conn
+        except sqlite3.DatabaseError:
+            # Do not return handles that hit a DB error; the next checkout reopens.
+            healthy = False
+            raise
+        finally:
+            self._checkin(db_path, conn, generation, healthy)
+
+    def close(self, db_path: str | None = None) -> None:
+        """Close idle connections for one path, or for every path."""
+        with self._lock:
+            paths = [db_path] if db_path is not None else list(self._paths)
+            closing: list[sqlite3.Connection] = []
+            for path in paths:
+                entry = self._paths.pop(path, None)
+                if entry is not None:
+                    closing.extend(entry.idle)
+                    if entry.watcher is not None:
+                        closing.append(entry.watcher)
+        for conn in closing:
+            self._close(conn)
+
+
+def get_read_only_pool(hass: Any) -> SqliteReadOnlyConnectionPool:
+    """Return the domain-level read-only connection pool, creating it on first use."""
+    return get_domain_singleton(hass, DATA_SQLITE_POOL, SqliteReadOnlyConnectionPool)
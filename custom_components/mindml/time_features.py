@@ -0,0 +1,103 @@
+"""Calendar/time features shared by every sensor through one domain-level clock."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+import math
+from typing import Any, Final
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_TIME_CLOCK
+from .domain_data import get_domain_singleton
+
+TIME_HOUR_OF_DAY: Final = "time_hour_of_day"
+TIME_DAY_OF_WEEK: Final = "time_day_of_week"
+TIME_HOUR_SIN: Final = "time_hour_sin"
+TIME_HOUR_COS: Final = "time_hour_cos"
+TIME_DAY_OF_WEEK_SIN: Final = "time_day_of_week_sin"
+TIME_DAY_OF_WEEK_COS: Final = "time_day_of_week_cos"
+TIME_FEATURE_NAMES: Final[frozenset[str]] = frozenset(
+    {
+        TIME_HOUR_OF_DAY,
+        TIME_DAY_OF_WEEK,
+        TIME_HOUR_SIN,
+        TIME_HOUR_COS,
+        TIME_DAY_OF_WEEK_SIN,
+        TIME_DAY_OF_WEEK_COS,
+    }
+)
+
+TimeFeatureSource = Callable[[], dict[str, float]]
+
+
+def is_time_feature(feature: str) -> bool:
+    """Return whether a feature name is a built-in time feature."""
+    return feature in TIME_FEATURE_NAMES
+
+
+def compute_time_features(moment: datetime) -> dict[str, float]:
+    """Compute hour/day-of-week features with cyclic encodings for a local time."""
+    hour = moment.hour + moment.minute / 60.0
+    day_of_week = float(moment.weekday())
+    hour_angle = 2.0 * math.pi * hour / 24.0
+    day_angle = 2.0 * math.pi * day_of_week / 7.0
+    return {
+        TIME_HOUR_OF_DAY: hour,
+        TIME_DAY_OF_WEEK: day_of_week,
+        TIME_HOUR_SIN: math.sin(hour_angle),
+        TIME_HOUR_COS: math.cos(hour_angle),
+        TIME_DAY_OF_WEEK_SIN: math.sin(day_angle),
+        TIME_DAY_OF_WEEK_COS: math.cos(day_angle),
+    }
+
+
+class DomainClock:
+    """Per-minute time feature cache plus a single shared minute tick."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._minute: int | None = None
+        self._features: dict[str, float] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self._unsub_tick: Callable[[], None] | None = None
+
+    def features(self, now: datetime | None = None) -> dict[str, float]:
+        """Return time features for the current minute, computing them at most once."""
+        now = now or dt_util.utcnow()
+        minute = int(now.timestamp() // 60)
+        if minute != self._minute:
+            self._features = compute_time_features(dt_util.as_local(now))
+            self._minute = minute
+        return self._features
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call ``listener`` on every minute tick; starts the timer on first use."""
+        self._listeners.append(listener)
+        if self._unsub_tick is None:
+            self._unsub_tick = async_track_utc_time_change(self._hass, self._tick, second=0)
+
+        @callback
+        def _remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            if not self._listeners and self._unsub_tick is not None:
+                self._unsub_tick()
+                self._unsub_tick = None
+
+        return _remove
+
+    @callback
+    def _tick(self, now: datetime) -> None:
+        self.features(now)
+        for listener in list(self._listeners):
+            listener()
+
+
+def get_time_clock(hass: Any) -> DomainClock:
+    """Return the domain-level clock, creating it on first use."""
+    return get_domain_singleton(hass, DATA_TIME_CLOCK, lambda: DomainClock(hass))
@@ -0,0 +1,157 @@
+"""Domain-level registry sharing rolling window trackers between config entries."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+import hashlib
+from typing import Any
+
+from .const import DATA_TRACKER_REGISTRY
+from .domain_data import get_domain_singleton
+from .rolling_window import RollingWindowTracker
+from .window_store import RollingWindowStore
+
+TrackerKey = tuple[Any, ...]
+
+
+def storage_id(key: TrackerKey) -> str:
+    """Stable store file suffix for a tracker key."""
+    return hashlib.sha1(repr(key).encode(), usedforsecurity=False).hexdigest()[:16]
+
+
+def tracker_key(
+    *,
+    required_features: list[str],
+    feature_states: dict[str, str],
+    window_hours: float,
+    max_events: int,
+    overflow: str,
+    bucket_seconds: float | None,
+) -> TrackerKey:
+    """Identify trackers that would record identical events and serve identical features.
+
+    The required features determine both the watched entity set and the
+    per-entity/horizon/numeric windows the tracker keeps.
+    """
+    return (
+        tuple(sorted(set(required_features))),
+        tuple(sorted(feature_states.items())),
+        float(window_hours),
+        int(max_events),
+        str(overflow),
+        float(bucket_seconds or 0.0),
+    )
+
+
+class SharedTracker:
+    """One tracker plus its store, fed once per state change for all subscribers."""
+
+    def __init__(self, hass: Any, key: TrackerKey, tracker: RollingWindowTracker) -> None:
+        self._hass = hass
+        self.key = key
+        self.tracker = tracker
+        self.store = RollingWindowStore(hass, storage_id(key))
+        self.subscribers: set[str] = set()
+        self._started = False
+        self._last_states: dict[str, Any] = {}
+
+    def claim_startup(self) -> bool:
+        """Return True exactly once, for the subscriber that restores and backfills."""
+        if self._started:
+            return False
+        self._started = True
+        return True
+
+    async def async_restore(self, entry_id: str) -> datetime | None:
+        """Restore saved state, migrating ``entry_id``'s file from before sharing.
+
+        State used to be stored per entry id; such a file is loaded only when the
+        shared store has nothing, then deleted once its content is rescheduled.
+        """
+        saved_at = await self.store.async_restore(self.tracker)
+        if saved_at is not None:
+            return saved_at
+        legacy = RollingWindowStore(self._hass, entry_id)
+        saved_at = await legacy.async_restore(self.tracker)
+        if saved_at is not None:
+            self.store.async_schedule_save(self.tracker)
+            await legacy.async_remove()
+        return saved_at
+
+    def record_state(
+        self, entity_id: str, new_state: Any, fired_at: datetime | None = None
+    ) -> bool:
+        """Record a state change unless another subscriber already recorded this one.
+
+        ``fired_at`` (the event's ``time_fired``) timestamps the event instead of
+        the moment this callback happens to run.
+        """
+        if self._last_states.get(entity_id) is new_state:
+            return False
+        self._last_states[entity_id] = new_state
+        timestamp = self.tracker.timestamp_for(fired_at) if isinstance(fired_at, datetime) else None
+        self.tracker.record_event(entity_id, new_state.state, timestamp)
+        self.store.async_schedule_save(self.tracker)
+        return True
+
+
+class TrackerRegistry:
+    """Hand out shared trackers keyed by ``tracker_key`` and drop unused ones."""
+
+    def __init__(self, hass: Any) -> None:
+        self._hass = hass
+        self._trackers: dict[TrackerKey, SharedTracker] = {}
+        self._keys_by_entry: dict[str, TrackerKey] = {}
+        # Store of each released entry, kept so a deleted entry can remove its file.
+        self._released: dict[str, tuple[TrackerKey, RollingWindowStore]] = {}
+
+    def acquire(
+        self,
+        entry_id: str,
+        key: TrackerKey,
+        factory: Callable[[], RollingWindowTracker],
+    ) -> SharedTracker:
+        self.release(entry_id)
+        self._released.pop(entry_id, None)
+        shared = self._trackers.get(key)
+        if shared is None:
+            shared = SharedTracker(self._hass, key, factory())
+            self._trackers[key] = shared
+        shared.subscribers.add(entry_id)
+        self._keys_by_entry[entry_id] = key
+        return shared
+
+    def release(self, entry_id: str) -> None:
+        key = self._keys_by_entry.pop(entry_id, None)
+        shared = self._trackers.get(key) if key is not None else None
+        if shared is None:
+            return
+        shared.subscribers.discard(entry_id)
+        self._released[entry_id] = (key, shared.store)
+        if not shared.subscribers:
+            # Write what the last subscriber saw; removing the entry cancels this.
+            shared.store.async_flush(shared.tracker)
+            del self._trackers[key]
+
+    async def async_remove_entry(self, entry_id: str) -> None:
+        """Delete a removed entry's saved state unless another entry still uses it."""
+        self.release(entry_id)
+        await RollingWindowStore(self._hass, entry_id).async_remove()
+        released = self._released.pop(entry_id, None)
+        if released is None:
+            return
+        key, store = released
+        if key in self._trackers or any(
+            other_key == key for other_key, _ in self._released.values()
+        ):
+            return
+        await store.async_remove()
+
+    def __len__(self) -> int:
+        return len(self._trackers)
+
+
+def get_tracker_registry(hass: Any) -> TrackerRegistry:
+    """Return the domain-level tracker registry, creating it on first use."""
+    return get_domain_singleton(hass, DATA_TRACKER_REGISTRY, lambda: TrackerRegistry(hass))
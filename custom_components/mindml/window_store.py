@@ -0,0 +1,76 @@
+"""Persist rolling window tracker state across Home Assistant restarts."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from functools import partial
+import logging
+from typing import Any, Final
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .rolling_window import RollingWindowTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION: Final = 1
+SAVE_DELAY_SECONDS: Final = 60.0
+
+
+class RollingWindowStore:
+    """Load and batch-save one tracker's state through an HA ``Store``."""
+
+    def __init__(self, hass: Any, storage_id: str) -> None:
+        self._store: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.rolling_window.{storage_id}")
+        # Set while a delayed save is scheduled; cleared when it serializes the tracker.
+        self._save_pending = False
+
+    async def async_restore(self, tracker: RollingWindowTracker) -> datetime | None:
+        """Merge saved state into ``tracker``; return when it was saved, if restored."""
+        try:
+            data = await self._store.async_load()
+        except Exception as exc:
+            _LOGGER.debug("Rolling window state not loaded: %s", exc)
+            return None
+        if not isinstance(data, dict):
+            return None
+        try:
+            tracker.restore(data)
+            return datetime.fromtimestamp(float(data["saved_at"]), UTC)
+        except (KeyError, IndexError, TypeError, ValueError) as exc:
+            _LOGGER.warning("Discarding unreadable rolling window state: %s", exc)
+            return None
+
+    @callback
+    def async_schedule_save(self, tracker: RollingWindowTracker) -> None:
+        """Save at most once per ``SAVE_DELAY_SECONDS``; HA flushes a pending save at shutdown.
+
+        ``async_delay_save`` restarts its timer on every call, so it is only called
+        when no save is pending; otherwise steady events would postpone it forever.
+        """
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(partial(self._data, tracker), SAVE_DELAY_SECONDS)
+
+    @callback
+    def async_flush(self, tracker: RollingWindowTracker) -> None:
+        """Replace any pending save with one on the next event loop iteration."""
+        self._save_pending = True
+        self._store.async_delay_save(partial(self._data, tracker), 0)
+
+    def _data(self, tracker: RollingWindowTracker) -> dict[str, Any]:
+        self._save_pending = False
+        return tracker.as_dict()
+
+    async def async_save(self, tracker: RollingWindowTracker) -> None:
+        """Write the current state immediately, replacing a pending delayed save."""
+        self._save_pending = False
+        await self._store.async_save(tracker.as_dict())
+
+    async def async_remove(self) -> None:
+        """Delete the saved state; a pending delayed save is cancelled too."""
+        self._save_pending = False
+        await self._store.async_remove()
@@ -3,6 +3,8 @@ from __future__ import annotations
 import asyncio
 import sys
 import types
+import weakref
+from datetime import UTC, datetime
 from pathlib import Path
 
 import pytest
@@ -21,6 +23,7 @@ def _install_homeassistant_stubs() -> None:
     config_entries = types.ModuleType("homeassistant.config_entries")
     data_entry_flow = types.ModuleType("homeassistant.data_entry_flow")
     core = types.ModuleType("homeassistant.core")
+    exceptions = types.ModuleType("homeassistant.exceptions")
     components = types.ModuleType("homeassistant.components")
     sensor_component = types.ModuleType("homeassistant.components.sensor")
     helpers = types.ModuleType("homeassistant.helpers")
@@ -28,6 +31,9 @@ def _install_homeassistant_stubs() -> None:
     entity_platform = types.ModuleType("homeassistant.helpers.entity_platform")
     event_helpers = types.ModuleType("homeassistant.helpers.event")
     restore_state = types.ModuleType("homeassistant.helpers.restore_state")
+    storage = types.ModuleType("homeassistant.helpers.storage")
+    util = types.ModuleType("homeassistant.util")
+    dt_util = types.ModuleType("homeassistant.util.dt")
 
     class ConfigFlow:
         @classmethod
@@ -65,10 +71,17 @@ def _install_homeassistant_stubs() -> None:
         def async_create_entry(self, *, title, data):
             return {"type": "create_entry", "title": title, "data": data}
 
+    class HomeAssistantError(Exception):
+        pass
+
+    class ServiceValidationError(HomeAssistantError):
+        pass
+
     class State:
-        def __init__(self, entity_id: str, state: str) -> None:
+        def __init__(self, entity_id: str, state: str, attributes=None) -> None:
             self.entity_id = entity_id
             self.state = state
+            self.attributes = dict(attributes or {})
 
     class SensorEntity:
         @property
@@ -91,6 +104,38 @@ def _install_homeassistant_stubs() -> None:
         async def async_get_last_state(self):
             return None
 
+    # Saved data is shared per hass and key, like files under .storage.
+    storage_files = weakref.WeakKeyDictionary()
+
+    class Store:
+        def __init__(self, hass, version, key) -> None:
+            self.hass = hass
+            self.version = version
+            self.key = key
+            self._files = storage_files.setdefault(hass, {})
+            self.pending_save = None
+
+        @property
+        def data(self):
+            return self._files.get(self.key)
+
+        @data.setter
+        def data(self, value) -> None:
+            self._files[self.key] = value
+
+        async def async_load(self):
+            return self.data
+
+        def async_delay_save(self, data_func, delay=0) -> None:
+            self.pending_save = (data_func, delay)
+
+        async def async_save(self, data) -> None:
+            self.data = data
+
+        async def async_remove(self) -> None:
+            self.pending_save = None
+            self._files.pop(self.key, None)
+
     class SelectSelectorMode:
         DROPDOWN = "dropdown"
 
@@ -130,9 +175,12 @@ def _install_homeassistant_stubs() -> None:
     core.Event = object
     core.State = State
     core.callback = lambda fn: fn
+    exceptions.HomeAssistantError = HomeAssistantError
+    exceptions.ServiceValidationError = ServiceValidationError
     sensor_component.SensorEntity = SensorEntity
     sensor_component.SensorStateClass = SensorStateClass
     restore_state.RestoreEntity = RestoreEntity
+    storage.Store = Store
     selector.SelectSelectorMode = SelectSelectorMode
     selector.SelectOptionDict = SelectOptionDict
     selector.SelectSelectorConfig = SelectSelectorConfig
@@ -141,12 +189,18 @@ def _install_homeassistant_stubs() -> None:
     selector.EntitySelector = EntitySelector
     entity_platform.AddEntitiesCallback = object
     event_helpers.async_track_state_change_event = lambda hass, entities, cb: lambda: None
+    event_helpers.async_track_utc_time_change = lambda hass, cb, **kwargs: lambda: None
+    event_helpers.async_call_later = lambda hass, delay, action: lambda: None
+    dt_util.utcnow = lambda: datetime.now(UTC)
+    dt_util.as_local = lambda value: value.astimezone()
+    util.dt = dt_util
     helpers.selector = selector
 
     sys.modules["homeassistant"] = homeassistant
     sys.modules["homeassistant.config_entries"] = config_entries
     sys.modules["homeassistant.data_entry_flow"] = data_entry_flow
     sys.modules["homeassistant.core"] = core
+    sys.modules["homeassistant.exceptions"] = exceptions
     sys.modules["homeassistant.components"] = components
     sys.modules["homeassistant.components.sensor"] = sensor_component
     sys.modules["homeassistant.helpers"] = helpers
@@ -154,6 +208,9 @@ def _install_homeassistant_stubs() -> None:
     sys.modules["homeassistant.helpers.entity_platform"] = entity_platform
     sys.modules["homeassistant.helpers.event"] = event_helpers
     sys.modules["homeassistant.helpers.restore_state"] = restore_state
+    sys.modules["homeassistant.helpers.storage"] = storage
+    sys.modules["homeassistant.util"] = util
+    sys.modules["homeassistant.util.dt"] = dt_util
 
 
 _install_homeassistant_stubs()
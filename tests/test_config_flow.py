@@ -572,3 +572,56 @@ def test_options_flow_features_delete_action_removes_selected_feature() -> None:
     assert updated["type"] == "create_entry"
     assert updated["data"]["required_features"] == ["binary_sensor.window"]
     assert updated["data"]["feature_states"] == {"binary_sensor.window": "on"}
+
+
+def _snapshot_options_entry() -> MagicMock:
+    entry = MagicMock()
+    entry.options = {
+        "required_features": ["sensor.a", "sensor.b"],
+        "feature_states": {"sensor.a": "1", "sensor.b": "2"},
+        "state_mappings": {},
+        "feature_types": {"sensor.a": "numeric", "sensor.b": "numeric"},
+        "threshold": 50.0,
+        "ml_db_path": "/tmp/ha_ml_data_layer.db",
+        "ml_feature_source": "ml_snapshot",
+        "ml_feature_view": "vw_latest_feature_snapshot",
+        "feature_ttl_seconds": {"sensor.a": 30.0},
+    }
+    entry.data = {}
+    return entry
+
+
+def test_options_feature_source_persists_feature_ttls() -> None:
+    flow = ClrOptionsFlow(_snapshot_options_entry())
+
+    form = asyncio.run(flow.async_step_feature_source())
+    updated = asyncio.run(
+        flow.async_step_feature_source(
+            {
+                "ml_feature_source": "ml_snapshot",
+                "ml_feature_view": "vw_latest_feature_snapshot",
+                "feature_ttl_seconds": "sensor.a=60, sensor.b = 300",
+            }
+        )
+    )
+
+    assert form["type"] == "form"
+    assert updated["type"] == "create_entry"
+    assert updated["data"]["feature_ttl_seconds"] == {"sensor.a": 60.0, "sensor.b": 300.0}
+
+
+def test_options_feature_source_rejects_invalid_feature_ttls() -> None:
+    flow = ClrOptionsFlow(_snapshot_options_entry())
+
+    for raw in ("sensor.a", "sensor.a=soon", "sensor.a=0"):
+        result = asyncio.run(
+            flow.async_step_feature_source(
+                {
+                    "ml_feature_source": "ml_snapshot",
+                    "ml_feature_view": "vw_latest_feature_snapshot",
+                    "feature_ttl_seconds": raw,
+                }
+            )
+        )
+        assert result["type"] == "form"
+        assert result["errors"] == {"feature_ttl_seconds": "invalid_feature_ttl"}
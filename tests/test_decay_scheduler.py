@@ -0,0 +1,78 @@
+"""Tests for the shared rolling window decay scheduler."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from custom_components.mindml.const import DOMAIN
+from custom_components.mindml.decay_scheduler import get_decay_scheduler
+
+
+def _fake_timers(monkeypatch, clock: dict[str, float]) -> list[dict]:
+    timers: list[dict] = []
+
+    def _call_later(hass, delay, action):
+        timer = {"delay": delay, "action": action, "cancelled": False}
+        timers.append(timer)
+        return lambda: timer.update(cancelled=True)
+
+    monkeypatch.setattr("custom_components.mindml.decay_scheduler.async_call_later", _call_later)
+    monkeypatch.setattr("custom_components.mindml.decay_scheduler.monotonic", lambda: clock["now"])
+    return timers
+
+
+def test_nearby_deadlines_share_one_timer_tick(monkeypatch) -> None:
+    clock = {"now": 100.0}
+    timers = _fake_timers(monkeypatch, clock)
+    hass = MagicMock()
+    hass.data = {}
+    scheduler = get_decay_scheduler(hass)
+    calls: list[str] = []
+
+    scheduler.async_schedule("a", 130.0, lambda: calls.append("a"))
+    scheduler.async_schedule("b", 131.5, lambda: calls.append("b"))
+    scheduler.async_schedule("c", 200.0, lambda: calls.append("c"))
+
+    assert hass.data[DOMAIN]["decay_scheduler"] is scheduler
+    assert [timer["delay"] for timer in timers if not timer["cancelled"]] == [31.5]
+
+    clock["now"] = 131.5
+    timers[-1]["action"](None)
+
+    assert calls == ["a", "b"]
+    assert timers[-1]["delay"] == 68.5
+
+
+def test_rescheduling_and_cancel_rearm_the_single_timer(monkeypatch) -> None:
+    clock = {"now": 0.0}
+    timers = _fake_timers(monkeypatch, clock)
+    scheduler = get_decay_scheduler(MagicMock(data={}))
+    calls: list[str] = []
+
+    scheduler.async_schedule("a", 50.0, lambda: calls.append("a"))
+    scheduler.async_schedule("a", 10.0, lambda: calls.append("a"))
+    assert timers[0]["cancelled"] is True
+    assert timers[1]["delay"] == 10.0
+
+    scheduler.async_cancel("a")
+    assert timers[1]["cancelled"] is True
+
+    scheduler.async_schedule("a", None, lambda: calls.append("a"))
+    assert len(timers) == 2
+    assert calls == []
+
+
+def test_action_can_reschedule_itself_from_the_tick(monkeypatch) -> None:
+    clock = {"now": 0.0}
+    timers = _fake_timers(monkeypatch, clock)
+    scheduler = get_decay_scheduler(MagicMock(data={}))
+
+    def _recompute() -> None:
+        scheduler.async_schedule("a", 25.0, _recompute)
+
+    scheduler.async_schedule("a", 5.0, _recompute)
+    clock["now"] = 5.0
+    timers[-1]["action"](None)
+
+    assert len(timers) == 2
+    assert timers[-1]["delay"] == 20.0
@@ -10,6 +10,7 @@ from custom_components.mindml.sensor import CalibratedLogisticRegressionSensor
 
 def test_config_entry_to_sensor_probability_smoke_path(monkeypatch) -> None:
     hass = MagicMock()
+    hass.data = {}
     hass.states.get.side_effect = lambda entity_id: {
         "sensor.temperature": State("sensor.temperature", "21.5"),
         "sensor.humidity": State("sensor.humidity", "55"),
@@ -135,3 +135,401 @@ def test_realtime_history_feature_provider_combines_state_and_history_features()
         "minutes_since_motion": 12.0,
     }
     assert vector.missing_features == []
+
+
+def test_sqlite_snapshot_feature_provider_queries_only_required_features_in_chunks(
+    tmp_path: Path, monkeypatch
+) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            "CREATE TABLE vw_latest_feature_snapshot (feature_name TEXT NOT NULL, feature_value REAL)"
+        )
+        conn.executemany(
+            "INSERT INTO vw_latest_feature_snapshot VALUES (?, ?)",
+            [(f"feature_{index}", float(index)) for index in range(50)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    monkeypatch.setattr("custom_components.mindml.feature_provider._SQLITE_MAX_IN_PARAMS", 2)
+    required = ["feature_3", "feature_7", "feature_11", "feature_missing", "feature_3"]
+    provider = SqliteSnapshotFeatureProvider(
+        db_path=str(db_path),
+        snapshot_view="vw_latest_feature_snapshot",
+        required_features=required,
+    )
+
+    vector = provider.load()
+
+    assert vector.feature_values == {"feature_3": 3.0, "feature_7": 7.0, "feature_11": 11.0}
+    assert vector.missing_features == ["feature_missing"]
+    assert [params for _, params in provider._required_feature_queries()] == [
+        ("feature_3", "feature_7"),
+        ("feature_11", "feature_missing"),
+    ]
+
+
+def test_sqlite_snapshot_feature_provider_reports_unchanged_until_db_written(
+    tmp_path: Path,
+) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            "CREATE TABLE vw_latest_feature_snapshot (feature_name TEXT NOT NULL, feature_value REAL)"
+        )
+        conn.execute("INSERT INTO vw_latest_feature_snapshot VALUES ('event_count', 1.0)")
+        conn.commit()
+
+        provider = SqliteSnapshotFeatureProvider(
+            db_path=str(db_path),
+            snapshot_view="vw_latest_feature_snapshot",
+            required_features=["event_count"],
+        )
+
+        first = provider.load()
+        second = provider.load()
+        conn.execute("UPDATE vw_latest_feature_snapshot SET feature_value = 2.0")
+        conn.commit()
+        third = provider.load()
+    finally:
+        conn.close()
+
+    assert first.unchanged is False
+    assert second.unchanged is True
+    assert second.feature_values == {"event_count": 1.0}
+    assert third.unchanged is False
+    assert third.feature_values == {"event_count": 2.0}
+
+
+def test_sqlite_snapshot_providers_sharing_a_pool_skip_unchanged_overlapping_polls(
+    tmp_path: Path,
+) -> None:
+    from custom_components.mindml.sqlite_connections import SqliteReadOnlyConnectionPool
+
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            "CREATE TABLE vw_latest_feature_snapshot (feature_name TEXT NOT NULL, feature_value REAL)"
+        )
+        conn.execute("INSERT INTO vw_latest_feature_snapshot VALUES ('event_count', 1.0)")
+        conn.commit()
+    finally:
+        conn.close()
+    pool = SqliteReadOnlyConnectionPool()
+    providers = [
+        SqliteSnapshotFeatureProvider(
+            db_path=str(db_path),
+            snapshot_view="vw_latest_feature_snapshot",
+            required_features=["event_count"],
+            connection_pool=pool,
+        )
+        for _ in range(3)
+    ]
+    for provider in providers:
+        provider.load()
+
+    # Another poll holding a connection hands each provider a different one.
+    with pool.connection(str(db_path)), pool.connection(str(db_path)):
+        results = [provider.load() for provider in providers]
+
+    assert all(result.unchanged for result in results)
+    pool.close()
+
+
+def test_hass_feature_provider_compiled_encoders_match_mapping_rules() -> None:
+    states = {
+        "binary_sensor.door": _State("Open"),
+        "sensor.mode": _State("Eco"),
+        "sensor.level": _State("3"),
+        "binary_sensor.window": _State("ajar"),
+    }
+    hass = MagicMock()
+    hass.states.get.side_effect = states.get
+
+    provider = HassStateFeatureProvider(
+        hass=hass,
+        required_features=list(states),
+        feature_types={
+            "binary_sensor.door": "categorical",
+            "sensor.mode": "categorical",
+            "sensor.level": "categorical",
+            "binary_sensor.window": "categorical",
+        },
+        state_mappings={"sensor.mode": {"eco": 2.0}, "binary_sensor.door": {"open": 5.0}},
+    )
+
+    first = provider.load()
+    second = provider.load()
+
+    for vector in (first, second):
+        assert vector.feature_values == {
+            "binary_sensor.door": 5.0,
+            "sensor.mode": 2.0,
+            "sensor.level": 3.0,
+        }
+        assert vector.mapped_state_values == {"binary_sensor.door": "Open", "sensor.mode": "Eco"}
+        assert vector.missing_features == ["binary_sensor.window"]
+
+
+def test_hass_feature_provider_falls_back_to_known_boolean_states() -> None:
+    hass = MagicMock()
+    hass.states.get.return_value = _State("off")
+
+    provider = HassStateFeatureProvider(
+        hass=hass,
+        required_features=["binary_sensor.motion"],
+        feature_types={"binary_sensor.motion": "categorical"},
+        state_mappings={},
+    )
+
+    assert provider.load().feature_values == {"binary_sensor.motion": 0.0}
+
+
+def test_hass_feature_provider_patches_live_row_from_events_only() -> None:
+    hass = MagicMock()
+    hass.states.get.side_effect = lambda entity_id: {
+        "sensor.temp": _State("21.5"),
+        "binary_sensor.window": _State("off"),
+    }.get(entity_id)
+
+    provider = HassStateFeatureProvider(
+        hass=hass,
+        required_features=["sensor.temp", "binary_sensor.window"],
+        feature_types={"sensor.temp": "numeric", "binary_sensor.window": "categorical"},
+        state_mappings={"binary_sensor.window": {"on": 1.0, "off": 0.0}},
+    )
+    provider.rebuild()
+    hass.states.get.reset_mock()
+
+    assert provider.update_entity("binary_sensor.window", _State("on")) is True
+    assert provider.update_entity("sensor.unrelated", _State("5")) is False
+    vector = provider.load()
+
+    hass.states.get.assert_not_called()
+    assert vector.feature_values == {"sensor.temp": 21.5, "binary_sensor.window": 1.0}
+
+    provider.update_entity("sensor.temp", None)
+    assert provider.load().missing_features == ["sensor.temp"]
+
+
+def test_feature_vector_tracks_missing_slots_in_bitmask_and_orders_rows() -> None:
+    vector = FeatureVectorResult(
+        feature_values={"sensor.a": 1.0, "sensor.b": 2.0},
+        missing_features=["sensor.c"],
+        mapped_state_values={},
+    )
+
+    assert vector.names == ("sensor.a", "sensor.b", "sensor.c")
+    assert vector.missing_mask == 0b100
+    assert vector.missing_features == ["sensor.c"]
+    assert vector.feature_values == {"sensor.a": 1.0, "sensor.b": 2.0}
+    assert list(vector.ordered_row(["sensor.a", "sensor.b"])) == [1.0, 2.0]
+    assert list(vector.ordered_row(["sensor.b", "sensor.a"])) == [2.0, 1.0]
+
+    aligned = FeatureVectorResult(
+        feature_values={"sensor.a": 1.0, "sensor.b": 2.0},
+        missing_features=[],
+        mapped_state_values={},
+    )
+    assert aligned.ordered_row(["sensor.a", "sensor.b"]) is aligned.values
+
+
+def test_hass_feature_provider_returns_independent_vector_snapshots() -> None:
+    hass = MagicMock()
+    hass.states.get.return_value = _State("1")
+    provider = HassStateFeatureProvider(
+        hass=hass,
+        required_features=["sensor.a"],
+        feature_types={"sensor.a": "numeric"},
+        state_mappings={},
+    )
+    provider.rebuild()
+    first = provider.load()
+
+    provider.update_entity("sensor.a", _State("7"))
+
+    assert first.feature_values == {"sensor.a": 1.0}
+    assert provider.load().feature_values == {"sensor.a": 7.0}
+
+
+def test_hass_feature_provider_reads_attribute_feature_references() -> None:
+    climate = MagicMock(state="heat", attributes={"current_temperature": 21, "preset": "eco"})
+    hass = MagicMock()
+    hass.states.get.side_effect = lambda entity_id: {"climate.living_room": climate}.get(entity_id)
+
+    provider = HassStateFeatureProvider(
+        hass=hass,
+        required_features=[
+            "climate.living_room",
+            "climate.living_room#current_temperature",
+            "climate.living_room#preset",
+            "climate.living_room#missing",
+        ],
+        feature_types={
+            "climate.living_room": "categorical",
+            "climate.living_room#preset": "categorical",
+        },
+        state_mappings={
+            "climate.living_room": {"heat": 1.0},
+            "climate.living_room#preset": {"eco": 2.0},
+        },
+    )
+    vector = provider.load()
+
+    assert provider.watched_entities == ["climate.living_room"]
+    assert vector.feature_values == {
+        "climate.living_room": 1.0,
+        "climate.living_room#current_temperature": 21.0,
+        "climate.living_room#preset": 2.0,
+    }
+    assert vector.missing_features == ["climate.living_room#missing"]
+    assert vector.mapped_state_values == {
+        "climate.living_room": "heat",
+        "climate.living_room#preset": "eco",
+    }
+    changed = MagicMock(attributes={"current_temperature": 22, "preset": "eco"})
+    unrelated = MagicMock(attributes={"current_temperature": 21, "preset": "eco", "fan": "on"})
+    assert provider.attributes_changed("climate.living_room", climate, changed) is True
+    assert provider.attributes_changed("climate.living_room", climate, unrelated) is False
+
+
+def test_async_provider_adapter_runs_blocking_providers_in_executor() -> None:
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    from custom_components.mindml.feature_provider import (
+        SyncFeatureProviderAdapter,
+        as_async_provider,
+    )
+
+    vector = FeatureVectorResult(feature_values={"a": 1.0}, missing_features=[], mapped_state_values={})
+
+    class _InMemory:
+        def load(self):
+            return vector
+
+    class _Blocking(_InMemory):
+        blocking_io = True
+
+    class _Native:
+        async def async_load(self):
+            return vector
+
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock(side_effect=lambda target: target())
+
+    inline = as_async_provider(_InMemory(), hass=hass)
+    assert isinstance(inline, SyncFeatureProviderAdapter) and inline.runs_inline
+    assert asyncio.run(inline.async_load()) is vector
+    hass.async_add_executor_job.assert_not_awaited()
+
+    blocking = as_async_provider(_Blocking(), hass=hass)
+    assert blocking.runs_inline is False
+    assert asyncio.run(blocking.async_load()) is vector
+    hass.async_add_executor_job.assert_awaited_once()
+
+    native = _Native()
+    assert as_async_provider(native, hass=hass) is native
+    assert SqliteSnapshotFeatureProvider.blocking_io is True
+
+
+def test_sqlite_snapshot_feature_provider_caches_ttl_features_and_flags_stale(
+    tmp_path: Path, monkeypatch
+) -> None:
+    from datetime import UTC, datetime, timedelta
+
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    fresh_at = datetime.now(UTC).isoformat()
+    old_at = (datetime.now(UTC) - timedelta(days=2)).isoformat()
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE vw_latest_feature_snapshot ("
+        "feature_name TEXT NOT NULL, feature_value REAL, ttl_seconds REAL, updated_at_utc TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO vw_latest_feature_snapshot VALUES (?, ?, ?, ?)",
+        [
+            ("daily_mean", 5.0, 86400.0, old_at),
+            ("minute_count", 1.0, None, fresh_at),
+            ("hourly_rate", 0.5, None, fresh_at),
+        ],
+    )
+    conn.commit()
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(
+        "custom_components.mindml.feature_provider.monotonic", lambda: clock["now"]
+    )
+    provider = SqliteSnapshotFeatureProvider(
+        db_path=str(db_path),
+        snapshot_view="vw_latest_feature_snapshot",
+        required_features=["daily_mean", "minute_count", "hourly_rate"],
+        feature_ttls={"hourly_rate": 3600},
+    )
+
+    first = provider.load()
+    assert first.feature_values == {"daily_mean": 5.0, "minute_count": 1.0, "hourly_rate": 0.5}
+    assert first.stale_features == ("daily_mean",)
+
+    conn.execute("UPDATE vw_latest_feature_snapshot SET feature_value = feature_value + 10")
+    conn.commit()
+    clock["now"] += 60
+    second = provider.load()
+    # Only the feature without a TTL is re-read before its TTL expires.
+    assert second.feature_values == {"daily_mean": 5.0, "minute_count": 11.0, "hourly_rate": 0.5}
+
+    conn.execute("UPDATE vw_latest_feature_snapshot SET feature_value = feature_value + 10")
+    conn.commit()
+    clock["now"] += 3600
+    third = provider.load()
+    conn.close()
+
+    assert third.feature_values == {
+        "daily_mean": 5.0,
+        "minute_count": 21.0,
+        "hourly_rate": 20.5,
+    }
+
+
+def test_sqlite_snapshot_feature_provider_rereads_columns_after_db_replacement(
+    tmp_path: Path,
+) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            "CREATE TABLE vw_latest_feature_snapshot (feature_name TEXT NOT NULL, feature_value REAL)"
+        )
+        conn.execute("INSERT INTO vw_latest_feature_snapshot VALUES ('sensor.a', 1.0)")
+        conn.commit()
+    finally:
+        conn.close()
+
+    provider = SqliteSnapshotFeatureProvider(
+        db_path=str(db_path),
+        snapshot_view="vw_latest_feature_snapshot",
+        required_features=["sensor.a"],
+    )
+    assert provider.load().feature_values == {"sensor.a": 1.0}
+    assert "ttl_seconds" not in provider._columns
+
+    replacement = tmp_path / "replacement.db"
+    conn = sqlite3.connect(replacement)
+    try:
+        conn.execute(
+            "CREATE TABLE vw_latest_feature_snapshot "
+            "(feature_name TEXT NOT NULL, feature_value REAL, ttl_seconds REAL)"
+        )
+        conn.execute("INSERT INTO vw_latest_feature_snapshot VALUES ('sensor.a', 2.0, 30.0)")
+        conn.commit()
+    finally:
+        conn.close()
+    replacement.replace(db_path)
+
+    assert provider.load().feature_values == {"sensor.a": 2.0}
+    assert "ttl_seconds" in provider._columns
+    assert "ttl_seconds" in provider._required_feature_queries()[0][0]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import sqlite3
 from unittest.mock import AsyncMock, MagicMock
 
 from custom_components.mindml import (
@@ -8,7 +9,8 @@ from custom_components.mindml import (
     async_setup_entry,
     async_unload_entry,
 )
-from custom_components.mindml.const import DOMAIN
+from custom_components.mindml.const import DATA_SQLITE_POOL, DOMAIN
+from custom_components.mindml.sqlite_connections import get_read_only_pool
 
 
 def test_async_setup_initializes_domain_data() -> None:
@@ -43,9 +45,33 @@ def test_async_unload_entry_unloads_platforms_and_cleans_up() -> None:
 
     entry = MagicMock()
     entry.entry_id = "entry-1"
+    entry.data = {}
+    entry.options = {}
 
     result = asyncio.run(async_unload_entry(hass, entry))
 
     assert result is True
     hass.config_entries.async_unload_platforms.assert_awaited_once()
     assert "entry-1" not in hass.data[DOMAIN]
+
+
+def test_async_unload_entry_closes_pooled_connections_for_entry_db(tmp_path) -> None:
+    db_path = tmp_path / "ml.db"
+    sqlite3.connect(db_path).close()
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry-1": {}}}
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+    pool = get_read_only_pool(hass)
+    with pool.connection(str(db_path)):
+        pass
+    assert pool._paths[str(db_path)].idle
+
+    entry = MagicMock()
+    entry.entry_id = "entry-1"
+    entry.data = {"ml_db_path": str(db_path)}
+    entry.options = {}
+
+    asyncio.run(async_unload_entry(hass, entry))
+
+    assert hass.data[DOMAIN][DATA_SQLITE_POOL] is pool
+    assert str(db_path) not in pool._paths
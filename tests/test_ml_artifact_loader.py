@@ -66,3 +66,6 @@ def test_load_latest_lightgbm_model_artifact_parses_payload(tmp_path: Path) -> N
     assert artifact.feature_names == ["event_count", "on_ratio"]
     assert artifact.model_payload["type"] == "lightgbm_binary_classifier"
     assert artifact.model_payload["booster_model_str"] == "tree\nversion=v4\nend of trees\n"
+    assert artifact.fingerprint is not None
+    assert artifact.artifact_bytes == len(artifact_json.encode("utf-8"))
+    assert set(artifact.load_timings) == {"sqlite_read", "json_decode"}
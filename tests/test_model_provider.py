@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import sqlite3
 import sys
+import time
 import types
 from pathlib import Path
 
@@ -154,3 +155,49 @@ def test_sqlite_lightgbm_model_provider_loads_latest_training_result(tmp_path: P
     assert result.training_result["status"] == "completed"
     assert result.training_result["row_count"] == 12
     assert result.training_result["day_count"] == 3
+
+
+def test_sqlite_lightgbm_model_provider_reports_stage_timings_and_budget_warning(
+    tmp_path: Path, caplog
+) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.execute("INSERT INTO metadata(key, value) VALUES ('contract_version', '2')")
+        conn.commit()
+    finally:
+        conn.close()
+
+    def _loader(db_path: str, artifact_view: str) -> LightGBMModelArtifact:
+        time.sleep(0.005)
+        return LightGBMModelArtifact(
+            model_payload={"weights": [0.1], "intercept": 0.0},
+            feature_names=["event_count"],
+            model_type="lightgbm_like",
+            feature_set_version="v1",
+            created_at_utc=None,
+            artifact_bytes=128,
+            load_timings={"sqlite_read": 0.001, "json_decode": 0.002},
+        )
+
+    provider = SqliteLightGBMModelProvider(
+        db_path=str(db_path),
+        artifact_view="vw_lightgbm_latest_model_artifact",
+        fallback_feature_names=["event_count"],
+        artifact_loader=_loader,
+        load_budget_seconds=0.0,
+    )
+
+    with caplog.at_level("WARNING"):
+        result = provider.load()
+
+    timings = result.artifact_meta["load_timings_ms"]
+    assert result.source == "ml_data_layer"
+    assert result.artifact_meta["artifact_bytes"] == 128
+    assert timings["sqlite_read"] == 1.0
+    assert timings["json_decode"] == 2.0
+    assert {"training_result_read", "contract_check", "artifact_load", "total"} <= set(timings)
+    stages = sum(value for stage, value in timings.items() if stage != "total")
+    assert stages <= timings["total"] + 0.1
+    assert "budget" in caplog.text
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.mindml import async_setup
+from custom_components.mindml.const import DOMAIN
+from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+from custom_components.mindml.model_provider import ModelProviderResult
+from custom_components.mindml.model_registry import ModelRegistry, get_model_registry
+
+
+def _result(fingerprint: str | None, *, source: str = "ml_data_layer") -> ModelProviderResult:
+    return ModelProviderResult(
+        model=LightGBMModelSpec(
+            feature_names=["event_count"],
+            model_payload={"intercept": 0.0, "weights": [1.0]},
+        ),
+        source=source,
+        artifact_error=None if source == "ml_data_layer" else "bad artifact",
+        artifact_meta={"fingerprint": fingerprint} if fingerprint else {},
+        training_result={"status": "completed"},
+    )
+
+
+def test_registry_keeps_last_n_versions_newest_first() -> None:
+    registry = ModelRegistry(history_size=2)
+    for fingerprint in ("a", "b", "c"):
+        registry.record("entry-1", _result(fingerprint))
+
+    assert [version.fingerprint for version in registry.versions("entry-1")] == ["c", "b"]
+    assert registry.active("entry-1").artifact_meta["fingerprint"] == "c"
+
+
+def test_pin_swaps_to_retained_model_without_reload() -> None:
+    registry = ModelRegistry()
+    first = _result("a")
+    registry.record("entry-1", first)
+    registry.record("entry-1", _result("b"))
+    swaps: list[str] = []
+    registry.async_add_listener("entry-1", lambda: swaps.append("swap"))
+
+    pinned = registry.pin("entry-1", "a")
+
+    assert pinned is first
+    assert registry.active("entry-1") is first
+    assert swaps == ["swap"]
+
+    registry.unpin("entry-1")
+    assert registry.active("entry-1").artifact_meta["fingerprint"] == "b"
+
+
+def test_pinned_version_survives_newer_loads_and_fallbacks() -> None:
+    registry = ModelRegistry(history_size=2)
+    first = _result("a")
+    registry.record("entry-1", first)
+    registry.pin("entry-1", "a")
+
+    registry.record("entry-1", _result("b"))
+    registry.record("entry-1", _result("c"))
+    active = registry.record("entry-1", _result(None, source="manual"))
+
+    assert active is first
+    assert [version.fingerprint for version in registry.versions("entry-1")] == ["c", "a"]
+
+
+def test_reloading_same_fingerprint_reuses_parsed_model() -> None:
+    registry = ModelRegistry()
+    first = _result("a")
+    registry.record("entry-1", first)
+    reloaded = _result("a")
+
+    registry.record("entry-1", reloaded)
+
+    assert reloaded.model is first.model
+    assert len(registry.versions("entry-1")) == 1
+
+
+def test_pin_unknown_version_raises() -> None:
+    registry = ModelRegistry()
+    registry.record("entry-1", _result("a"))
+
+    with pytest.raises(KeyError):
+        registry.pin("entry-1", "missing")
+
+
+def test_async_setup_registers_pin_services() -> None:
+    hass = MagicMock()
+    hass.data = {}
+
+    asyncio.run(async_setup(hass, {}))
+
+    registered = {call.args[1] for call in hass.services.async_register.call_args_list}
+    assert registered == {"pin_model_version", "unpin_model_version"}
+    assert get_model_registry(hass) is hass.data[DOMAIN]["model_registry"]
+
+
+def test_pin_service_raises_service_validation_error_for_unknown_entry() -> None:
+    from homeassistant.exceptions import ServiceValidationError
+
+    hass = MagicMock()
+    hass.data = {}
+    asyncio.run(async_setup(hass, {}))
+    handlers = {call.args[1]: call.args[2] for call in hass.services.async_register.call_args_list}
+
+    with pytest.raises(ServiceValidationError):
+        asyncio.run(handlers["pin_model_version"](MagicMock(data={"entry_id": "x", "fingerprint": "a"})))
+    with pytest.raises(ServiceValidationError):
+        asyncio.run(handlers["unpin_model_version"](MagicMock(data={"entry_id": "x"})))
+
+
+def test_remove_entry_drops_retained_versions() -> None:
+    from custom_components.mindml import async_remove_entry
+
+    hass = MagicMock()
+    hass.data = {}
+    registry = get_model_registry(hass)
+    registry.record("entry-1", _result("a"))
+    entry = MagicMock()
+    entry.entry_id = "entry-1"
+
+    asyncio.run(async_remove_entry(hass, entry))
+
+    assert registry.versions("entry-1") == []
+    assert registry.active("entry-1") is None
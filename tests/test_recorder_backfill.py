@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import types
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+from custom_components.mindml.recorder_backfill import async_backfill_tracker
+from custom_components.mindml.rolling_window import RollingWindowTracker
+
+
+class _RecordedState:
+    def __init__(self, state: str, last_changed: datetime) -> None:
+        self.state = state
+        self.last_changed = last_changed
+
+
+def _install_recorder(monkeypatch, states_by_entity, calls: list[dict]) -> None:
+    recorder = types.ModuleType("homeassistant.components.recorder")
+    history = types.ModuleType("homeassistant.components.recorder.history")
+
+    def get_significant_states(hass, start_time, **kwargs):
+        calls.append({"start_time": start_time, **kwargs})
+        return states_by_entity
+
+    class _Instance:
+        async def async_add_executor_job(self, target):
+            return target()
+
+    history.get_significant_states = get_significant_states
+    recorder.history = history
+    recorder.get_instance = lambda hass: _Instance()
+    monkeypatch.setitem(sys.modules, "homeassistant.components.recorder", recorder)
+    monkeypatch.setitem(sys.modules, "homeassistant.components.recorder.history", history)
+
+
+def test_backfill_replays_window_history_in_one_bulk_query(monkeypatch) -> None:
+    now = datetime.now(UTC)
+    calls: list[dict] = []
+    _install_recorder(
+        monkeypatch,
+        {
+            "binary_sensor.motion": [
+                _RecordedState("on", now - timedelta(hours=2)),
+                _RecordedState("on", now - timedelta(hours=2) + timedelta(seconds=5)),
+                _RecordedState("off", now - timedelta(hours=1)),
+                _RecordedState("on", now - timedelta(minutes=5)),
+            ],
+            "binary_sensor.door": [_RecordedState("on", now - timedelta(minutes=30))],
+        },
+        calls,
+    )
+    tracker = RollingWindowTracker(window_hours=7.0, feature_states={"binary_sensor.motion": "on"})
+
+    replayed = asyncio.run(
+        async_backfill_tracker(
+            MagicMock(),
+            tracker,
+            ["binary_sensor.motion", "binary_sensor.door"],
+            window_hours=7.0,
+            until=now,
+        )
+    )
+
+    assert len(calls) == 1
+    assert calls[0]["entity_ids"] == ["binary_sensor.motion", "binary_sensor.door"]
+    assert calls[0]["start_time"] == now - timedelta(hours=7)
+    # Attribute-only repeat and non-matching states/entities are dropped.
+    assert replayed == 2
+    assert tracker.compute_features(["event_count"])["event_count"] == 2.0
+
+
+def test_backfill_is_a_noop_without_recorder() -> None:
+    tracker = RollingWindowTracker(window_hours=1.0)
+
+    replayed = asyncio.run(
+        async_backfill_tracker(
+            MagicMock(),
+            tracker,
+            ["binary_sensor.motion"],
+            window_hours=1.0,
+            until=datetime.now(UTC),
+        )
+    )
+
+    assert replayed == 0
+    assert tracker.event_count == 0
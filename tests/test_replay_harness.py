@@ -0,0 +1,39 @@
+"""Tests for the injectable tracker clock and the synthetic replay harness."""
+
+from __future__ import annotations
+
+from benchmarks.replay_harness import run_replay, synthetic_events
+from custom_components.mindml.rolling_window import RollingWindowTracker
+
+
+def test_injected_clock_drives_pruning_without_patching() -> None:
+    clock = [0.0]
+    tracker = RollingWindowTracker(window_hours=1.0, clock=lambda: clock[0])
+    tracker.record_event("binary_sensor.motion", "on")
+    clock[0] = 1800.0
+    tracker.record_event("binary_sensor.motion", "off")
+
+    clock[0] = 3601.0
+    assert tracker.compute_features([]) == {"event_count": 1.0, "on_ratio": 0.0}
+
+
+def test_explicit_timestamps_override_the_clock() -> None:
+    tracker = RollingWindowTracker(window_hours=1.0, clock=lambda: 10_000.0)
+    tracker.record_event("binary_sensor.motion", "on", 5_000.0)
+    tracker.record_event("binary_sensor.motion", "on", 9_000.0)
+
+    assert tracker.compute_features([])["event_count"] == 1.0
+
+
+def test_replay_is_deterministic_and_counts_every_event() -> None:
+    first = run_replay(event_count=5000, window_hours=1.0, seed=11)
+    second = run_replay(event_count=5000, window_hours=1.0, seed=11)
+    events = list(synthetic_events(5000, seed=11))
+
+    cutoff = events[-1][0] - 3600.0
+    in_window = [state for timestamp, _, state in events if timestamp >= cutoff]
+    assert first.events == 5000
+    assert first.computes == 51
+    assert first.features == second.features
+    assert first.features["event_count"] == float(len(in_window))
+    assert first.features["on_ratio"] == in_window.count("on") / len(in_window)
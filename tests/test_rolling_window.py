@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
 
-from custom_components.mindml.rolling_window import RollingWindowTracker
+from custom_components.mindml.rolling_window import EVENT_BYTES, RollingWindowTracker
 
 
 def test_empty_tracker_returns_zero_event_count() -> None:
@@ -49,10 +49,14 @@ def test_on_ratio_mixed_events() -> None:
     assert result["on_ratio"] == 0.5
 
 
-def test_old_events_pruned() -> None:
+def test_old_events_pruned(monkeypatch) -> None:
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(
+        "custom_components.mindml.rolling_window.monotonic", lambda: clock["now"]
+    )
     tracker = RollingWindowTracker(window_hours=1.0)
-    old_time = datetime.now(UTC) - timedelta(hours=2)
-    tracker._events.append((old_time, "binary_sensor.motion", "on"))
+    tracker.record_event("binary_sensor.motion", "on")
+    clock["now"] += 2 * 3600.0
     tracker.record_event("binary_sensor.motion", "on")
     result = tracker.compute_features(["event_count"])
     assert result["event_count"] == 1.0
@@ -106,3 +110,503 @@ def test_returns_both_even_with_unrelated_required_features() -> None:
     tracker.record_event("binary_sensor.motion", "on")
     result = tracker.compute_features(["sensor.a", "sensor.b"])
     assert result == {"event_count": 1.0, "on_ratio": 1.0}
+
+
+def test_replay_events_merges_history_before_live_events() -> None:
+    tracker = RollingWindowTracker(window_hours=1.0)
+    tracker.record_event("binary_sensor.motion", "off")
+    live_at = datetime.now(UTC)
+
+    added = tracker.replay_events(
+        [
+            (live_at - timedelta(minutes=10), "binary_sensor.motion", "on"),
+            (live_at - timedelta(hours=3), "binary_sensor.motion", "on"),
+            (live_at + timedelta(seconds=1), "binary_sensor.motion", "on"),
+        ],
+        until=live_at,
+    )
+
+    assert added == 1
+    assert [state for _, _, state in tracker.events()] == ["on", "off"]
+    assert tracker.compute_features(["on_ratio"])["on_ratio"] == 0.5
+
+
+def test_incremental_counters_match_full_scan_under_random_workload(monkeypatch) -> None:
+    import random
+
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(
+        "custom_components.mindml.rolling_window.monotonic", lambda: clock["now"]
+    )
+    rng = random.Random(1234)
+    tracker = RollingWindowTracker(window_hours=1.0)
+    reference: list[tuple[float, str]] = []
+
+    for _ in range(5000):
+        clock["now"] += rng.randint(0, 90)
+        if rng.random() < 0.7:
+            state = rng.choice(["on", "off", "unavailable"])
+            tracker.record_event(f"binary_sensor.s{rng.randint(0, 4)}", state)
+            reference.append((clock["now"], state))
+        if rng.random() < 0.3:
+            cutoff = clock["now"] - 3600.0
+            reference = [event for event in reference if event[0] >= cutoff]
+            on_count = sum(1 for _, state in reference if state == "on")
+            expected_ratio = on_count / len(reference) if reference else 0.0
+            result = tracker.compute_features(["event_count", "on_ratio"])
+            assert result["event_count"] == float(len(reference))
+            assert result["on_ratio"] == expected_ratio
+
+
+def test_per_entity_features_only_for_referenced_entities() -> None:
+    tracker = RollingWindowTracker(
+        window_hours=1.0,
+        required_features=[
+            "event_count@binary_sensor.door",
+            "on_ratio@binary_sensor.door",
+            "seconds_since_last_event@binary_sensor.door",
+            "seconds_since_last_event@binary_sensor.window",
+        ],
+    )
+    tracker.record_event("binary_sensor.door", "on")
+    tracker.record_event("binary_sensor.door", "off")
+    tracker.record_event("binary_sensor.motion", "on")
+
+    result = tracker.compute_features(
+        [
+            "event_count@binary_sensor.door",
+            "on_ratio@binary_sensor.door",
+            "seconds_since_last_event@binary_sensor.door",
+            "seconds_since_last_event@binary_sensor.window",
+        ]
+    )
+
+    assert tracker.watched_entities == ["binary_sensor.door", "binary_sensor.window"]
+    assert result["event_count"] == 3.0
+    assert result["event_count@binary_sensor.door"] == 2.0
+    assert result["on_ratio@binary_sensor.door"] == 0.5
+    assert result["seconds_since_last_event@binary_sensor.door"] < 5.0
+    assert result["seconds_since_last_event@binary_sensor.window"] == 3600.0
+    assert "event_count@binary_sensor.motion" not in result
+
+
+def test_per_entity_window_prunes_expired_events() -> None:
+    tracker = RollingWindowTracker(
+        window_hours=1.0, required_features=["event_count@binary_sensor.door"]
+    )
+    now = datetime.now(UTC)
+    tracker.replay_events(
+        [
+            (now - timedelta(minutes=90), "binary_sensor.door", "on"),
+            (now - timedelta(minutes=30), "binary_sensor.door", "on"),
+        ]
+    )
+
+    result = tracker.compute_features(["event_count@binary_sensor.door"])
+
+    assert result["event_count@binary_sensor.door"] == 1.0
+
+
+def test_on_duration_tracks_time_in_active_state_across_window_edge(monkeypatch) -> None:
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(
+        "custom_components.mindml.rolling_window.monotonic", lambda: clock["now"]
+    )
+    feature = "on_duration_seconds@binary_sensor.door"
+    tracker = RollingWindowTracker(
+        window_hours=1.0,
+        feature_states={"binary_sensor.door": "open"},
+        required_features=[feature],
+    )
+
+    tracker.record_event("binary_sensor.door", "open")
+    clock["now"] += 20 * 60.0
+    tracker.record_event("binary_sensor.door", "closed")
+    clock["now"] += 30 * 60.0
+    tracker.record_event("binary_sensor.door", "open")
+    clock["now"] += 10 * 60.0
+    assert tracker.compute_features([feature])[feature] == 30 * 60.0
+
+    # Window now starts 10 minutes into the first interval.
+    clock["now"] += 10 * 60.0
+    assert tracker.compute_features([feature])[feature] == 30 * 60.0
+
+    clock["now"] += 45 * 60.0
+    assert tracker.compute_features([feature])[feature] == 60 * 60.0
+
+
+def test_on_duration_seeded_from_current_state() -> None:
+    feature = "on_duration_seconds@light.kitchen"
+    tracker = RollingWindowTracker(window_hours=1.0, required_features=[feature])
+
+    tracker.observe_state("light.kitchen", "on", datetime.now(UTC) - timedelta(hours=3))
+
+    assert tracker.duration_entities == ["light.kitchen"]
+    assert 3599.0 < tracker.compute_features([feature])[feature] <= 3600.0
+
+
+def test_ring_buffer_interns_codes_and_grows_to_cap() -> None:
+    tracker = RollingWindowTracker(window_hours=1.0, max_events=100)
+    for index in range(100):
+        tracker.record_event(f"binary_sensor.s{index % 3}", "on" if index % 2 else "off")
+
+    assert tracker.event_count == 100
+    assert tracker.dropped_events == 0
+    assert tracker.memory_bytes == 100 * EVENT_BYTES
+    assert len(tracker._entity_names) == 3
+    assert tracker._state_names == ["on", "off"]
+
+
+def test_ring_buffer_drop_oldest_keeps_counts_consistent() -> None:
+    tracker = RollingWindowTracker(window_hours=1.0, max_events=3)
+    for state in ("on", "on", "off", "off"):
+        tracker.record_event("binary_sensor.motion", state)
+
+    assert [state for _, _, state in tracker.events()] == ["on", "off", "off"]
+    assert tracker.dropped_events == 1
+    assert tracker.compute_features(["on_ratio"])["on_ratio"] == 1 / 3
+
+
+def test_ring_buffer_drop_newest_rejects_events_at_cap() -> None:
+    tracker = RollingWindowTracker(window_hours=1.0, max_events=2, overflow="drop_newest")
+    for state in ("on", "off", "off"):
+        tracker.record_event("binary_sensor.motion", state)
+
+    assert [state for _, _, state in tracker.events()] == ["on", "off"]
+    assert tracker.dropped_events == 1
+
+
+def test_multi_horizon_counters_share_one_event_stream(monkeypatch) -> None:
+    import random
+
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(
+        "custom_components.mindml.rolling_window.monotonic", lambda: clock["now"]
+    )
+    horizons = {"15m": 900.0, "1h": 3600.0, "24h": 86400.0}
+    features = [f"{aggregate}_{label}" for label in horizons for aggregate in ("event_count", "on_ratio")]
+    tracker = RollingWindowTracker(window_hours=7.0, required_features=features)
+    rng = random.Random(7)
+    reference: list[tuple[float, str]] = []
+
+    for _ in range(3000):
+        clock["now"] += rng.randint(0, 120)
+        state = rng.choice(["on", "off"])
+        tracker.record_event("binary_sensor.motion", state)
+        reference.append((clock["now"], state))
+        if rng.random() < 0.2:
+            result = tracker.compute_features(features)
+            for label, seconds in horizons.items():
+                inside = [s for t, s in reference if t >= clock["now"] - seconds]
+                on_ratio = inside.count("on") / len(inside) if inside else 0.0
+                assert result[f"event_count_{label}"] == float(len(inside))
+                assert result[f"on_ratio_{label}"] == on_ratio
+
+    # Each event is stored once, and only as far back as the longest horizon.
+    tracker.compute_features(features)
+    assert tracker.retention_hours == 24.0
+    assert len(list(tracker.events())) == sum(
+        1 for t, _ in reference if t >= clock["now"] - 86400.0
+    )
+
+
+def test_horizon_feature_names_are_window_features() -> None:
+    from custom_components.mindml.rolling_window import is_window_feature, parse_horizon_feature
+
+    assert parse_horizon_feature("on_ratio_15m") == ("on_ratio", 900.0)
+    assert parse_horizon_feature("event_count_2d") == ("event_count", 172800.0)
+    assert parse_horizon_feature("event_count_0h") is None
+    assert is_window_feature("event_count_1h")
+    assert not is_window_feature("seconds_since_last_event_1h")
+
+
+def test_bucketed_mode_bounds_memory_and_matches_bucket_reference(monkeypatch) -> None:
+    import random
+
+    clock = {"now": 0.0}
+    monkeypatch.setattr(
+        "custom_components.mindml.rolling_window.monotonic", lambda: clock["now"]
+    )
+    tracker = RollingWindowTracker(
+        window_hours=24.0, bucket_seconds=300.0, required_features=["event_count_1h"]
+    )
+    rng = random.Random(99)
+    reference: list[tuple[float, str]] = []
+
+    for _ in range(12000):
+        clock["now"] += rng.random() * 10
+        state = rng.choice(["on", "off"])
+        tracker.record_event(f"binary_sensor.s{rng.randint(0, 2)}", state)
+        reference.append((clock["now"], state))
+        if rng.random() < 0.05:
+            current_bucket = clock["now"] // 300.0
+            stamped = [
+                (t if t // 300.0 == current_bucket else (t // 300.0) * 300.0, state)
+                for t, state in reference
+            ]
+            result = tracker.compute_features(["event_count_1h"])
+            for feature, seconds in (("event_count", 86400.0), ("event_count_1h", 3600.0)):
+                inside = [s for t, s in stamped if t >= clock["now"] - seconds]
+                assert result[feature] == float(len(inside))
+            inside = [s for t, s in stamped if t >= clock["now"] - 86400.0]
+            assert result["on_ratio"] == inside.count("on") / len(inside)
+
+    # 3 entities x 2 states per bucket, at most 289 buckets in a day.
+    assert len(tracker._ring) <= 6 * 289
+    assert tracker.event_count == len(reference)
+
+
+def test_bucketed_mode_counts_open_bucket_exactly(monkeypatch) -> None:
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(
+        "custom_components.mindml.rolling_window.monotonic", lambda: clock["now"]
+    )
+    tracker = RollingWindowTracker(window_hours=1.0, bucket_seconds=60.0)
+    tracker.record_event("binary_sensor.motion", "on")
+    tracker.record_event("binary_sensor.motion", "on")
+    tracker.record_event("binary_sensor.motion", "off")
+
+    assert len(tracker._ring) == 0
+    assert tracker.compute_features([])["on_ratio"] == 2 / 3
+
+    clock["now"] += 60.0
+    tracker.compute_features([])
+
+    assert len(tracker._ring) == 2
+    assert [state for _, _, state in tracker.events()] == ["on", "on", "off"]
+
+
+def test_bucketed_mode_collapses_entity_and_numeric_windows(monkeypatch) -> None:
+    import math
+    import random
+    import statistics
+
+    clock = {"now": 0.0}
+    monkeypatch.setattr(
+        "custom_components.mindml.rolling_window.monotonic", lambda: clock["now"]
+    )
+    features = [
+        "event_count@binary_sensor.door",
+        "on_ratio@binary_sensor.door",
+        "mean@sensor.temperature",
+        "min@sensor.temperature",
+        "max@sensor.temperature",
+        "variance@sensor.temperature",
+    ]
+    tracker = RollingWindowTracker(
+        window_hours=24.0, bucket_seconds=300.0, required_features=features
+    )
+    rng = random.Random(45)
+    doors: list[tuple[float, str]] = []
+    readings: list[tuple[float, float]] = []
+
+    for _ in range(20000):
+        clock["now"] += rng.random() * 10
+        bucket_start = clock["now"] // 300.0 * 300.0
+        if rng.random() < 0.5:
+            state = rng.choice(["on", "off"])
+            tracker.record_event("binary_sensor.door", state)
+            doors.append((bucket_start, state))
+        else:
+            value = round(rng.uniform(15.0, 25.0), 2)
+            tracker.record_event("sensor.temperature", str(value))
+            readings.append((bucket_start, value))
+        if rng.random() < 0.02:
+            result = tracker.compute_features(features)
+            cutoff = clock["now"] - 86400.0
+            inside = [state for t, state in doors if t >= cutoff]
+            assert result["event_count@binary_sensor.door"] == float(len(inside))
+            assert result["on_ratio@binary_sensor.door"] == inside.count("on") / len(inside)
+            held = _held_window(readings, cutoff)
+            assert math.isclose(result["mean@sensor.temperature"], statistics.fmean(held))
+            assert result["min@sensor.temperature"] == min(held)
+            assert result["max@sensor.temperature"] == max(held)
+            assert math.isclose(
+                result["variance@sensor.temperature"],
+                statistics.pvariance(held),
+                rel_tol=1e-6,
+                abs_tol=1e-9,
+            )
+
+    # One entry per bucket, at most 289 buckets in a day (plus a carried reading).
+    assert len(tracker._entity_windows["binary_sensor.door"].events) <= 289
+    numeric = tracker._numeric_windows["sensor.temperature"][86400.0]
+    assert len(numeric.samples) <= 290
+    assert len(numeric.minima) <= 290
+
+
+def _held_window(reference: list[tuple[float, float]], cutoff: float) -> list[float]:
+    """Values inside the window plus the reading still holding at its start."""
+    inside = [v for t, v in reference if t >= cutoff]
+    before = [v for t, v in reference if t < cutoff]
+    if before and not any(t == cutoff for t, _ in reference):
+        inside.append(before[-1])
+    return inside
+
+
+def test_numeric_statistics_match_full_recompute_under_random_workload(monkeypatch) -> None:
+    import math
+    import random
+    import statistics
+
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(
+        "custom_components.mindml.rolling_window.monotonic", lambda: clock["now"]
+    )
+    features = [
+        "mean_1h@sensor.temperature",
+        "min_1h@sensor.temperature",
+        "max_1h@sensor.temperature",
+        "variance_1h@sensor.temperature",
+        "std@sensor.temperature",
+    ]
+    tracker = RollingWindowTracker(window_hours=2.0, required_features=features)
+    rng = random.Random(3)
+    reference: list[tuple[float, float]] = []
+
+    for _ in range(4000):
+        clock["now"] += rng.randint(0, 120)
+        value = round(rng.uniform(15.0, 25.0), 2)
+        tracker.record_event("sensor.temperature", str(value))
+        reference.append((clock["now"], value))
+        if rng.random() < 0.1:
+            tracker.record_event("sensor.temperature", "unavailable")
+            result = tracker.compute_features(features)
+            hour = _held_window(reference, clock["now"] - 3600.0)
+            two_hours = _held_window(reference, clock["now"] - 7200.0)
+            assert math.isclose(result["mean_1h@sensor.temperature"], statistics.fmean(hour))
+            assert result["min_1h@sensor.temperature"] == min(hour)
+            assert result["max_1h@sensor.temperature"] == max(hour)
+            assert math.isclose(
+                result["variance_1h@sensor.temperature"],
+                statistics.pvariance(hour),
+                rel_tol=1e-6,
+                abs_tol=1e-9,
+            )
+            assert math.isclose(
+                result["std@sensor.temperature"],
+                statistics.pstdev(two_hours),
+                rel_tol=1e-6,
+                abs_tol=1e-9,
+            )
+
+
+def test_numeric_window_ewma_and_held_value(monkeypatch) -> None:
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(
+        "custom_components.mindml.rolling_window.monotonic", lambda: clock["now"]
+    )
+    features = ["ewma_1h@sensor.power", "mean_1h@sensor.power"]
+    tracker = RollingWindowTracker(window_hours=1.0, required_features=features)
+
+    assert tracker.watched_entities == ["sensor.power"]
+    assert tracker.compute_features(features) == {"event_count": 0.0, "on_ratio": 0.0}
+
+    tracker.record_event("sensor.power", "100")
+    clock["now"] += 3600.0
+    tracker.record_event("sensor.power", "200")
+    clock["now"] += 3601.0
+    result = tracker.compute_features(features)
+
+    # One time constant later the average has moved ~63% of the way to the new value.
+    assert 163.0 < result["ewma_1h@sensor.power"] < 164.0
+    # Both readings are older than the hour, but the newer one still holds.
+    assert result["mean_1h@sensor.power"] == 200.0
+
+
+def test_quiet_numeric_entity_keeps_value_beyond_its_horizon() -> None:
+    from datetime import UTC, datetime, timedelta
+
+    clock = [10_000.0]
+    features = [
+        "mean_1h@sensor.temperature",
+        "min_1h@sensor.temperature",
+        "std_1h@sensor.temperature",
+    ]
+    tracker = RollingWindowTracker(
+        window_hours=1.0, required_features=features, clock=lambda: clock[0]
+    )
+    tracker.observe_state(
+        "sensor.temperature", "21.5", datetime.now(UTC) - timedelta(hours=5)
+    )
+
+    for _ in range(4):
+        clock[0] += 3000.0
+        result = tracker.compute_features(features)
+        assert result["mean_1h@sensor.temperature"] == 21.5
+        assert result["min_1h@sensor.temperature"] == 21.5
+        assert result["std_1h@sensor.temperature"] == 0.0
+        # Re-carrying the same value changes nothing, so no rescore is scheduled.
+        assert tracker.next_expiry() is None
+
+    tracker.record_event("sensor.temperature", "23.5")
+    result = tracker.compute_features(features)
+    assert result["mean_1h@sensor.temperature"] == 22.5
+    assert tracker.next_expiry() == clock[0] + 3600.0
+
+
+def test_numeric_feature_names_are_window_features() -> None:
+    from custom_components.mindml.rolling_window import is_window_feature, parse_numeric_feature
+
+    assert parse_numeric_feature("mean_1h@sensor.temperature") == (
+        "mean",
+        "sensor.temperature",
+        3600.0,
+    )
+    assert parse_numeric_feature("max@sensor.power") == ("max", "sensor.power", None)
+    assert parse_numeric_feature("mean_1h") is None
+    assert is_window_feature("std_15m@sensor.power")
+    assert not is_window_feature("median_1h@sensor.power")
+
+
+def test_next_expiry_is_earliest_event_leaving_any_window(monkeypatch) -> None:
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(
+        "custom_components.mindml.rolling_window.monotonic", lambda: clock["now"]
+    )
+    tracker = RollingWindowTracker(
+        window_hours=1.0,
+        required_features=["event_count_15m", "mean@sensor.temperature"],
+    )
+    assert tracker.next_expiry() is None
+
+    tracker.record_event("binary_sensor.motion", "on")
+    clock["now"] += 100.0
+    tracker.record_event("sensor.temperature", "20")
+    assert tracker.next_expiry() == 1000.0 + 900.0
+
+    clock["now"] = 1000.0 + 901.0
+    tracker.compute_features(["event_count_15m"])
+    assert tracker.next_expiry() == 1100.0 + 900.0
+
+
+def test_compute_features_parses_feature_names_once(monkeypatch) -> None:
+    import custom_components.mindml.rolling_window as rolling_window
+
+    clock = [0.0]
+    features = [
+        "event_count_1h",
+        "event_count@binary_sensor.door",
+        "mean_1h@sensor.temperature",
+        *[f"sensor.plain_{index}" for index in range(50)],
+    ]
+    tracker = RollingWindowTracker(
+        window_hours=2.0, required_features=features, clock=lambda: clock[0]
+    )
+    tracker.record_event("binary_sensor.door", "on")
+    tracker.record_event("sensor.temperature", "20")
+    first = tracker.compute_features(features)
+
+    calls = []
+    for name in ("parse_horizon_feature", "parse_numeric_feature", "parse_window_feature"):
+        original = getattr(rolling_window, name)
+        monkeypatch.setattr(
+            rolling_window, name, lambda feature, _f=original: calls.append(feature) or _f(feature)
+        )
+    clock[0] += 60.0
+    second = tracker.compute_features(list(features))
+
+    assert calls == []
+    assert second == first
+    assert second["event_count_1h"] == 2.0
+    assert second["mean_1h@sensor.temperature"] == 20.0
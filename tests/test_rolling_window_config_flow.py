@@ -78,3 +78,78 @@ def test_options_feature_source_persists_rolling_window_hours() -> None:
     )
     assert result["type"] == "create_entry"
     assert result["data"]["rolling_window_hours"] == 3.5
+
+
+def test_options_feature_source_persists_window_buffer_limits() -> None:
+    config_entry = MagicMock()
+    config_entry.entry_id = "entry-1"
+    config_entry.data = {
+        "required_features": ["binary_sensor.motion"],
+        "feature_states": {"binary_sensor.motion": "on"},
+        "ml_feature_source": "hass_state",
+    }
+    config_entry.options = {}
+    options_flow = ClrOptionsFlow(config_entry)
+    options_flow.hass = MagicMock()
+
+    result = asyncio.run(
+        options_flow.async_step_feature_source(
+            {
+                "ml_feature_source": "hass_state",
+                "ml_feature_view": "vw_latest_feature_snapshot",
+                "rolling_window_max_events": "5000",
+                "rolling_window_overflow": "drop_newest",
+            }
+        )
+    )
+    assert result["type"] == "create_entry"
+    assert result["data"]["rolling_window_max_events"] == 5000
+    assert result["data"]["rolling_window_overflow"] == "drop_newest"
+
+    rejected = asyncio.run(
+        options_flow.async_step_feature_source(
+            {
+                "ml_feature_source": "hass_state",
+                "ml_feature_view": "vw_latest_feature_snapshot",
+                "rolling_window_max_events": 0,
+                "rolling_window_overflow": "drop_random",
+            }
+        )
+    )
+    assert rejected["type"] == "form"
+    assert rejected["errors"] == {
+        "rolling_window_max_events": "invalid_max_events",
+        "rolling_window_overflow": "invalid_overflow",
+    }
+
+
+def test_options_feature_source_persists_bucket_seconds() -> None:
+    config_entry = MagicMock()
+    config_entry.entry_id = "entry-1"
+    config_entry.data = {"ml_feature_source": "hass_state"}
+    config_entry.options = {}
+    options_flow = ClrOptionsFlow(config_entry)
+    options_flow.hass = MagicMock()
+
+    result = asyncio.run(
+        options_flow.async_step_feature_source(
+            {
+                "ml_feature_source": "hass_state",
+                "ml_feature_view": "vw_latest_feature_snapshot",
+                "rolling_window_bucket_seconds": "300",
+            }
+        )
+    )
+    assert result["type"] == "create_entry"
+    assert result["data"]["rolling_window_bucket_seconds"] == 300.0
+
+    rejected = asyncio.run(
+        options_flow.async_step_feature_source(
+            {
+                "ml_feature_source": "hass_state",
+                "ml_feature_view": "vw_latest_feature_snapshot",
+                "rolling_window_bucket_seconds": -60,
+            }
+        )
+    )
+    assert rejected["errors"] == {"rolling_window_bucket_seconds": "invalid_bucket_seconds"}
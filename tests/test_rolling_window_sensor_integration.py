@@ -29,6 +29,7 @@ def _build_entry() -> MagicMock:
 
 def test_tracker_created_in_hass_state_mode(monkeypatch) -> None:
     hass = MagicMock()
+    hass.data = {}
 
     class _Provider:
         def __init__(self, **kwargs):
@@ -59,6 +60,7 @@ def test_tracker_created_in_hass_state_mode(monkeypatch) -> None:
 
 def test_events_flow_from_callback_to_tracker(monkeypatch) -> None:
     hass = MagicMock()
+    hass.data = {}
     hass.states.get.return_value = None
     captured_callback = {}
 
@@ -114,11 +116,78 @@ def test_events_flow_from_callback_to_tracker(monkeypatch) -> None:
     assert sensor._rolling_window_tracker.event_count == 1
 
 
+def test_attribute_only_change_updates_features_but_not_tracker(monkeypatch) -> None:
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    from homeassistant.core import State
+
+    from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+    from custom_components.mindml.model_provider import ModelProviderResult
+
+    hass = MagicMock()
+    hass.data = {}
+    hass.states.get.return_value = None
+    captured_callback = {}
+
+    def _track_state(hass_arg, entities, cb):
+        captured_callback["cb"] = cb
+        return lambda: None
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            pass
+
+        def load(self):
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=["event_count"],
+                    model_payload={"intercept": 0.0, "weights": [0.0]},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={},
+            )
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.async_track_state_change_event",
+        _track_state,
+    )
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _Provider,
+    )
+
+    sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor.async_get_last_state = AsyncMock(return_value=None)
+    asyncio.run(sensor.async_added_to_hass())
+    sensor._feature_provider.attributes_changed = lambda *args: True
+    updated = []
+    update_entity = sensor._feature_provider.update_entity
+    sensor._feature_provider.update_entity = lambda *args: (
+        updated.append(args[0]),
+        update_entity(*args),
+    )
+
+    first = State("binary_sensor.motion", "on", {"brightness": 1})
+    second = State("binary_sensor.motion", "on", {"brightness": 2})
+    event = MagicMock()
+    event.data = {"entity_id": "binary_sensor.motion", "old_state": None, "new_state": first}
+    captured_callback["cb"](event)
+    event = MagicMock()
+    event.data = {"entity_id": "binary_sensor.motion", "old_state": first, "new_state": second}
+    captured_callback["cb"](event)
+
+    assert updated == ["binary_sensor.motion", "binary_sensor.motion"]
+    assert sensor._rolling_window_tracker.event_count == 1
+
+
 def test_computed_features_appear_in_feature_values(monkeypatch) -> None:
     from datetime import datetime
     from homeassistant.core import State
 
     hass = MagicMock()
+    hass.data = {}
     hass.states.get.side_effect = lambda eid: State(eid, "1.0")
 
     class _Provider:
@@ -160,6 +229,7 @@ def test_computed_features_appear_in_feature_values(monkeypatch) -> None:
 
 def test_watched_entities_includes_feature_states_entities(monkeypatch) -> None:
     hass = MagicMock()
+    hass.data = {}
     hass.states.get.return_value = None
     captured_entities = {}
 
@@ -213,6 +283,7 @@ def test_watched_entities_includes_feature_states_entities(monkeypatch) -> None:
 
 def test_diagnostics_attributes_present(monkeypatch) -> None:
     hass = MagicMock()
+    hass.data = {}
 
     class _Provider:
         def __init__(self, **kwargs):
@@ -241,3 +312,166 @@ def test_diagnostics_attributes_present(monkeypatch) -> None:
     attrs = sensor.extra_state_attributes
     assert attrs["rolling_window_hours"] == 7.0
     assert attrs["rolling_window_event_count"] == 0
+
+
+def test_per_entity_window_features_watch_referenced_entities(monkeypatch) -> None:
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+    from custom_components.mindml.model_provider import ModelProviderResult
+
+    hass = MagicMock()
+    hass.data = {}
+    hass.states.get.return_value = None
+    captured = {}
+
+    def _track_state(hass_arg, entities, cb):
+        captured["entities"] = list(entities)
+        captured["cb"] = cb
+        return lambda: None
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.async_track_state_change_event",
+        _track_state,
+    )
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            pass
+
+        def load(self):
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=["event_count@binary_sensor.door"],
+                    model_payload={"intercept": 0.0, "weights": [0.0]},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={},
+            )
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _Provider,
+    )
+
+    entry = _build_entry()
+    entry.data["required_features"] = ["event_count@binary_sensor.door"]
+    entry.data["feature_types"] = {}
+    sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    sensor.async_get_last_state = AsyncMock(return_value=None)
+    asyncio.run(sensor.async_added_to_hass())
+
+    assert captured["entities"] == ["binary_sensor.door", "binary_sensor.motion"]
+
+    event = MagicMock()
+    event.data = {"entity_id": "binary_sensor.door", "new_state": MagicMock(state="on")}
+    captured["cb"](event)
+
+    attrs = sensor.extra_state_attributes
+    assert attrs["missing_features"] == []
+    assert attrs["feature_values"]["event_count@binary_sensor.door"] == 1.0
+
+
+
+def test_sensor_schedules_rescore_at_next_window_expiry(monkeypatch) -> None:
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    from custom_components.mindml.const import DOMAIN
+
+    hass = MagicMock()
+    hass.data = {}
+    hass.states.get.return_value = None
+    captured_callback = {}
+
+    def _track_state(hass_arg, entities, cb):
+        captured_callback["cb"] = cb
+        return lambda: None
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.async_track_state_change_event",
+        _track_state,
+    )
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            pass
+
+        def load(self):
+            from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+            from custom_components.mindml.model_provider import ModelProviderResult
+
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=["event_count", "on_ratio"],
+                    model_payload={"intercept": 0.0, "weights": [0.0, 0.0]},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={},
+            )
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _Provider,
+    )
+
+    sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor.async_get_last_state = AsyncMock(return_value=None)
+    asyncio.run(sensor.async_added_to_hass())
+    scheduler = hass.data[DOMAIN]["decay_scheduler"]
+    assert "entry-1" not in scheduler._deadlines
+
+    event = MagicMock()
+    event.data = {"entity_id": "binary_sensor.motion", "new_state": MagicMock(state="on")}
+    captured_callback["cb"](event)
+
+    deadline, action = scheduler._deadlines["entry-1"]
+    assert deadline == sensor._rolling_window_tracker.next_expiry()
+    assert action == sensor._handle_decay
+
+
+def test_overflow_policy_from_entry_reaches_tracker_and_diagnostics(monkeypatch) -> None:
+    from datetime import datetime
+
+    from custom_components.mindml.const import DOMAIN
+    from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+    from custom_components.mindml.model_provider import ModelProviderResult
+
+    hass = MagicMock()
+    hass.data = {}
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            pass
+
+        def load(self):
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=["event_count"],
+                    model_payload={"intercept": 0.0, "weights": [0.0]},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={},
+            )
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _Provider,
+    )
+    entry = _build_entry()
+    entry.options = {"rolling_window_max_events": 2, "rolling_window_overflow": "drop_newest"}
+
+    sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    for _ in range(3):
+        sensor._rolling_window_tracker.record_event("binary_sensor.motion", "on")
+    sensor._recompute_state(datetime.now())
+
+    runtime = hass.data[DOMAIN]["entry-1"]["runtime"]
+    assert sensor._rolling_window_tracker._overflow == "drop_newest"
+    assert sensor._rolling_window_tracker.event_count == 2
+    assert runtime["rolling_window"]["dropped_events"] == 1
+    assert runtime["rolling_window"]["subscribers"] == 1
@@ -44,6 +44,7 @@ def _build_entry() -> MagicMock:
 def test_sensor_available_when_features_missing(monkeypatch) -> None:
     """Sensor must stay available when features are missing so attrs are visible."""
     hass = MagicMock()
+    hass.data = {}
     hass.states.get.side_effect = lambda entity_id: {
         "sensor.a": State("sensor.a", "4"),
     }.get(entity_id)  # sensor.b missing
@@ -46,6 +46,7 @@ def test_async_setup_entry_adds_one_sensor() -> None:
 
 def test_sensor_unavailable_reason_when_required_feature_missing(monkeypatch) -> None:
     hass = MagicMock()
+    hass.data = {}
     hass.states.get.side_effect = lambda entity_id: {
         "sensor.a": State("sensor.a", "4"),
     }.get(entity_id)
@@ -81,6 +82,7 @@ def test_sensor_unavailable_reason_when_required_feature_missing(monkeypatch) ->
 
 def test_sensor_updates_probability_attributes(monkeypatch) -> None:
     hass = MagicMock()
+    hass.data = {}
     hass.states.get.side_effect = lambda entity_id: {
         "sensor.a": State("sensor.a", "2"),
         "sensor.b": State("sensor.b", "1"),
@@ -127,6 +129,7 @@ def test_sensor_updates_probability_attributes(monkeypatch) -> None:
 
 def test_sensor_resolves_default_ml_db_path_when_missing(monkeypatch) -> None:
     hass = MagicMock()
+    hass.data = {}
     hass.states.get.return_value = State("sensor.a", "2")
     hass.config.path.return_value = "/config/ha_ml_data_layer.db"
     entry = _build_entry()
@@ -165,6 +168,7 @@ def test_sensor_hass_state_keeps_configured_features_when_model_has_abstract_nam
     monkeypatch,
 ) -> None:
     hass = MagicMock()
+    hass.data = {}
     entry = _build_entry()
 
     class _Provider:
@@ -196,6 +200,7 @@ def test_sensor_hass_state_keeps_configured_features_when_model_has_abstract_nam
 
 def test_sensor_restores_state_from_last_known(monkeypatch) -> None:
     hass = MagicMock()
+    hass.data = {}
     entry = _build_entry()
 
     class _Provider:
@@ -254,6 +259,7 @@ def test_sensor_restores_state_from_last_known(monkeypatch) -> None:
 
 def test_sensor_handles_no_previous_state(monkeypatch) -> None:
     hass = MagicMock()
+    hass.data = {}
     entry = _build_entry()
 
     class _Provider:
@@ -290,6 +296,7 @@ def test_sensor_handles_no_previous_state(monkeypatch) -> None:
 
 def test_sensor_syncs_ingestion_rules_from_feature_states(monkeypatch) -> None:
     hass = MagicMock()
+    hass.data = {}
     entry = _build_entry()
     entry.data["feature_states"] = {"sensor.a": "on", "sensor.b": "off"}
 
@@ -334,6 +341,7 @@ def test_sensor_syncs_ingestion_rules_from_feature_states(monkeypatch) -> None:
 
 def test_sensor_surfaces_model_artifact_error_reason(monkeypatch) -> None:
     hass = MagicMock()
+    hass.data = {}
     hass.states.get.side_effect = lambda entity_id: {
         "sensor.a": State("sensor.a", "2"),
         "sensor.b": State("sensor.b", "1"),
@@ -372,6 +380,7 @@ def test_sensor_warns_on_feature_mismatch_and_keeps_config_features(
     monkeypatch,
 ) -> None:
     hass = MagicMock()
+    hass.data = {}
     entry = _build_entry()
     entry.data["ml_feature_source"] = "ml_snapshot"
 
@@ -415,6 +424,7 @@ def test_sensor_no_feature_mismatch_when_features_match(
     monkeypatch,
 ) -> None:
     hass = MagicMock()
+    hass.data = {}
     entry = _build_entry()
 
     class _Provider:
@@ -443,3 +453,129 @@ def test_sensor_no_feature_mismatch_when_features_match(
     sensor = CalibratedLogisticRegressionSensor(hass, entry)
     attrs = sensor.extra_state_attributes
     assert attrs["feature_mismatch"] is None
+
+
+def test_sensor_swaps_model_when_registry_version_pinned(monkeypatch) -> None:
+    hass = MagicMock()
+    hass.data = {}
+    hass.states.get.side_effect = lambda entity_id: {
+        "sensor.a": State("sensor.a", "2"),
+        "sensor.b": State("sensor.b", "1"),
+    }.get(entity_id)
+
+    class _Provider:
+        intercept = 0.0
+
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+        def load(self):
+            from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+            from custom_components.mindml.model_provider import ModelProviderResult
+
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=["sensor.a", "sensor.b"],
+                    model_payload={"intercept": _Provider.intercept, "weights": [0.0, 0.0]},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={"fingerprint": f"fp-{_Provider.intercept}"},
+            )
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _Provider,
+    )
+
+    CalibratedLogisticRegressionSensor(hass, _build_entry())
+    _Provider.intercept = 1.0
+    sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor.async_get_last_state = AsyncMock(return_value=None)
+    asyncio.run(sensor.async_added_to_hass())
+    assert sensor.extra_state_attributes["model_fingerprint"] == "fp-1.0"
+
+    sensor._model_registry.pin("entry-1", "fp-0.0")
+
+    attrs = sensor.extra_state_attributes
+    assert attrs["model_fingerprint"] == "fp-0.0"
+    assert attrs["model_pinned"] is True
+    assert sensor.native_value == 50.0
+
+
+def test_sensor_scores_attribute_features_and_ignores_unrelated_attribute_updates(
+    monkeypatch,
+) -> None:
+    feature = "climate.living_room#current_temperature"
+    hass = MagicMock()
+    hass.data = {}
+    hass.states.get.return_value = State(
+        "climate.living_room", "heat", {"current_temperature": 20.5, "hvac_action": "idle"}
+    )
+    captured = {}
+
+    def _track_state(hass_arg, entities, cb):
+        captured["entities"] = list(entities)
+        captured["cb"] = cb
+        return lambda: None
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.async_track_state_change_event",
+        _track_state,
+    )
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            pass
+
+        def load(self):
+            from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+            from custom_components.mindml.model_provider import ModelProviderResult
+
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=[feature],
+                    model_payload={"intercept": 0.0, "weights": [0.0]},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={},
+            )
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _Provider,
+    )
+
+    entry = _build_entry()
+    entry.data["required_features"] = [feature]
+    entry.data["feature_types"] = {feature: "numeric"}
+    sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    sensor.async_get_last_state = AsyncMock(return_value=None)
+    sensor.async_write_ha_state = MagicMock()
+    asyncio.run(sensor.async_added_to_hass())
+
+    assert captured["entities"] == ["climate.living_room"]
+    assert sensor.extra_state_attributes["feature_values"][feature] == 20.5
+
+    def _fire(old_attributes, new_attributes) -> None:
+        event = MagicMock()
+        event.data = {
+            "entity_id": "climate.living_room",
+            "old_state": State("climate.living_room", "heat", old_attributes),
+            "new_state": State("climate.living_room", "heat", new_attributes),
+        }
+        captured["cb"](event)
+
+    _fire(
+        {"current_temperature": 20.5, "hvac_action": "idle"},
+        {"current_temperature": 20.5, "hvac_action": "heating"},
+    )
+    sensor.async_write_ha_state.assert_not_called()
+
+    _fire(
+        {"current_temperature": 20.5, "hvac_action": "heating"},
+        {"current_temperature": 21.0, "hvac_action": "heating"},
+    )
+    sensor.async_write_ha_state.assert_called_once()
+    assert sensor.extra_state_attributes["feature_values"][feature] == 21.0
@@ -102,6 +102,7 @@ def test_sensor_can_use_ml_snapshot_feature_source(monkeypatch) -> None:
     )
 
     hass = MagicMock()
+    hass.data = {}
     entry = MagicMock()
     entry.entry_id = "entry-ml"
     entry.title = "ML MindML"
@@ -126,3 +127,92 @@ def test_sensor_can_use_ml_snapshot_feature_source(monkeypatch) -> None:
     assert attrs["model_runtime"] == "lightgbm"
     assert attrs["missing_features"] == []
     assert attrs["feature_values"] == {"event_count": 3.0}
+
+
+def test_sensor_skips_rescoring_when_snapshot_unchanged(monkeypatch) -> None:
+    from custom_components.mindml.const import DOMAIN
+    from custom_components.mindml.feature_provider import FeatureVectorResult
+
+    class _UnchangedAfterFirstProvider:
+        def __init__(self, **kwargs):
+            self.calls = 0
+
+        def load(self):
+            self.calls += 1
+            return FeatureVectorResult(
+                feature_values={"event_count": 3.0},
+                missing_features=[],
+                mapped_state_values={},
+                unchanged=self.calls > 1,
+            )
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _ModelProvider,
+    )
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteSnapshotFeatureProvider",
+        _UnchangedAfterFirstProvider,
+    )
+
+    hass = MagicMock()
+    hass.data = {}
+    entry = MagicMock()
+    entry.entry_id = "entry-ml"
+    entry.title = "ML MindML"
+    entry.data = {
+        "name": "ML MindML",
+        "required_features": ["event_count"],
+        "threshold": 50.0,
+        "ml_db_path": "/tmp/ha_ml_data_layer.db",
+        "ml_feature_source": "ml_snapshot",
+    }
+    entry.options = {}
+
+    sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    assert sensor._recompute_state(datetime(2026, 1, 1)) is True
+    first_attrs = sensor.extra_state_attributes
+
+    assert sensor._recompute_state(datetime(2026, 1, 2)) is False
+    assert sensor._recompute_state(datetime(2026, 1, 3)) is False
+
+    assert sensor.extra_state_attributes == first_attrs
+    assert hass.data[DOMAIN]["entry-ml"]["runtime"]["skipped_polls"] == 2
+
+
+def test_sensor_polls_blocking_snapshot_provider_in_executor(monkeypatch) -> None:
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    class _BlockingProvider(_FeatureProvider):
+        blocking_io = True
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _ModelProvider,
+    )
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteSnapshotFeatureProvider",
+        _BlockingProvider,
+    )
+
+    hass = MagicMock()
+    hass.data = {}
+    hass.async_add_executor_job = AsyncMock(side_effect=lambda target: target())
+    entry = MagicMock()
+    entry.entry_id = "entry-ml"
+    entry.title = "ML MindML"
+    entry.data = {
+        "name": "ML MindML",
+        "required_features": ["event_count"],
+        "threshold": 50.0,
+        "ml_db_path": "/tmp/ha_ml_data_layer.db",
+        "ml_feature_source": "ml_snapshot",
+    }
+    entry.options = {}
+
+    sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    asyncio.run(sensor.async_update())
+
+    hass.async_add_executor_job.assert_awaited_once()
+    assert sensor.extra_state_attributes["feature_values"] == {"event_count": 3.0}
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from homeassistant.core import State
+
+from custom_components.mindml.const import DOMAIN
+from custom_components.mindml.feature_provider import FeatureVectorResult
+from custom_components.mindml.lightgbm_inference import (
+    LightGBMModelSpec,
+    run_lightgbm_inference,
+)
+from custom_components.mindml.model_provider import ModelProviderResult
+from custom_components.mindml.sensor import CalibratedLogisticRegressionSensor
+from custom_components.mindml.shadow import ShadowScoreStats, score_shadow
+
+
+def _linear_model(intercept: float) -> LightGBMModelSpec:
+    return LightGBMModelSpec(
+        feature_names=["sensor.a"],
+        model_payload={"intercept": intercept, "weights": [0.0]},
+    )
+
+
+def _vector() -> FeatureVectorResult:
+    return FeatureVectorResult(
+        feature_values={"sensor.a": 1.0},
+        missing_features=[],
+        mapped_state_values={},
+    )
+
+
+def test_shadow_stats_accumulate_agreement_delta_and_latency() -> None:
+    stats = ShadowScoreStats()
+    primary = run_lightgbm_inference(
+        feature_values={"sensor.a": 1.0},
+        missing_features=[],
+        model=_linear_model(0.0),
+        threshold=40.0,
+    )
+
+    for intercept in (0.0, -4.0):
+        score_shadow(
+            primary=primary,
+            feature_vector=_vector(),
+            model=_linear_model(intercept),
+            threshold=40.0,
+            stats=stats,
+        )
+
+    payload = stats.as_dict()
+    assert payload["evaluations"] == 2
+    assert payload["compared"] == 2
+    assert payload["agreement_rate"] == 0.5
+    assert 0.2 < payload["mean_abs_probability_delta"] < 0.3
+    assert payload["mean_added_latency_ms"] >= 0.0
+
+
+def test_shadow_stats_count_unavailable_shadow_results() -> None:
+    stats = ShadowScoreStats()
+    primary = run_lightgbm_inference(
+        feature_values={"sensor.a": 1.0},
+        missing_features=[],
+        model=_linear_model(0.0),
+        threshold=50.0,
+    )
+    score_shadow(
+        primary=primary,
+        feature_vector=_vector(),
+        model=LightGBMModelSpec(feature_names=["sensor.a"], model_payload={}),
+        threshold=50.0,
+        stats=stats,
+    )
+
+    assert stats.as_dict()["shadow_unavailable"] == 1
+    assert stats.as_dict()["agreement_rate"] is None
+
+
+def test_sensor_scores_shadow_model_into_diagnostics_only(monkeypatch) -> None:
+    hass = MagicMock()
+    hass.data = {}
+    hass.states.get.side_effect = lambda entity_id: State(entity_id, "1")
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+        def load(self):
+            intercept = -4.0 if self.kwargs["artifact_view"] == "vw_candidate" else 0.0
+            return ModelProviderResult(
+                model=_linear_model(intercept),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={"fingerprint": self.kwargs["artifact_view"]},
+            )
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _Provider,
+    )
+
+    entry = MagicMock()
+    entry.entry_id = "entry-shadow"
+    entry.title = "Shadow"
+    entry.data = {
+        "name": "Shadow",
+        "required_features": ["sensor.a"],
+        "feature_types": {"sensor.a": "numeric"},
+        "threshold": 40.0,
+        "ml_db_path": "/tmp/ha_ml_data_layer.db",
+        "ml_artifact_view": "vw_production",
+        "ml_feature_source": "hass_state",
+    }
+    entry.options = {"ml_shadow_artifact_view": "vw_candidate"}
+
+    sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    sensor._recompute_state(datetime.now())
+
+    assert sensor.native_value == 50.0
+    assert "shadow" not in sensor.extra_state_attributes
+    shadow = hass.data[DOMAIN]["entry-shadow"]["runtime"]["shadow"]
+    assert shadow["artifact_view"] == "vw_candidate"
+    assert shadow["model_fingerprint"] == "vw_candidate"
+    assert shadow["evaluations"] == 1
+    assert shadow["agreement_rate"] == 0.0
+
+
+def test_shadow_candidate_with_extra_feature_counts_as_mismatch() -> None:
+    stats = ShadowScoreStats()
+    primary = run_lightgbm_inference(
+        feature_values={"sensor.a": 1.0},
+        missing_features=[],
+        model=_linear_model(0.0),
+        threshold=40.0,
+    )
+    candidate = LightGBMModelSpec(
+        feature_names=["sensor.a", "sensor.z"],
+        model_payload={"intercept": 0.0, "weights": [0.0, 1.0]},
+    )
+
+    shadow = score_shadow(
+        primary=primary,
+        feature_vector=_vector(),
+        model=candidate,
+        threshold=40.0,
+        stats=stats,
+    )
+
+    payload = stats.as_dict()
+    assert shadow.available is False
+    assert shadow.unavailable_reason == "shadow_feature_mismatch"
+    assert payload["evaluations"] == 1
+    assert payload["feature_mismatch"] == 1
+    assert payload["compared"] == 0
+    assert payload["agreement_rate"] is None
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from custom_components.mindml.sqlite_connections import SqliteReadOnlyConnectionPool
+
+
+def _write_db(path: Path, value: float) -> None:
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("CREATE TABLE features (feature_name TEXT, feature_value REAL)")
+        conn.execute("INSERT INTO features VALUES ('event_count', ?)", (value,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_pool_reuses_read_only_connection_across_borrows(tmp_path: Path) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    _write_db(db_path, 1.0)
+    pool = SqliteReadOnlyConnectionPool()
+
+    with pool.connection(str(db_path)) as first:
+        assert first.execute("SELECT feature_value FROM features").fetchone()[0] == 1.0
+    with pool.connection(str(db_path)) as second:
+        assert second is first
+        with pytest.raises(sqlite3.OperationalError):
+            second.execute("DELETE FROM features")
+
+    pool.close()
+
+
+def test_pool_reopens_when_db_file_is_replaced(tmp_path: Path) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    _write_db(db_path, 1.0)
+    pool = SqliteReadOnlyConnectionPool()
+    with pool.connection(str(db_path)) as first:
+        first.execute("SELECT 1").fetchone()
+
+    replacement = tmp_path / "replacement.db"
+    _write_db(replacement, 9.0)
+    os.replace(replacement, db_path)
+
+    with pool.connection(str(db_path)) as second:
+        assert second is not first
+        assert second.execute("SELECT feature_value FROM features").fetchone()[0] == 9.0
+
+    pool.close()
+
+
+def test_pool_raises_file_not_found_for_missing_db(tmp_path: Path) -> None:
+    pool = SqliteReadOnlyConnectionPool()
+
+    with pytest.raises(FileNotFoundError):
+        with pool.connection(str(tmp_path / "missing.db")):
+            pass
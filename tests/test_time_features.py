@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import math
+import sqlite3
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from custom_components.mindml.const import DOMAIN
+from custom_components.mindml.feature_provider import (
+    HassStateFeatureProvider,
+    SqliteSnapshotFeatureProvider,
+)
+from custom_components.mindml.time_features import (
+    DomainClock,
+    compute_time_features,
+    get_time_clock,
+)
+
+
+def test_compute_time_features_encodes_hour_and_weekday_cyclically() -> None:
+    features = compute_time_features(datetime(2024, 1, 3, 18, 30))
+
+    assert features["time_hour_of_day"] == 18.5
+    assert features["time_day_of_week"] == 2.0
+    assert math.isclose(features["time_hour_sin"], math.sin(2 * math.pi * 18.5 / 24))
+    assert math.isclose(features["time_day_of_week_cos"], math.cos(2 * math.pi * 2 / 7))
+
+
+def test_domain_clock_computes_once_per_minute() -> None:
+    clock = DomainClock(MagicMock())
+
+    first = clock.features(datetime(2024, 1, 3, 18, 30, 5, tzinfo=UTC))
+    same_minute = clock.features(datetime(2024, 1, 3, 18, 30, 55, tzinfo=UTC))
+    next_minute = clock.features(datetime(2024, 1, 3, 18, 31, 0, tzinfo=UTC))
+
+    assert same_minute is first
+    assert next_minute is not first
+
+
+def test_domain_clock_shares_one_timer_across_listeners(monkeypatch) -> None:
+    timers: list[object] = []
+    cancelled: list[object] = []
+
+    def _track(hass, action, **kwargs):
+        timers.append(action)
+        return lambda: cancelled.append(action)
+
+    monkeypatch.setattr(
+        "custom_components.mindml.time_features.async_track_utc_time_change", _track
+    )
+    hass = MagicMock()
+    hass.data = {}
+    clock = get_time_clock(hass)
+    calls: list[str] = []
+    remove_a = clock.async_add_listener(lambda: calls.append("a"))
+    remove_b = clock.async_add_listener(lambda: calls.append("b"))
+
+    timers[0](datetime(2024, 1, 3, 18, 31, tzinfo=UTC))
+    remove_a()
+    remove_b()
+
+    assert hass.data[DOMAIN]["time_clock"] is clock
+    assert len(timers) == 1
+    assert calls == ["a", "b"]
+    assert cancelled == timers
+
+
+def test_hass_feature_provider_fills_time_features_from_shared_clock() -> None:
+    hass = MagicMock()
+    hass.states.get.return_value = MagicMock(state="3")
+    provider = HassStateFeatureProvider(
+        hass=hass,
+        required_features=["sensor.a", "time_hour_of_day"],
+        feature_types={},
+        state_mappings={},
+        time_features=lambda: {"time_hour_of_day": 7.0, "time_day_of_week": 1.0},
+    )
+
+    assert provider.watched_entities == ["sensor.a"]
+    assert provider.load().feature_values == {"sensor.a": 3.0, "time_hour_of_day": 7.0}
+
+
+def test_snapshot_provider_rescores_when_only_time_changes(tmp_path: Path) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE vw_latest_feature_snapshot (feature_name TEXT, feature_value REAL)")
+    conn.execute("INSERT INTO vw_latest_feature_snapshot VALUES ('event_count', 2.0)")
+    conn.commit()
+    conn.close()
+    hour = {"time_hour_of_day": 7.0}
+    provider = SqliteSnapshotFeatureProvider(
+        db_path=str(db_path),
+        snapshot_view="vw_latest_feature_snapshot",
+        required_features=["event_count", "time_hour_of_day"],
+        time_features=lambda: hour,
+    )
+
+    first = provider.load()
+    assert first.feature_values == {"event_count": 2.0, "time_hour_of_day": 7.0}
+    assert provider.load().unchanged is True
+
+    hour["time_hour_of_day"] = 8.0
+    moved = provider.load()
+
+    assert moved.unchanged is False
+    assert moved.feature_values == {"event_count": 2.0, "time_hour_of_day": 8.0}
+    assert provider.load().unchanged is True
@@ -0,0 +1,252 @@
+"""Tests for sharing rolling window trackers across config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.mindml.const import DOMAIN
+from custom_components.mindml.rolling_window import RollingWindowTracker
+from custom_components.mindml.sensor import CalibratedLogisticRegressionSensor
+from custom_components.mindml.tracker_registry import get_tracker_registry, tracker_key
+from custom_components.mindml.window_store import SAVE_DELAY_SECONDS
+
+
+def _key(**overrides) -> tuple:
+    options = {
+        "required_features": ["binary_sensor.motion", "event_count"],
+        "feature_states": {"binary_sensor.motion": "on"},
+        "window_hours": 7.0,
+        "max_events": 1000,
+        "overflow": "drop_oldest",
+        "bucket_seconds": None,
+    }
+    options.update(overrides)
+    return tracker_key(**options)
+
+
+def test_tracker_key_ignores_feature_order_only() -> None:
+    assert _key() == _key(required_features=["event_count", "binary_sensor.motion"])
+    assert _key() != _key(window_hours=1.0)
+    assert _key() != _key(feature_states={"binary_sensor.motion": "off"})
+    assert _key() != _key(overflow="drop_newest")
+
+
+def test_registry_shares_tracker_until_last_subscriber_releases() -> None:
+    hass = MagicMock()
+    hass.data = {}
+    registry = get_tracker_registry(hass)
+    created: list[RollingWindowTracker] = []
+
+    def _factory() -> RollingWindowTracker:
+        created.append(RollingWindowTracker(window_hours=7.0))
+        return created[-1]
+
+    first = registry.acquire("entry-1", _key(), _factory)
+    second = registry.acquire("entry-2", _key(), _factory)
+    other = registry.acquire("entry-3", _key(window_hours=1.0), _factory)
+
+    assert hass.data[DOMAIN]["tracker_registry"] is registry
+    assert first is second
+    assert other is not first
+    assert len(created) == 2
+    assert first.claim_startup() is True
+    assert second.claim_startup() is False
+
+    registry.release("entry-1")
+    assert len(registry) == 2
+    registry.release("entry-2")
+    registry.release("entry-3")
+    assert len(registry) == 0
+
+
+def test_shared_tracker_records_each_state_change_once() -> None:
+    hass = MagicMock()
+    hass.data = {}
+    shared = get_tracker_registry(hass).acquire(
+        "entry-1", _key(), lambda: RollingWindowTracker(window_hours=7.0)
+    )
+    first, second = MagicMock(state="on"), MagicMock(state="on")
+
+    assert shared.record_state("binary_sensor.motion", first) is True
+    assert shared.record_state("binary_sensor.motion", first) is False
+    assert shared.record_state("binary_sensor.motion", second) is True
+    assert shared.tracker.event_count == 2
+
+
+def _entry(entry_id: str) -> MagicMock:
+    entry = MagicMock()
+    entry.entry_id = entry_id
+    entry.title = entry_id
+    entry.data = {
+        "name": entry_id,
+        "goal": "risk",
+        "required_features": ["binary_sensor.motion"],
+        "feature_types": {"binary_sensor.motion": "numeric"},
+        "feature_states": {"binary_sensor.motion": "on"},
+        "threshold": 50.0,
+        "state_mappings": {},
+        "ml_db_path": "/tmp/ha_ml_data_layer.db",
+        "ml_artifact_view": "vw_clr_latest_model_artifact",
+        "ml_feature_source": "hass_state",
+    }
+    entry.options = {}
+    return entry
+
+
+def test_sensors_with_identical_inputs_share_events(monkeypatch) -> None:
+    hass = MagicMock()
+    hass.data = {}
+    hass.states.get.return_value = None
+    callbacks: list = []
+    backfills: list = []
+
+    def _track_state(hass_arg, entities, cb):
+        callbacks.append(cb)
+        return lambda: None
+
+    async def _backfill(*args, **kwargs):
+        backfills.append(args[1])
+        return 0
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            pass
+
+        def load(self):
+            from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+            from custom_components.mindml.model_provider import ModelProviderResult
+
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=["event_count", "on_ratio"],
+                    model_payload={"intercept": 0.0, "weights": [0.0, 0.0]},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={},
+            )
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.async_track_state_change_event", _track_state
+    )
+    monkeypatch.setattr("custom_components.mindml.sensor.async_backfill_tracker", _backfill)
+    monkeypatch.setattr("custom_components.mindml.sensor.SqliteLightGBMModelProvider", _Provider)
+
+    sensors = [CalibratedLogisticRegressionSensor(hass, _entry(f"entry-{i}")) for i in (1, 2)]
+    for sensor in sensors:
+        sensor.async_get_last_state = AsyncMock(return_value=None)
+        asyncio.run(sensor.async_added_to_hass())
+
+    event = MagicMock()
+    event.data = {"entity_id": "binary_sensor.motion", "new_state": MagicMock(state="on")}
+    for callback in callbacks:
+        callback(event)
+
+    tracker = sensors[0]._rolling_window_tracker
+    assert sensors[1]._rolling_window_tracker is tracker
+    assert len(backfills) == 1
+    assert tracker.event_count == 1
+    assert sensors[1].extra_state_attributes["feature_values"]["event_count"] == 1.0
+
+
+def test_shared_tracker_uses_event_time_fired() -> None:
+    hass = MagicMock()
+    hass.data = {}
+    clock = [500.0]
+    shared = get_tracker_registry(hass).acquire(
+        "entry-1",
+        _key(required_features=["event_count"], feature_states={}, window_hours=1.0),
+        lambda: RollingWindowTracker(window_hours=1.0, clock=lambda: clock[0]),
+    )
+    fired_at = datetime.now(UTC) - timedelta(minutes=30)
+
+    shared.record_state("binary_sensor.motion", MagicMock(state="on"), fired_at)
+
+    timestamp, _, _ = next(shared.tracker.events())
+    assert 500.0 - 1800.0 - 1.0 < timestamp < 500.0 - 1800.0 + 1.0
+
+
+def test_shared_tracker_clamps_time_fired_that_goes_backwards() -> None:
+    hass = MagicMock()
+    hass.data = {}
+    clock = [5000.0]
+    features = ["on_duration_seconds@binary_sensor.door"]
+    shared = get_tracker_registry(hass).acquire(
+        "entry-1",
+        _key(required_features=features, feature_states={}),
+        lambda: RollingWindowTracker(
+            window_hours=1.0, required_features=features, clock=lambda: clock[0]
+        ),
+    )
+    now = datetime.now(UTC)
+
+    shared.record_state("binary_sensor.door", MagicMock(state="on"), now - timedelta(minutes=10))
+    # The wall clock stepped back (e.g. NTP) before the next event fired.
+    shared.record_state("binary_sensor.door", MagicMock(state="off"), now - timedelta(minutes=30))
+
+    timestamps = [timestamp for timestamp, _, _ in shared.tracker.events()]
+    assert timestamps == sorted(timestamps)
+    assert timestamps[0] == timestamps[1]
+    clock[0] += 60.0
+    result = shared.tracker.compute_features(features)
+    assert result["on_duration_seconds@binary_sensor.door"] == 0.0
+
+
+def test_releasing_last_subscriber_flushes_pending_save() -> None:
+    hass = MagicMock()
+    hass.data = {}
+    registry = get_tracker_registry(hass)
+    shared = registry.acquire("entry-1", _key(), lambda: RollingWindowTracker(window_hours=7.0))
+    registry.acquire("entry-2", _key(), lambda: RollingWindowTracker(window_hours=7.0))
+    shared.tracker.record_event("binary_sensor.motion", "on")
+    shared.store.async_schedule_save(shared.tracker)
+
+    registry.release("entry-1")
+    assert shared.store._store.pending_save[1] == SAVE_DELAY_SECONDS
+
+    registry.release("entry-2")
+    data_func, delay = shared.store._store.pending_save
+    assert delay == 0
+    assert len(data_func()["events"]) == 1
+
+
+def test_removing_last_entry_deletes_shared_store() -> None:
+    hass = MagicMock()
+    hass.data = {}
+    registry = get_tracker_registry(hass)
+    shared = registry.acquire("entry-1", _key(), lambda: RollingWindowTracker(window_hours=7.0))
+    registry.acquire("entry-2", _key(), lambda: RollingWindowTracker(window_hours=7.0))
+    shared.tracker.record_event("binary_sensor.motion", "on")
+    asyncio.run(shared.store.async_save(shared.tracker))
+    store = shared.store._store
+
+    registry.release("entry-1")
+    registry.release("entry-2")
+    asyncio.run(registry.async_remove_entry("entry-1"))
+    assert store.data is not None
+
+    asyncio.run(registry.async_remove_entry("entry-2"))
+    assert store.data is None
+
+
+def test_shared_tracker_migrates_entry_keyed_store() -> None:
+    from custom_components.mindml.window_store import RollingWindowStore
+
+    hass = MagicMock()
+    hass.data = {}
+    old = RollingWindowTracker(window_hours=7.0)
+    old.record_event("binary_sensor.motion", "on")
+    legacy = RollingWindowStore(hass, "entry-1")
+    asyncio.run(legacy.async_save(old))
+
+    shared = get_tracker_registry(hass).acquire(
+        "entry-1", _key(), lambda: RollingWindowTracker(window_hours=7.0)
+    )
+    saved_at = asyncio.run(shared.async_restore("entry-1"))
+
+    assert saved_at is not None
+    assert shared.tracker.event_count == 1
+    assert legacy._store.data is None
+    assert shared.store._store.pending_save is not None
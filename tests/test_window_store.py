@@ -0,0 +1,142 @@
+"""Tests for persisting rolling window state across restarts."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.mindml.rolling_window import RollingWindowTracker
+from custom_components.mindml.window_store import SAVE_DELAY_SECONDS, RollingWindowStore
+
+
+def _patch_clock(monkeypatch, clock: dict[str, float]) -> None:
+    monkeypatch.setattr(
+        "custom_components.mindml.rolling_window.monotonic", lambda: clock["now"]
+    )
+
+
+def test_tracker_state_round_trips_through_json(monkeypatch) -> None:
+    clock = {"now": 1000.0}
+    _patch_clock(monkeypatch, clock)
+    features = [
+        "event_count@binary_sensor.door",
+        "on_duration_seconds@binary_sensor.door",
+        "max_30m@sensor.temperature",
+    ]
+    tracker = RollingWindowTracker(window_hours=1.0, required_features=features)
+    tracker.record_event("binary_sensor.door", "on")
+    clock["now"] += 600.0
+    tracker.record_event("binary_sensor.door", "off")
+    tracker.record_event("binary_sensor.motion", "on")
+    tracker.record_event("sensor.temperature", "21.5")
+    saved = json.loads(json.dumps(tracker.as_dict()))
+
+    restored = RollingWindowTracker(window_hours=1.0, required_features=features)
+    restored_count = restored.restore(saved)
+
+    assert restored_count == 4
+    assert restored.compute_features(features) == tracker.compute_features(features)
+
+
+def test_bucketed_tracker_state_round_trips_through_json(monkeypatch) -> None:
+    clock = {"now": 1000.0}
+    _patch_clock(monkeypatch, clock)
+    features = [
+        "event_count@binary_sensor.door",
+        "on_ratio@binary_sensor.door",
+        "mean@sensor.temperature",
+        "variance@sensor.temperature",
+        "min@sensor.temperature",
+    ]
+    tracker = RollingWindowTracker(
+        window_hours=1.0, bucket_seconds=300.0, required_features=features
+    )
+    for step, value in enumerate((20.0, 21.0, 23.5, 19.0)):
+        clock["now"] += 100.0
+        tracker.record_event("binary_sensor.door", "on" if step % 2 else "off")
+        tracker.record_event("sensor.temperature", str(value))
+    saved = json.loads(json.dumps(tracker.as_dict()))
+
+    restored = RollingWindowTracker(
+        window_hours=1.0, bucket_seconds=300.0, required_features=features
+    )
+    restored.restore(saved)
+
+    assert len(saved["entity_windows"]["binary_sensor.door"]) == 2
+    assert restored.compute_features(features) == pytest.approx(
+        tracker.compute_features(features)
+    )
+
+
+def test_restore_discards_expired_events(monkeypatch) -> None:
+    clock = {"now": 1000.0}
+    _patch_clock(monkeypatch, clock)
+    tracker = RollingWindowTracker(window_hours=1.0)
+    tracker.record_event("binary_sensor.motion", "on")
+    clock["now"] += 3000.0
+    tracker.record_event("binary_sensor.motion", "off")
+    saved = tracker.as_dict()
+
+    # The restarted tracker anchors its clock 20 minutes after the save.
+    clock["now"] += 1200.0
+
+    class _Later(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(saved["saved_at"] + 1200.0, UTC)
+
+    monkeypatch.setattr("custom_components.mindml.rolling_window.datetime", _Later)
+    restored = RollingWindowTracker(window_hours=1.0)
+
+    assert restored.restore(saved) == 1
+    assert [state for _, _, state in restored.events()] == ["off"]
+
+
+def test_store_restores_saved_state_and_batches_saves() -> None:
+    store = RollingWindowStore(MagicMock(), "entry-1")
+    tracker = RollingWindowTracker(window_hours=1.0)
+    tracker.record_event("binary_sensor.motion", "on")
+
+    store.async_schedule_save(tracker)
+    data_func, delay = store._store.pending_save
+    asyncio.run(store._store.async_save(data_func()))
+    restored = RollingWindowTracker(window_hours=1.0)
+    saved_at = asyncio.run(store.async_restore(restored))
+
+    assert store._store.key == "mindml.rolling_window.entry-1"
+    assert delay == SAVE_DELAY_SECONDS
+    assert saved_at is not None
+    assert restored.event_count == 1
+
+
+def test_store_throttles_saves_instead_of_postponing_them() -> None:
+    store = RollingWindowStore(MagicMock(), "entry-1")
+    tracker = RollingWindowTracker(window_hours=1.0)
+    tracker.record_event("binary_sensor.motion", "on")
+
+    store.async_schedule_save(tracker)
+    pending = store._store.pending_save
+    tracker.record_event("binary_sensor.motion", "off")
+    store.async_schedule_save(tracker)
+
+    # A steady stream of events must not keep restarting the save timer.
+    assert store._store.pending_save is pending
+    data_func, _ = pending
+    assert len(data_func()["events"]) == 2
+
+    store.async_schedule_save(tracker)
+    assert store._store.pending_save is not pending
+
+
+def test_store_ignores_missing_or_corrupt_state() -> None:
+    store = RollingWindowStore(MagicMock(), "entry-1")
+    tracker = RollingWindowTracker(window_hours=1.0)
+
+    assert asyncio.run(store.async_restore(tracker)) is None
+    store._store.data = {"entities": []}
+    assert asyncio.run(store.async_restore(tracker)) is None
+    assert tracker.event_count == 0